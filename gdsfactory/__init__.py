@@ -4,6 +4,9 @@
 # isort: skip_file
 
 from __future__ import annotations
+import importlib
+import sys
+import types
 from functools import partial
 from toolz import compose
 from aenum import constant  # type: ignore[import-untyped]
@@ -26,26 +29,19 @@ from gdsfactory.component import (
 )
 from gdsfactory.config import CONF, PATH
 from gdsfactory.port import Port
-from gdsfactory.read.import_gds import import_gds
 from gdsfactory.cross_section import CrossSection, Section, xsection
 from gdsfactory.difftest import difftest, diff
 from gdsfactory.boolean import boolean
 
 from gdsfactory import cross_section
 from gdsfactory import port
-from gdsfactory import components
-from gdsfactory import containers
-from gdsfactory import labels
 from gdsfactory import typings
 from gdsfactory import path
 from gdsfactory import snap
-from gdsfactory import read
 from gdsfactory import add_ports
 from gdsfactory import write_cells
 from gdsfactory import add_pins
 from gdsfactory import technology
-from gdsfactory import routing
-from gdsfactory import export
 from gdsfactory import functions
 
 from gdsfactory.add_padding import (
@@ -65,10 +61,52 @@ from gdsfactory.pdk import (
     get_constant,
 )
 from gdsfactory.get_factories import get_cells
+from gdsfactory.get_components import get_components
 from gdsfactory.cross_section import get_cross_sections
-from gdsfactory.grid import grid, grid_with_text
 
-c = components
+# submodules and functions that import the component library, routing or readers.
+# They are imported on first access to keep `import gdsfactory` fast.
+_lazy_imports = {
+    "c": ("gdsfactory.components", None),
+    "components": ("gdsfactory.components", None),
+    "containers": ("gdsfactory.containers", None),
+    "export": ("gdsfactory.export", None),
+    "grid": ("gdsfactory.grid", "grid"),
+    "grid_with_text": ("gdsfactory.grid", "grid_with_text"),
+    "import_gds": ("gdsfactory.read.import_gds", "import_gds"),
+    "labels": ("gdsfactory.labels", None),
+    "read": ("gdsfactory.read", None),
+    "routing": ("gdsfactory.routing", None),
+}
+
+
+def __getattr__(name: str) -> object:
+    if name not in _lazy_imports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _lazy_imports[name]
+    value = importlib.import_module(module_name)
+    if attr:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Module(types.ModuleType):
+    def __setattr__(self, name: str, value: object) -> None:
+        # importing a submodule binds it onto the package, which would shadow
+        # the lazy function of the same name (gdsfactory.grid and gf.grid)
+        if isinstance(value, types.ModuleType) and name in _lazy_imports:
+            module_name, attr = _lazy_imports[name]
+            if attr and value.__name__ == module_name:
+                value = getattr(value, attr)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Module
 
 
 def clear_cache(kcl: kf.KCLayout = kf.kcl) -> None:
@@ -113,6 +151,7 @@ __all__ = (
     "get_cell",
     "get_cells",
     "get_component",
+    "get_components",
     "get_constant",
     "get_cross_section",
     "get_cross_sections",
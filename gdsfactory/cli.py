@@ -56,18 +56,23 @@ def write_cells(gdspath: str, dirpath: str = "", recursively: bool = True) -> No
 
 
 @app.command()
-def merge_gds(dirpath: str = "", gdspath: str = "") -> None:
-    """Merges GDS cells from a directory into a single GDS."""
-    from gdsfactory.read.from_gdspaths import from_gdsdir
+def merge_gds(
+    dirpath: str = "",
+    gdspath: str = "",
+    n_jobs: int = typer.Option(
+        -1, "--n-jobs", "-j", help="Threads reading files ahead, -1 for all CPUs"
+    ),
+) -> None:
+    """Merges GDS files from a directory into a single GDS (or OASIS) file."""
+    from gdsfactory.read.from_gdspaths import merge_gdspaths
 
     dirpath = dirpath or pathlib.Path.cwd()
     gdspath = gdspath or pathlib.Path.cwd() / "merged.gds"
 
     dirpath = pathlib.Path(dirpath)
 
-    c = from_gdsdir(dirpath=dirpath)
-    c.write_gds(gdspath=gdspath)
-    c.show()
+    gdspaths = sorted(dirpath.glob("*.gds"))
+    _show(merge_gdspaths(gdspaths, gdspath=gdspath, n_jobs=n_jobs))
 
 
 @app.command()
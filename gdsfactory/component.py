@@ -338,6 +338,9 @@ class ComponentBase:
             keep_mirror: if True, keeps the mirror of the port.
             cross_section: cross_section of the port.
         """
+        if isinstance(name, kf.Port):
+            # kf.KCell.add_port(port) signature, used when reading ports from metadata
+            name, port = None, name
         if port:
             kf.KCell.add_port(self, port=port, name=name, keep_mirror=keep_mirror)
             return port
@@ -960,6 +963,7 @@ class ComponentBase:
         layer_views: LayerViews | None = None,
         layer_stack: LayerStack | None = None,
         exclude_layers: tuple[Layer, ...] | None = None,
+        instances: bool = True,
     ):
         """Return Component 3D trimesh Scene.
 
@@ -970,6 +974,8 @@ class ComponentBase:
             layer_stack: contains thickness and zmin for each layer.
                 Defaults to active PDK.layer_stack.
             exclude_layers: layers to exclude.
+            instances: if True, meshes each cell once and instances it with
+                transforms. If False, flattens each layer into one mesh.
 
         """
         from gdsfactory.export.to_3d import to_3d
@@ -979,6 +985,7 @@ class ComponentBase:
             layer_views=layer_views,
             layer_stack=layer_stack,
             exclude_layers=exclude_layers,
+            instances=instances,
         )
 
     def get_netlist(self, recursive: bool = False, **kwargs) -> dict[str, Any]:
@@ -1124,6 +1131,49 @@ class ComponentBase:
             show_ruler: if True, shows ruler.
             return_fig: if True, returns the figure.
         """
+        import matplotlib.pyplot as plt
+
+        img_array = self.to_image(show_labels=show_labels, show_ruler=show_ruler)
+
+        # Compute the figure dimensions based on the image size and desired DPI
+        dpi = 80
+        fig_width = img_array.shape[1] / dpi
+        fig_height = img_array.shape[0] / dpi
+
+        fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=dpi)
+
+        # Remove margins and display the image
+        ax.imshow(img_array)
+        ax.axis("off")  # Hide axes
+        ax.set_position([0, 0, 1, 1])  # Set axes to occupy the full figure space
+
+        plt.subplots_adjust(
+            left=0, right=1, top=1, bottom=0, wspace=0, hspace=0
+        )  # Remove any padding
+        plt.tight_layout(pad=0)  # Ensure no space is wasted
+        if return_fig:
+            return fig
+
+    def to_image(
+        self,
+        width: int = 800,
+        height: int = 600,
+        show_labels: bool = False,
+        show_ruler: bool = True,
+        png: bool = False,
+    ) -> np.ndarray | bytes:
+        """Renders the Component with klayout without a figure.
+
+        Only this Component and its subcells are copied into the view,
+        so the cost does not depend on the size of the global layout.
+
+        Args:
+            width: image width in pixels.
+            height: image height in pixels.
+            show_labels: if True, shows labels.
+            show_ruler: if True, shows ruler.
+            png: if True, returns the PNG bytes instead of an RGBA array.
+        """
         from io import BytesIO
 
         import matplotlib.pyplot as plt
@@ -1132,18 +1182,18 @@ class ComponentBase:
 
         self.insert_vinsts()
 
-        lyp_path = GDSDIR_TEMP / "layer_properties.lyp"
-        layer_views = get_layer_views()
-        layer_views.to_lyp(filepath=lyp_path)
+        lyp_path = _get_lyp_path(get_layer_views())
 
         layout_view = lay.LayoutView()
         cell_view_index = layout_view.create_layout(True)
         layout_view.active_cellview_index = cell_view_index
         cell_view = layout_view.cellview(cell_view_index)
         layout = cell_view.layout()
-        layout.assign(kf.kcl.layout)
+        layout.dbu = self.kcl.dbu
+        cell = layout.create_cell(self.name)
+        cell.copy_tree(self._kdb_cell)
 
-        cell_view.cell = layout.cell(self.name)
+        cell_view.cell = cell
 
         layout_view.max_hier()
         layout_view.load_layer_props(str(lyp_path))
@@ -1152,31 +1202,14 @@ class ComponentBase:
         layout_view.set_config("text-visible", "true" if show_labels else "false")
         layout_view.set_config("grid-show-ruler", "true" if show_ruler else "false")
 
-        pixel_buffer = layout_view.get_pixels_with_options(800, 600)
+        pixel_buffer = layout_view.get_pixels_with_options(width, height)
         png_data = pixel_buffer.to_png_data()
+        if png:
+            return png_data
 
-        # Convert PNG data to NumPy array and display with matplotlib
+        # Convert PNG data to NumPy array
         with BytesIO(png_data) as f:
-            img_array = plt.imread(f)
-
-        # Compute the figure dimensions based on the image size and desired DPI
-        dpi = 80
-        fig_width = img_array.shape[1] / dpi
-        fig_height = img_array.shape[0] / dpi
-
-        fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=dpi)
-
-        # Remove margins and display the image
-        ax.imshow(img_array)
-        ax.axis("off")  # Hide axes
-        ax.set_position([0, 0, 1, 1])  # Set axes to occupy the full figure space
-
-        plt.subplots_adjust(
-            left=0, right=1, top=1, bottom=0, wspace=0, hspace=0
-        )  # Remove any padding
-        plt.tight_layout(pad=0)  # Ensure no space is wasted
-        if return_fig:
-            return fig
+            return plt.imread(f)
 
     # Deprecated methods
     @property
@@ -1237,6 +1270,23 @@ class ComponentAllAngle(ComponentBase, kf.VKCell):
         c.plot(**kwargs)
 
 
+def _get_lyp_path(layer_views: LayerViews) -> pathlib.Path:
+    """Returns a .lyp file for layer_views, only written when they change."""
+    import hashlib
+
+    key = hashlib.md5(layer_views.model_dump_json().encode()).hexdigest()[:8]
+    lyp_path = _lyp_paths.get(key)
+    if lyp_path is None or not lyp_path.exists():
+        lyp_path = layer_views.to_lyp(
+            filepath=GDSDIR_TEMP / f"layer_properties_{key}.lyp"
+        )
+        _lyp_paths[key] = lyp_path
+    return lyp_path
+
+
+_lyp_paths: dict[str, pathlib.Path] = {}
+
+
 def container(component, function, **kwargs) -> Component:
     """Returns new component with a component reference.
 
@@ -5,7 +5,7 @@ from typing import Any
 
 import gdsfactory as gf
 from gdsfactory.component import Component
-from gdsfactory.grid import grid, grid_with_text
+from gdsfactory.get_components import get_components
 from gdsfactory.pack import pack
 from gdsfactory.typings import CellSpec, ComponentSpec
 
@@ -15,6 +15,7 @@ def generate_doe(
     settings: dict[str, list[Any]],
     do_permutations: bool = False,
     function: CellSpec | None = None,
+    n_jobs: int | None = None,
 ) -> tuple[tuple[Component, ...], tuple[dict, ...]]:
     """Generates a component DOE (Design of Experiment).
 
@@ -25,24 +26,16 @@ def generate_doe(
         settings: component settings.
         do_permutations: for each setting.
         function: for the component (add padding, grating couplers ...)
+        n_jobs: number of processes to build the DOE. None builds serially.
     """
     if do_permutations:
         settings_list = [dict(zip(settings, t)) for t in it.product(*settings.values())]
     else:
         settings_list = [dict(zip(settings, t)) for t in zip(*settings.values())]
 
-    if function:
-        function = gf.get_cell(function)
-        if not callable(function):
-            raise ValueError(f"Error {function!r} needs to be callable.")
-        component_list = [
-            function(gf.get_component(doe, **settings)) for settings in settings_list
-        ]
-    else:
-        component_list = [
-            gf.get_component(doe, **settings) for settings in settings_list
-        ]
-
+    component_list = get_components(
+        [doe] * len(settings_list), settings_list, function=function, n_jobs=n_jobs
+    )
     component_list = tuple(component_list)
     settings_list = tuple(settings_list)
     return component_list, settings_list
@@ -53,6 +46,7 @@ def pack_doe(
     settings: dict[str, tuple[Any, ...]],
     do_permutations: bool = False,
     function: CellSpec | None = None,
+    n_jobs: int | None = None,
     **kwargs,
 ) -> Component:
     """Packs a component DOE (Design of Experiment) using pack.
@@ -62,6 +56,7 @@ def pack_doe(
         settings: component settings.
         do_permutations: for each setting.
         function: to apply (add padding, grating couplers).
+        n_jobs: number of processes to build the DOE. None builds serially.
         kwargs: for pack.
 
     Keyword Args:
@@ -82,7 +77,11 @@ def pack_doe(
         v_mirror: vertical mirror using x axis (1, y) (0, y).
     """
     component_list, settings_list = generate_doe(
-        doe=doe, settings=settings, do_permutations=do_permutations, function=function
+        doe=doe,
+        settings=settings,
+        do_permutations=do_permutations,
+        function=function,
+        n_jobs=n_jobs,
     )
 
     c = pack(component_list, **kwargs)
@@ -103,6 +102,7 @@ def pack_doe_grid(
     do_permutations: bool = False,
     function: CellSpec | None = None,
     with_text: bool = False,
+    n_jobs: int | None = None,
     **kwargs,
 ) -> Component:
     """Packs a component DOE (Design of Experiment) using grid.
@@ -113,6 +113,7 @@ def pack_doe_grid(
         do_permutations: for each setting.
         function: to apply to component (add padding, grating couplers).
         with_text: includes text label.
+        n_jobs: number of processes to build the DOE. None builds serially.
         kwargs: for grid.
 
     Keyword Args:
@@ -130,31 +131,19 @@ def pack_doe_grid(
         h_mirror: horizontal mirror y axis (x, 1) (1, 0). most common mirror.
         v_mirror: vertical mirror using x axis (1, y) (0, y).
     """
-    if do_permutations:
-        settings_list = [dict(zip(settings, t)) for t in it.product(*settings.values())]
-    else:
-        settings_list = [dict(zip(settings, t)) for t in zip(*settings.values())]
-
-    if function:
-        function = gf.get_cell(function)
-        if not callable(function):
-            raise ValueError(f"Error {function!r} needs to be callable.")
-        component_list = [
-            function(gf.get_component(doe, **settings)) for settings in settings_list
-        ]
-    else:
-        component_list = [
-            gf.get_component(doe, **settings) for settings in settings_list
-        ]
-
-    component_list = tuple(component_list)
-    settings_list = tuple(settings_list)
+    component_list, settings_list = generate_doe(
+        doe=doe,
+        settings=settings,
+        do_permutations=do_permutations,
+        function=function,
+        n_jobs=n_jobs,
+    )
 
     if with_text:
-        c = grid_with_text(component_list, **kwargs)
+        c = gf.grid_with_text(component_list, **kwargs)
 
     else:
-        c = grid(component_list, **kwargs)
+        c = gf.grid(component_list, **kwargs)
 
     c.doe_names = [component.name for component in component_list]
     c.doe_settings = settings_list
@@ -9,7 +9,7 @@ from __future__ import annotations
 import hashlib
 import warnings
 from collections.abc import Callable, Iterable
-from functools import partial, wraps
+from functools import cached_property, partial, wraps
 from inspect import getmembers, signature
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Literal
@@ -215,7 +215,7 @@ class CrossSection(BaseModel):
     components_along_path: tuple[ComponentAlongPath, ...] = Field(default_factory=tuple)
     radius: float | None = None
     radius_min: float | None = None
-    bbox_layers: LayerSpecs | None = None
+    bbox_layers: tuple[LayerSpec, ...] | None = None
     bbox_offsets: Floats | None = None
 
     model_config = ConfigDict(extra="forbid", frozen=True)
@@ -243,8 +243,7 @@ class CrossSection(BaseModel):
     def name(self) -> str:
         if self._name:
             return self._name
-        h = hashlib.md5(str(self).encode()).hexdigest()[:8]
-        return f"xs_{h}"
+        return f"xs_{self.hash[:8]}"
 
     @property
     def width(self) -> float:
@@ -261,17 +260,30 @@ class CrossSection(BaseModel):
 
     def __getitem__(self, key: str) -> Section:
         """Returns the section with the given name."""
-        key_to_section = {s.name: s for s in self.sections}
+        key_to_section = self._key_to_section
         if key in key_to_section:
             return key_to_section[key]
         else:
             raise KeyError(f"{key} not in {list(key_to_section.keys())}")
 
-    @property
+    @cached_property
+    def _key_to_section(self) -> dict[str, Section]:
+        return {s.name: s for s in self.sections}
+
+    @cached_property
     def hash(self) -> str:
         """Returns a hash of the cross_section."""
         return hashlib.md5(str(self).encode()).hexdigest()
 
+    def model_copy(
+        self, *, update: dict[str, Any] | None = None, deep: bool = False
+    ) -> CrossSection:
+        """Returns a copy of the cross_section without the cached properties."""
+        xs = super().model_copy(update=update, deep=deep)
+        for key in ("hash", "_key_to_section"):
+            xs.__dict__.pop(key, None)
+        return xs
+
     def copy(
         self,
         width: float | None = None,
@@ -452,6 +464,18 @@ class Transition(CrossSection):
 
 cross_sections = {}
 _cross_section_default_names = {}
+_cross_section_default_factories = []
+
+
+def _get_cross_section_default_names() -> dict[str, str]:
+    """Returns {default cross_section name: function name}.
+
+    Default cross_sections are only built the first time a registered function is called.
+    """
+    while _cross_section_default_factories:
+        func = _cross_section_default_factories.pop(0)
+        _cross_section_default_names[func().name] = func.__name__
+    return _cross_section_default_names
 
 
 def xsection(func):
@@ -465,14 +489,14 @@ def xsection(func):
         def xs_sc(width=TECH.width_sc, radius=TECH.radius_sc):
             return gf.cross_section.cross_section(width=width, radius=radius)
     """
-    default_xs = func()
-    _cross_section_default_names[default_xs.name] = func.__name__
+    _cross_section_default_factories.append(func)
 
     @wraps(func)
     def newfunc(**kwargs):
         xs = func(**kwargs)
-        if xs.name in _cross_section_default_names:
-            xs._name = _cross_section_default_names[xs.name]
+        default_names = _get_cross_section_default_names()
+        if xs.name in default_names:
+            xs._name = default_names[xs.name]
         return xs
 
     cross_sections[func.__name__] = newfunc
@@ -1,8 +1,22 @@
 """GDS regression test. Inspired by lytest."""
 
+import dataclasses
 import filecmp
+import hashlib
+import json
+import multiprocessing
+import os
 import pathlib
 import shutil
+import time
+import traceback
+import warnings
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any
+from xml.etree import ElementTree
 
 import kfactory as kf
 from kfactory import KCell, KCLayout, kdb, logger
@@ -10,6 +24,7 @@ from kfactory import KCell, KCLayout, kdb, logger
 import gdsfactory as gf
 from gdsfactory.config import CONF, PATH
 from gdsfactory.name import clean_name, get_name_short
+from gdsfactory.typings import ComponentSpec
 
 
 class GeometryDifference(Exception):
@@ -29,6 +44,10 @@ def diff(
     ignore_label_differences: bool | None = None,
     show: bool = False,
     stagger: bool = True,
+    layers: Iterable[tuple[int, int]] | None = None,
+    tile_size: float = 1000.0,
+    threads: int | None = None,
+    report: PathType | None = None,
 ) -> bool:
     """Returns True if files are different, prints differences and shows them in klayout.
 
@@ -42,6 +61,12 @@ def diff(
         ignore_label_differences: if True, ignores any label differences when run in XOR mode. If None (default) defers to the value set in CONF.difftest_ignore_label_differences
         show: shows diff in klayout.
         stagger: if True, staggers the old/new/xor views. If False, all three are overlaid.
+        layers: only runs the XOR on these (layer, datatype). Defaults to all layers.
+        tile_size: size of the square XOR tiles in um. Each thread only holds the
+            shapes of one tile, which bounds the memory of large layouts.
+        threads: number of XOR threads. Defaults to the number of CPUs.
+        report: optional JSON file to write the differences of each layer to,
+            with the difference count and bounding box (um) of each tile.
     """
     old = read_top_cell(ref_file)
     new = read_top_cell(run_file)
@@ -132,60 +157,71 @@ def diff(
     if not ignore_label_differences and (a_texts or b_texts):
         equivalent = False
 
+    layer_reports: dict[str, dict[str, Any]] = {}
+
     if not equal:
-        c = KCell(f"{test_name}_difftest")
         ref = old
         run = new
 
-        old = KCell(f"{test_name}_old")
-        new = KCell(f"{test_name}_new")
-
-        old.copy_tree(ref._kdb_cell)
-        new.copy_tree(run._kdb_cell)
-
-        old.name = f"{test_name}_old"
-        new.name = f"{test_name}_new"
-
-        old_ref = c << old
-        new_ref = c << new
-
-        dy = 10
-        if stagger:
-            old_ref.dmovey(+old.dysize + dy)
-            new_ref.dmovey(-old.dysize - dy)
-
-        layer_label = (1, 0)
-        layer_label = kf.kcl.layer(*layer_label)
-        c.shapes(layer_label).insert(kf.kdb.DText("old", old_ref.dtrans))
-        c.shapes(layer_label).insert(kf.kdb.DText("new", new_ref.dtrans))
-        c.shapes(layer_label).insert(
-            kf.kdb.DText(
-                "xor", kf.kdb.DTrans(new_ref.dxmin, old_ref.dymax - old_ref.dysize - dy)
+        if show:
+            c = KCell(f"{test_name}_difftest")
+            old = KCell(f"{test_name}_old")
+            new = KCell(f"{test_name}_new")
+
+            old.copy_tree(ref._kdb_cell)
+            new.copy_tree(run._kdb_cell)
+
+            old.name = f"{test_name}_old"
+            new.name = f"{test_name}_new"
+
+            old_ref = c << old
+            new_ref = c << new
+
+            dy = 10
+            if stagger:
+                old_ref.dmovey(+old.dysize + dy)
+                new_ref.dmovey(-old.dysize - dy)
+
+            layer_label = (1, 0)
+            layer_label = kf.kcl.layer(*layer_label)
+            c.shapes(layer_label).insert(kf.kdb.DText("old", old_ref.dtrans))
+            c.shapes(layer_label).insert(kf.kdb.DText("new", new_ref.dtrans))
+            c.shapes(layer_label).insert(
+                kf.kdb.DText(
+                    "xor",
+                    kf.kdb.DTrans(new_ref.dxmin, old_ref.dymax - old_ref.dysize - dy),
+                )
             )
-        )
+            diff = KCell(f"{test_name}_xor")
 
         if xor:
             print("Running XOR on differences...")
             # assume equivalence until we find XOR differences, determined significant by the settings
-            diff = KCell(f"{test_name}_xor")
+            xor_layers = None if layers is None else set(map(tuple, layers))
+            layer_infos = {
+                (info.layer, info.datatype): info
+                for info in [*ref.kcl.layer_infos(), *run.kcl.layer_infos()]
+            }
+
+            for key, layer in sorted(layer_infos.items()):
+                if xor_layers is not None and key not in xor_layers:
+                    continue
+                layer_ref = ref.kcl.layout.find_layer(layer)
+                layer_run = run.kcl.layout.find_layer(layer)
+                layer_report: dict[str, Any] = {}
 
-            for layer in c.kcl.layer_infos():
                 # exists in both
-                if (
-                    new.kcl.layout.find_layer(layer) is not None
-                    and old.kcl.layout.find_layer(layer) is not None
-                ):
-                    layer_ref = old.layer(layer)
-                    layer_run = new.layer(layer)
-
-                    region_run = kdb.Region(new.begin_shapes_rec(layer_run))
-                    region_ref = kdb.Region(old.begin_shapes_rec(layer_ref))
-                    region_diff = region_run ^ region_ref
-
-                    if not region_diff.is_empty():
-                        layer_id = c.layer(layer)
-                        region_xor = region_ref ^ region_run
-                        diff.shapes(layer_id).insert(region_xor)
+                if layer_ref is not None and layer_run is not None:
+                    region_xor, tiles = xor_tiled(
+                        ref._kdb_cell,
+                        run._kdb_cell,
+                        layer_ref,
+                        layer_run,
+                        tile_size=tile_size,
+                        threads=threads,
+                    )
+
+                    if not region_xor.is_empty():
                         xor_w_tolerance = region_xor.sized(-1)
                         is_sliver = xor_w_tolerance.is_empty()
                         message = f"{test_name}: XOR difference on layer {layer}"
@@ -196,23 +232,35 @@ def diff(
                         else:
                             equivalent = False
                         print(message)
+                        layer_report = dict(
+                            status="xor", sliver=is_sliver, region=region_xor
+                        )
+                        layer_report["tiles"] = tiles
                 # only in new
-                elif new.kcl.layout.find_layer(layer) is not None:
-                    layer_id = new.layer(layer)
-                    region = kdb.Region(new.begin_shapes_rec(layer_id))
-                    diff.shapes(c.kcl.layer(layer)).insert(region)
+                elif layer_run is not None:
+                    region_xor = kdb.Region(run.begin_shapes_rec(layer_run))
                     print(f"{test_name}: layer {layer} only exists in updated cell")
                     equivalent = False
+                    layer_report = dict(status="only_in_run", region=region_xor)
 
                 # only in old
-                elif old.kcl.layout.find_layer(layer) is not None:
-                    layer_id = old.layer(layer)
-                    region = kdb.Region(old.begin_shapes_rec(layer_id))
-                    diff.shapes(c.kcl.layer(layer)).insert(region)
+                elif layer_ref is not None:
+                    region_xor = kdb.Region(ref.begin_shapes_rec(layer_ref))
                     print(f"{test_name}: layer {layer} missing from updated cell")
                     equivalent = False
+                    layer_report = dict(status="only_in_ref", region=region_xor)
+
+                if not layer_report or layer_report["region"].is_empty():
+                    continue
+                region = layer_report.pop("region")
+                if show:
+                    diff.shapes(c.kcl.layer(layer)).insert(region)
+                layer_report["count"] = region.count()
+                layer_report["bbox"] = _bbox_to_list(region.bbox(), ref.kcl.dbu)
+                layer_reports[f"{layer.layer}/{layer.datatype}"] = layer_report
 
-            _ = c << diff
+            if show:
+                _ = c << diff
             if equivalent:
                 print("No significant XOR differences between layouts!")
         else:
@@ -221,8 +269,24 @@ def diff(
 
         if show and not equivalent:
             c.show()
-        return not equivalent
-    return False
+
+    if report:
+        report = pathlib.Path(report)
+        report.parent.mkdir(parents=True, exist_ok=True)
+        report.write_text(
+            json.dumps(
+                dict(
+                    ref=str(ref_file),
+                    run=str(run_file),
+                    equal=bool(equal),
+                    equivalent=equal or equivalent,
+                    tile_size=tile_size,
+                    layers=layer_reports,
+                ),
+                indent=2,
+            )
+        )
+    return not equal and not equivalent
 
 
 def difftest(
@@ -275,17 +339,15 @@ def difftest(
             f"Reference GDS file for {test_name!r} not found. Writing to {ref_file!r}"
         )
 
-    if filecmp.cmp(ref_file, run_file, shallow=False):
-        return
-
-    if diff(
+    status, _ = compare_gds(
         ref_file=ref_file,
         run_file=run_file,
         xor=xor,
         test_name=test_name,
         ignore_sliver_differences=ignore_sliver_differences,
         show=True,
-    ):
+    )
+    if status == "different":
         print(
             f"\ngds_run {filename!r} changed from gds_ref {str(ref_file)!r}\n"
             "You can check the differences in Klayout GUI or run XOR with\n"
@@ -301,6 +363,297 @@ def difftest(
             ) from exc
 
 
+def compare_gds(
+    ref_file: PathType,
+    run_file: PathType,
+    xor: bool = True,
+    test_name: str = "",
+    ignore_sliver_differences: bool | None = None,
+    show: bool = False,
+    report: PathType | None = None,
+    threads: int | None = None,
+    write_digests: bool = False,
+) -> tuple[str, list[tuple[int, int]]]:
+    """Compares a GDS file with its reference, from the fastest check to the slowest.
+
+    The files are first compared byte by byte, then by geometry digests, and
+    only then with `diff` on the layers with different digests.
+
+    Args:
+        ref_file: reference file.
+        run_file: new file.
+        xor: runs XOR on the layers with different digests.
+        test_name: prefix for the diff cells.
+        ignore_sliver_differences: see diff.
+        show: shows the differences in klayout.
+        report: optional JSON diff report, see diff.
+        threads: number of XOR threads, see diff.
+        write_digests: stores the digests of ref_file next to it, see
+            read_geometry_digests.
+
+    Returns:
+        status: "identical" (same bytes), "equivalent" (same geometry) or "different".
+        layers: (layer, datatype) with different digests.
+    """
+    if filecmp.cmp(ref_file, run_file, shallow=False):
+        return "identical", []
+
+    ref_digests = read_geometry_digests(ref_file, write=write_digests)
+    run_digests = get_geometry_digests(run_file)
+    layers = _get_different_layers(ref_digests, run_digests)
+    if not layers and (
+        CONF.difftest_ignore_cell_name_differences
+        or ref_digests["cells"] == run_digests["cells"]
+    ):
+        return "equivalent", []
+
+    different = diff(
+        ref_file=ref_file,
+        run_file=run_file,
+        xor=xor,
+        test_name=test_name,
+        ignore_sliver_differences=ignore_sliver_differences,
+        show=show,
+        layers=layers,
+        report=report,
+        threads=threads,
+    )
+    return ("different" if different else "equivalent"), layers
+
+
+@dataclasses.dataclass
+class DifftestResult:
+    """Result of the GDS regression test of one cell."""
+
+    name: str
+    status: str
+    ref_file: str = ""
+    run_file: str = ""
+    layers: list[str] = dataclasses.field(default_factory=list)
+    build_seconds: float = 0
+    diff_seconds: float = 0
+    error: str = ""
+
+    @property
+    def passed(self) -> bool:
+        return self.status in {"identical", "equivalent", "updated"}
+
+
+def difftest_batch(
+    cells: dict[str, ComponentSpec] | Iterable[ComponentSpec],
+    dirpath: pathlib.Path = PATH.gds_ref,
+    dirpath_run: pathlib.Path = PATH.gds_run,
+    xor: bool = True,
+    ignore_sliver_differences: bool | None = None,
+    update_references: bool = False,
+    n_jobs: int | None = None,
+    report: PathType | None = None,
+    junit: PathType | None = None,
+    write_digests: bool = False,
+) -> list[DifftestResult]:
+    """Builds and diffs many cells against their GDS references.
+
+    Unlike difftest it never prompts or shows differences, and does not raise on
+    differences. Each cell gets a result with a status:
+
+    - identical: same bytes as the reference.
+    - equivalent: same geometry as the reference.
+    - different: geometry differences (see the diff report of the cell).
+    - missing_reference: the reference did not exist and is written.
+    - updated: different, and the reference is overwritten (update_references).
+    - error: the cell could not be built or compared.
+
+    Args:
+        cells: {name: component spec}, for example a PDK's cells, or a list of
+            component specs named after their component.
+        dirpath: directory where reference files are stored.
+        dirpath_run: directory to store the gds files and diff reports of the run.
+        xor: runs XOR on the layers with different digests.
+        ignore_sliver_differences: see diff.
+        update_references: overwrites the references of the different cells.
+        n_jobs: number of worker processes. None or 1 runs in this process.
+            -1 uses all CPUs. The CPUs are shared among the XOR threads of the
+            workers.
+        report: optional JSON report of all results.
+        junit: optional JUnit XML report, one test case per cell.
+        write_digests: stores the geometry digests of the references next to
+            them, so later runs do not read the reference layouts again.
+
+    .. code::
+
+        import gdsfactory as gf
+        from gdsfactory.difftest import difftest_batch
+
+        pdk = gf.get_active_pdk()
+        results = difftest_batch(pdk.cells, n_jobs=-1, junit="difftest.xml")
+        assert all(result.passed for result in results)
+    """
+    # cells without a name are named after their component by the worker
+    items = cells.items() if isinstance(cells, dict) else [(None, c) for c in cells]
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs and n_jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        warnings.warn(
+            "n_jobs needs the 'fork' start method to share the active PDK with the "
+            "workers. Running serially.",
+            stacklevel=2,
+        )
+        n_jobs = None
+    threads = max(1, (os.cpu_count() or 1) // n_jobs) if n_jobs else None
+
+    dirpath.mkdir(exist_ok=True, parents=True)
+    dirpath_run.mkdir(exist_ok=True, parents=True)
+    args = [
+        (
+            name,
+            cell,
+            dirpath,
+            dirpath_run,
+            xor,
+            ignore_sliver_differences,
+            threads,
+            write_digests,
+        )
+        for name, cell in items
+    ]
+
+    if not n_jobs or n_jobs == 1:
+        results = [_difftest_cell(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            results = list(executor.map(_difftest_cell, *zip(*args)))
+
+    if update_references:
+        for result in results:
+            if result.status == "different":
+                shutil.copy(result.run_file, result.ref_file)
+                result.status = "updated"
+
+    if report:
+        _write_json_report(results, report)
+    if junit:
+        _write_junit_report(results, junit)
+    return results
+
+
+def _get_spec_name(cell: ComponentSpec) -> str:
+    """Returns the name of a component spec without building it."""
+    if isinstance(cell, str):
+        return cell
+    if isinstance(cell, gf.Component):
+        return cell.name
+    if isinstance(cell, dict):
+        return _get_spec_name(cell["component"])
+    func = cell.func if isinstance(cell, partial) else cell
+    return getattr(func, "__name__", str(cell))
+
+
+def _difftest_cell(
+    name: str | None,
+    cell: ComponentSpec,
+    dirpath: pathlib.Path,
+    dirpath_run: pathlib.Path,
+    xor: bool,
+    ignore_sliver_differences: bool | None,
+    threads: int | None,
+    write_digests: bool,
+) -> DifftestResult:
+    """Builds a cell, writes its GDS and compares it with its reference.
+
+    A cell without a name is named after its component.
+    """
+    result = DifftestResult(name=name or _get_spec_name(cell), status="error")
+
+    try:
+        t0 = time.perf_counter()
+        component = gf.get_component(cell)
+        result.name = name or component.name
+        filename = get_name_short(clean_name(result.name), max_cellname_length=32)
+        ref_file = dirpath / f"{filename}.gds"
+        result.ref_file = str(ref_file)
+        run_file = component.write_gds(gdspath=dirpath_run / f"{filename}.gds")
+        result.run_file = str(run_file)
+        t1 = time.perf_counter()
+        result.build_seconds = t1 - t0
+
+        if not ref_file.exists():
+            shutil.copy(run_file, ref_file)
+            result.status = "missing_reference"
+            return result
+
+        result.status, layers = compare_gds(
+            ref_file=ref_file,
+            run_file=run_file,
+            xor=xor,
+            test_name=filename,
+            ignore_sliver_differences=ignore_sliver_differences,
+            report=dirpath_run / f"{filename}.diff.json",
+            threads=threads,
+            write_digests=write_digests,
+        )
+        result.layers = [f"{layer}/{datatype}" for layer, datatype in layers]
+        result.diff_seconds = time.perf_counter() - t1
+    except Exception:
+        result.error = traceback.format_exc()
+    return result
+
+
+def _write_json_report(results: list[DifftestResult], report: PathType) -> None:
+    report = pathlib.Path(report)
+    report.parent.mkdir(parents=True, exist_ok=True)
+    statuses: dict[str, int] = {}
+    for result in results:
+        statuses[result.status] = statuses.get(result.status, 0) + 1
+    report.write_text(
+        json.dumps(
+            dict(
+                passed=all(result.passed for result in results),
+                statuses=statuses,
+                cells=[
+                    dict(dataclasses.asdict(result), passed=result.passed)
+                    for result in results
+                ],
+            ),
+            indent=2,
+        )
+    )
+
+
+def _write_junit_report(results: list[DifftestResult], junit: PathType) -> None:
+    suite = ElementTree.Element(
+        "testsuite",
+        name="difftest",
+        tests=str(len(results)),
+        failures=str(
+            sum(result.status != "error" and not result.passed for result in results)
+        ),
+        errors=str(sum(result.status == "error" for result in results)),
+        time=f"{sum(r.build_seconds + r.diff_seconds for r in results):.3f}",
+    )
+    for result in results:
+        case = ElementTree.SubElement(
+            suite,
+            "testcase",
+            classname="difftest",
+            name=result.name,
+            time=f"{result.build_seconds + result.diff_seconds:.3f}",
+        )
+        if result.status == "error":
+            ElementTree.SubElement(case, "error", message="error").text = result.error
+        elif not result.passed:
+            message = result.status
+            if result.layers:
+                message += f" on layers {', '.join(result.layers)}"
+            ElementTree.SubElement(
+                case, "failure", message=message
+            ).text = f"ref: {result.ref_file}\nrun: {result.run_file}"
+    junit = pathlib.Path(junit)
+    junit.parent.mkdir(parents=True, exist_ok=True)
+    ElementTree.ElementTree(suite).write(junit, encoding="utf-8", xml_declaration=True)
+
+
 def overwrite(ref_file, run_file):
     val = input("Save current GDS as the new reference (Y)? [Y/n]")
     if val.upper().startswith("N"):
@@ -312,6 +665,174 @@ def overwrite(ref_file, run_file):
     raise GeometryDifference
 
 
+def xor_tiled(
+    cell1: kdb.Cell,
+    cell2: kdb.Cell,
+    layer1: int,
+    layer2: int,
+    tile_size: float = 1000.0,
+    threads: int | None = None,
+) -> tuple[kdb.Region, list[dict[str, Any]]]:
+    """Returns the XOR of a layer of two cells and the XOR of each tile.
+
+    Runs the XOR in square tiles with the KLayout tiling processor, so only the
+    shapes of the tiles being processed are flattened.
+
+    Args:
+        cell1: first cell.
+        cell2: second cell, can be in another layout with the same dbu.
+        layer1: layer index in the layout of cell1.
+        layer2: layer index in the layout of cell2.
+        tile_size: in um.
+        threads: number of threads. Defaults to the number of CPUs.
+
+    Returns:
+        region: merged XOR in dbu.
+        tiles: for each tile with differences, its index (ix, iy), number of
+            XOR polygons and XOR bounding box in um.
+    """
+    tiles = _XorTiles()
+    tp = kdb.TilingProcessor()
+    tp.input("a", cell1.layout(), cell1.cell_index(), layer1)
+    tp.input("b", cell2.layout(), cell2.cell_index(), layer2)
+    tp.output("o", tiles)
+    tp.dbu = cell1.layout().dbu
+    tp.tile_size(tile_size, tile_size)
+    tp.threads = threads or os.cpu_count() or 1
+    tp.queue("_output(o, a ^ b)")
+    tp.execute("XOR")
+    tiles.region.merge()
+    return tiles.region, sorted(tiles.tiles, key=lambda tile: (tile["ix"], tile["iy"]))
+
+
+class _XorTiles(kdb.TileOutputReceiver):
+    """Collects the XOR of each tile."""
+
+    def __init__(self) -> None:
+        self.region = kdb.Region()
+        self.tiles: list[dict[str, Any]] = []
+
+    def put(self, ix, iy, tile, obj, dbu, clip) -> None:
+        region = obj & kdb.Region(tile) if clip else obj
+        if region.is_empty():
+            return
+        self.region += region
+        self.tiles.append(
+            dict(
+                ix=ix,
+                iy=iy,
+                count=region.count(),
+                bbox=_bbox_to_list(region.bbox(), dbu),
+            )
+        )
+
+
+def _bbox_to_list(bbox: kdb.Box, dbu: float) -> list[float]:
+    dbox = bbox.to_dtype(dbu)
+    return [dbox.left, dbox.bottom, dbox.right, dbox.top]
+
+
+# {path: ((size, mtime), digests)} of the last files read, oldest first
+_digests: OrderedDict[str, tuple[tuple[int, int], dict[str, str]]] = OrderedDict()
+_digests_max_files = 256
+
+
+def get_geometry_digests(gdspath: PathType) -> dict[str, str]:
+    """Returns canonical digests of the geometry of the top cell of a GDS file.
+
+    The digest of a layer is a hash of its merged polygons and its texts, so it
+    does not depend on the hierarchy, shape order or metadata of the file. Equal
+    digests mean the layer has the same geometry. The digests are cached per
+    file version (size and modification time) for the last files read.
+
+    Returns:
+        {"dbu": dbu, "cells": digest of the cell names, "layer/datatype": digest}.
+    """
+    path = pathlib.Path(gdspath).resolve()
+    stat = path.stat()
+    key, version = str(path), (stat.st_size, stat.st_mtime_ns)
+    if key in _digests and _digests[key][0] == version:
+        _digests.move_to_end(key)
+        return _digests[key][1]
+
+    layout = kdb.Layout()
+    layout.read(str(path))
+    digests = _get_layout_digests(layout)
+    _digests[key] = (version, digests)
+    _digests.move_to_end(key)
+    while len(_digests) > _digests_max_files:
+        _digests.popitem(last=False)
+    return digests
+
+
+def read_geometry_digests(ref_file: PathType, write: bool = False) -> dict[str, str]:
+    """Returns the geometry digests of a reference GDS, stored next to it.
+
+    The digests can be stored in a .digest.json file with a hash of the GDS
+    file, and are computed again when the GDS file changes.
+
+    Args:
+        ref_file: reference GDS file.
+        write: writes the .digest.json file next to the reference.
+    """
+    ref_file = pathlib.Path(ref_file)
+    digest_file = ref_file.with_name(f"{ref_file.stem}.digest.json")
+    if not write and not digest_file.exists():
+        return get_geometry_digests(ref_file)
+    gds_hash = hashlib.blake2b(ref_file.read_bytes(), digest_size=16).hexdigest()
+
+    if digest_file.exists():
+        stored = json.loads(digest_file.read_text())
+        if stored.get("gds") == gds_hash:
+            return stored["digests"]
+
+    digests = get_geometry_digests(ref_file)
+    if write:
+        digest_file.write_text(
+            json.dumps({"gds": gds_hash, "digests": digests}, indent=2, sort_keys=True)
+        )
+    return digests
+
+
+def _get_layout_digests(layout: kdb.Layout) -> dict[str, str]:
+    top = layout.top_cell()
+    cells = sorted(
+        layout.cell(ci).name for ci in [top.cell_index(), *top.called_cells()]
+    )
+    digests = {"dbu": str(layout.dbu), "cells": _hash(cells)}
+
+    for layer_index in layout.layer_indexes():
+        info = layout.get_info(layer_index)
+        region = kdb.Region(top.begin_shapes_rec(layer_index))
+        texts = kdb.Texts(top.begin_shapes_rec(layer_index))
+        if region.is_empty() and texts.is_empty():
+            continue
+        region.merge()
+        digests[f"{info.layer}/{info.datatype}"] = _hash(
+            sorted(str(polygon) for polygon in region.each())
+            + sorted(f"{text.string} {text.trans}" for text in texts.each())
+        )
+    return digests
+
+
+def _hash(items: list[str]) -> str:
+    return hashlib.blake2b("\n".join(items).encode(), digest_size=16).hexdigest()
+
+
+def _get_different_layers(
+    digests1: dict[str, str], digests2: dict[str, str]
+) -> list[tuple[int, int]]:
+    """Returns the (layer, datatype) with different digests, all if the dbu differs."""
+    layer_keys = (set(digests1) | set(digests2)) - {"dbu", "cells"}
+    if digests1["dbu"] != digests2["dbu"]:
+        different = layer_keys
+    else:
+        different = {
+            key for key in layer_keys if digests1.get(key) != digests2.get(key)
+        }
+    return sorted(tuple(map(int, key.split("/"))) for key in different)  # type: ignore
+
+
 def read_top_cell(arg0):
     kcl = KCLayout(name=str(arg0))
     kcl.read(arg0)
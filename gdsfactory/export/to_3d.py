@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-import shapely
+import mapbox_earcut
+import numpy as np
+from kfactory import kdb
 
 from gdsfactory.component import Component
 from gdsfactory.technology import DerivedLayer, LayerStack, LayerViews, LogicalLayer
@@ -12,9 +14,15 @@ def to_3d(
     layer_views: LayerViews | None = None,
     layer_stack: LayerStack | None = None,
     exclude_layers: tuple[LayerSpec, ...] | None = None,
+    instances: bool = True,
 ):
     """Return Component 3D trimesh Scene.
 
+    Each layer of each cell is extruded into one mesh. With instances the
+    LogicalLayer levels keep the hierarchy: the shapes of each cell are meshed
+    once and placed with a scene node for each of its instances. DerivedLayer
+    levels are always flattened into one mesh of the top cell.
+
     Args:
         component: to extrude in 3D.
         layer_views: layer colors from Klayout Layer Properties file.
@@ -22,6 +30,8 @@ def to_3d(
         layer_stack: contains thickness and zmin for each layer.
             Defaults to active PDK.layer_stack.
         exclude_layers: list of layer index to exclude.
+        instances: if True, meshes each cell once and instances it with
+            transforms. If False, flattens each layer into one mesh.
 
     """
     from gdsfactory.pdk import (
@@ -32,7 +42,7 @@ def to_3d(
     )
 
     try:
-        from trimesh.creation import extrude_polygon
+        from trimesh import Trimesh
         from trimesh.scene import Scene
     except ImportError as e:
         print("you need to `pip install trimesh`")
@@ -45,13 +55,16 @@ def to_3d(
     exclude_layers = exclude_layers or ()
     exclude_layers = [get_layer(layer) for layer in exclude_layers]
 
-    component_with_booleans = layer_stack.get_component_with_derived_layers(component)
-    polygons_per_layer = component_with_booleans.get_polygons_points(
-        merge=True,
-    )
+    tuple_to_view = {
+        view.layer: view for view in layer_views.get_layer_views().values()
+    }
+    dbu = component.kcl.dbu
+    occurrences: dict[int, list[kdb.DCplxTrans]] | None = None
+    # layer hash -> flattened Region, shared by the levels that need one
+    cache: dict[int, kdb.Region] = {}
     has_polygons = False
 
-    for level in layer_stack.layers.values():
+    for level_name, level in layer_stack.layers.items():
         layer = level.layer
 
         if isinstance(layer, LogicalLayer):
@@ -69,22 +82,66 @@ def to_3d(
         if layer_index in exclude_layers:
             continue
 
-        if layer_index not in polygons_per_layer:
+        flatten = not instances or isinstance(layer, DerivedLayer)
+        if flatten:
+            region = layer.get_shapes(component, cache=cache)
+            if region.is_empty():
+                continue
+        elif component.bbox(layer_index).empty():
             continue
 
         zmin = level.zmin
-        layer_view = layer_views.get_from_tuple(layer_tuple)
+        if layer_tuple not in tuple_to_view:
+            raise ValueError(
+                f"LayerView {layer_tuple} not in {list(tuple_to_view.keys())}"
+            )
+        layer_view = tuple_to_view[layer_tuple]
         color_rgb = [c / 255 for c in layer_view.fill_color.as_rgb_tuple(alpha=False)]
-        if zmin is not None and layer_view.visible:
-            has_polygons = True
-            polygons = polygons_per_layer[layer_index]
-            height = level.thickness
-            for polygon in polygons:
-                p = shapely.geometry.Polygon(polygon)
-                mesh = extrude_polygon(p, height=height)
-                mesh.apply_translation((0, 0, zmin))
-                mesh.visual.face_colors = (*color_rgb, 0.5)
-                scene.add_geometry(mesh)
+        if zmin is None or not layer_view.visible:
+            continue
+
+        has_polygons = True
+        height = level.thickness
+
+        if flatten:
+            regions = [(component.name, region, [kdb.DCplxTrans()])]
+        else:
+            if occurrences is None:
+                occurrences = _get_occurrences(component)
+            layout = component.kcl.layout
+            regions = (
+                (
+                    layout.cell(cell_index).name,
+                    kdb.Region(layout.cell(cell_index).shapes(layer_index)),
+                    transformations,
+                )
+                for cell_index, transformations in occurrences.items()
+            )
+
+        for cell_name, region, transformations in regions:
+            if region.is_empty():
+                continue
+            vertices, faces = extrude_polygons(
+                list(region.merged().each()), zmin=zmin, height=height, dbu=dbu
+            )
+            mesh = Trimesh(vertices=vertices, faces=faces, process=False)
+            mesh.visual.face_colors = (*color_rgb, 0.5)
+
+            # the mesh is stored once and referenced by a node for each instance
+            node_name = scene.add_geometry(
+                mesh,
+                geom_name=f"{level_name}_{cell_name}",
+                transform=_get_matrix(transformations[0]),
+            )
+            _, geom_name = scene.graph[node_name]
+            for i, trans in enumerate(transformations[1:], start=1):
+                scene.graph.update(
+                    frame_to=f"{node_name}_{i}",
+                    frame_from=scene.graph.base_frame,
+                    matrix=_get_matrix(trans),
+                    geometry=geom_name,
+                )
+
     if not has_polygons:
         raise ValueError(
             f"{component.name!r} does not have polygons defined in the "
@@ -93,6 +150,127 @@ def to_3d(
     return scene
 
 
+def extrude_polygons(
+    polygons: list[kdb.Polygon],
+    zmin: float,
+    height: float,
+    dbu: float = 1e-3,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the vertices (N, 3) and triangle faces (M, 3) of extruded polygons.
+
+    Boxes are split into two triangles and the other polygons (with holes) are
+    triangulated with earcut. The side walls of all polygons are built at once,
+    with outward facing triangles.
+
+    Args:
+        polygons: in dbu, should not overlap.
+        zmin: bottom of the extrusion in um.
+        height: of the extrusion in um.
+        dbu: database unit in um.
+    """
+    boxes = [polygon.bbox() for polygon in polygons if polygon.is_box()]
+    others = [polygon for polygon in polygons if not polygon.is_box()]
+
+    # counter-clockwise box rings first, then the rings of the other polygons
+    points = [
+        np.array(
+            [
+                (b.left, b.bottom, b.right, b.bottom, b.right, b.top, b.left, b.top)
+                for b in boxes
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+    ]
+    ring_sizes = [np.full(len(boxes), 4, dtype=np.int64)]
+    triangles = [
+        (np.arange(len(boxes))[:, None, None] * 4 + [[0, 1, 2], [0, 2, 3]]).reshape(
+            -1, 3
+        )
+    ]
+    start = 4 * len(boxes)
+
+    for polygon in others:
+        rings = [_get_ring(polygon.each_point_hull(), hole=False)]
+        rings += [
+            _get_ring(polygon.each_point_hole(i), hole=True)
+            for i in range(polygon.holes())
+        ]
+        sizes = np.array([len(ring) for ring in rings], dtype=np.int64)
+        ring_points = np.concatenate(rings)
+        indices = mapbox_earcut.triangulate_int64(
+            ring_points, np.cumsum(sizes).astype(np.uint32)
+        )
+        points.append(ring_points)
+        ring_sizes.append(sizes)
+        triangles.append(indices.reshape(-1, 3).astype(np.int64) + start)
+        start += len(ring_points)
+
+    xy = np.concatenate(points).astype(np.float64) * dbu
+    sizes = np.concatenate(ring_sizes)
+    top = np.concatenate(triangles)
+    n = len(xy)
+
+    # earcut does not guarantee the winding of its triangles, top faces are ccw
+    a, b, c = xy[top[:, 0]], xy[top[:, 1]], xy[top[:, 2]]
+    cross = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (
+        c[:, 0] - a[:, 0]
+    )
+    top[cross < 0] = top[cross < 0][:, ::-1]
+
+    # each point i has an edge to the next point of its ring
+    i = np.arange(n)
+    j = i + 1
+    ends = np.cumsum(sizes)
+    j[ends - 1] = ends - sizes
+    sides = np.concatenate(
+        [np.stack([i, j, j + n], axis=1), np.stack([i, j + n, i + n], axis=1)]
+    )
+
+    vertices = np.concatenate(
+        [
+            np.column_stack([xy, np.full(n, zmin)]),
+            np.column_stack([xy, np.full(n, zmin + height)]),
+        ]
+    )
+    faces = np.concatenate([top + n, top[:, ::-1], sides])
+    return vertices, faces
+
+
+def _get_ring(points, hole: bool) -> np.ndarray:
+    """Returns (N, 2) ring points, counter-clockwise for hulls and clockwise for holes."""
+    ring = np.array([(p.x, p.y) for p in points], dtype=np.int64)
+    x, y = ring[:, 0], ring[:, 1]
+    area = np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+    return ring[::-1] if (area < 0) != hole else ring
+
+
+def _get_occurrences(component: Component) -> dict[int, list[kdb.DCplxTrans]]:
+    """Returns {cell_index: transformations in um} for the top cell and its subcells."""
+    occurrences = {component.cell_index(): [kdb.DCplxTrans()]}
+    it = kdb.RecursiveInstanceIterator(component.kcl.layout, component._kdb_cell)
+    while not it.at_end():
+        occurrences.setdefault(it.inst_cell().cell_index(), []).append(
+            kdb.DCplxTrans(it.dtrans() * it.inst_dtrans())
+        )
+        it.next()
+    return occurrences
+
+
+def _get_matrix(trans: kdb.DCplxTrans) -> np.ndarray:
+    """Returns the 4x4 homogeneous matrix of a transformation in um."""
+    angle = np.deg2rad(trans.angle)
+    mirror = -1 if trans.is_mirror() else 1
+    cos, sin = trans.mag * np.cos(angle), trans.mag * np.sin(angle)
+    return np.array(
+        [
+            [cos, -sin * mirror, 0, trans.disp.x],
+            [sin, cos * mirror, 0, trans.disp.y],
+            [0, 0, 1, 0],
+            [0, 0, 0, 1],
+        ]
+    )
+
+
 if __name__ == "__main__":
     import gdsfactory as gf
 
@@ -7,12 +7,18 @@ See Also:
 - https://github.com/jamesbowman/cuflow/blob/master/gerber.py
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal
 
-from pydantic import BaseModel, Field
+import numpy as np
+from kfactory import kdb
+from pydantic import BaseModel
 
 from gdsfactory import Component
+from gdsfactory.functions import _polygons_to_array
+from gdsfactory.typings import PathType
 
 
 class GerberLayer(BaseModel):
@@ -65,12 +71,16 @@ def polygon(pp):
 
 def to_gerber(
     component: Component,
-    dirpath: Path,
+    dirpath: PathType,
     layermap_to_gerber_layer: dict[tuple[int, int], GerberLayer],
-    options: GerberOptions = Field(default_factory=dict),
+    options: GerberOptions | None = None,
+    n_jobs: int | None = None,
 ) -> None:
     """Writes each layer to a different Gerber file.
 
+    The polygons of each layer are merged and written as regions (G36/G37).
+    Coordinates are converted to integers in units of the resolution.
+
     Args:
         component: to export.
         dirpath: directory path.
@@ -80,30 +90,47 @@ def to_gerber(
             mode: Literal["mm", "in"] = "mm"
             resolution: float = 1e-6
             int_size: int = 4
+        n_jobs: number of threads writing one layer file each.
+            None or 1 writes the layers one after another. -1 uses all CPUs.
     """
     # Split references into polygons and circles (components will need to be recursively iterated through)
     # for ref in component.references:
     #     if ref.parent_cell.name.startswith("circle"):
     #         radius = ref.parent_cell.settings["radius"]
     #         center = ref.center
-    # Each layer and a list of the polygons (as lists of points) on that layer
-    layer_to_polygons = component.get_polygons_points()
+    from gdsfactory.pdk import get_layer
+
+    options = options or GerberOptions()
+    dirpath = Path(dirpath)
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    header = options.header or [
+        "Gerber file generated by gdsfactory",
+        f"Component: {component.name}",
+    ]
+    digits = resolutions[options.resolution]
+    # gerber units per dbu
+    unit = 1e3 if options.mode == "mm" else 25.4e3
+    scale = component.kcl.dbu / (unit * options.resolution)
+
+    # layers writing into the same file overwrite the previous ones
+    jobs = {
+        (dirpath / layer.name.replace(" ", "_")).with_suffix(".gbr"): (layer_tup, layer)
+        for layer_tup, layer in layermap_to_gerber_layer.items()
+    }
 
-    for layer_tup, layer in layermap_to_gerber_layer.items():
-        filename = (dirpath / layer.name.replace(" ", "_")).with_suffix(".gbr")
+    def write_layer(
+        filename: Path, layer_tup: tuple[int, int], layer: GerberLayer
+    ) -> None:
+        region = kdb.Region(component.begin_shapes_rec(get_layer(layer_tup)))
+        polygons = list(region.merged().each())
 
         with open(filename, "w+") as f:
-            header = options.header or [
-                "Gerber file generated by gdsfactory",
-                f"Component: {component.name}",
-            ]
-
             # Write file spec info
             f.write("%TF.FileFunction," + ",".join(layer.function) + "*%\n")
             f.write(f"%TF.FilePolarity,{layer.polarity}*%\n")
-
-            digits = resolutions[options.resolution]
-            f.write(f"%FSLA{options.int_size}{digits}Y{options.int_size}{digits}X*%\n")
+            f.write(f"%FSLAX{options.int_size}{digits}Y{options.int_size}{digits}*%\n")
 
             # Write header comments
             f.writelines([f"G04 {line}*\n" for line in header])
@@ -111,7 +138,7 @@ def to_gerber(
             # Setup units/mode
             units = options.mode.upper()
             f.write(f"%MO{units}*%\n")
-            f.write("%LPD*%")
+            f.write("%LPD*%\n")
 
             f.write("G01*\n")
 
@@ -119,13 +146,50 @@ def to_gerber(
             f.write("%ADD10C,0.050000*%\n")
 
             # Only supports polygons for now
-            if layer_tup in layer_to_polygons.keys():
-                for poly in layer_to_polygons[layer_tup.layer]:
-                    f.write(polygon(poly))
+            for i in range(0, len(polygons), 10000):
+                f.write(regions(polygons[i : i + 10000], scale=scale))
 
             # File end
             f.write("M02*\n")
 
+    if not n_jobs or n_jobs == 1:
+        for filename, job in jobs.items():
+            write_layer(filename, *job)
+        return
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(write_layer, filename, *job)
+            for filename, job in jobs.items()
+        ]
+        for future in futures:
+            future.result()
+
+
+def regions(polygons: list[kdb.Polygon], scale: float = 1) -> str:
+    """Returns the G36/G37 regions of polygons in dbu.
+
+    Holes are cut into the hull, as a region is a single closed contour.
+
+    Args:
+        polygons: to write.
+        scale: gerber coordinate units per dbu.
+    """
+    points, offsets = _polygons_to_array(polygons)
+    if not len(points):
+        return ""
+    # close each contour with its first point
+    starts, ends = offsets[:-1], offsets[1:]
+    points = np.insert(points, ends, points[starts], axis=0)
+    starts = starts + np.arange(len(starts))
+    ends = ends + np.arange(1, len(ends) + 1)
+    coordinates = np.rint(points * scale).astype(np.int64)
+
+    formats = np.full(len(points), "X%dY%dD01*\n", dtype=object)
+    formats[starts] = "G36*\nX%dY%dD02*\n"
+    formats[ends - 1] = "X%dY%dD01*\nG37*\n"
+    return "".join(formats.tolist()) % tuple(coordinates.ravel().tolist())
+
 
 if __name__ == "__main__":
     import gdsfactory as gf
@@ -3,7 +3,8 @@ from __future__ import annotations
 import numpy as np
 
 from gdsfactory.component import Component
-from gdsfactory.typings import Floats, Layers
+from gdsfactory.functions import get_polygons_points_array
+from gdsfactory.typings import Floats, Layers, PathType
 
 
 def to_np(
@@ -23,32 +24,168 @@ def to_np(
         pad_width: padding pixels around the image.
 
     """
-    import skimage.draw as skdraw
-
-    pixels_per_um = (1 / nm_per_pixel) * 1e3
-    xmin, ymin = component.bbox[0]
-    xmax, ymax = component.bbox[1]
-    shape = (
-        int(np.ceil(xmax - xmin) * pixels_per_um),
-        int(np.ceil(ymax - ymin) * pixels_per_um),
+    masks = to_np_layers(
+        component, nm_per_pixel=nm_per_pixel, layers=layers, pad_width=pad_width
     )
-    img = np.zeros(shape, dtype=float)
-    layer_to_polygons = component.get_polygons_points(by="tuple")
-
     values = values or [1] * len(layers)
+    img = np.zeros(masks.shape[1:], dtype=float)
+
+    for mask, value in zip(masks, values):
+        img[mask.astype(bool)] = value
+
+    return img
+
+
+def to_np_layers(
+    component: Component,
+    nm_per_pixel: float = 20,
+    layers: Layers = ((1, 0),),
+    pad_width: int = 1,
+    oversample: int = 1,
+    bitpack: bool = False,
+    tile_size: int | None = None,
+    filepath: PathType | None = None,
+) -> np.ndarray:
+    """Returns a uint8 array of shape (layers, x, y) with one pixel mask per layer.
+
+    Polygons are filled with a nonzero winding scanline on the dbu grid, all
+    polygons of a layer at once. A pixel is inside when its center is inside.
+
+    Args:
+        component: Component.
+        nm_per_pixel: pixel size in nm.
+        layers: to convert, one mask per layer.
+        pad_width: padding pixels around the image.
+        oversample: samples per pixel along x and y. If > 1 returns the area
+            coverage of each pixel scaled to 0-255 instead of a 0/1 mask.
+        bitpack: packs the 0/1 masks along y with np.packbits (8 pixels per byte).
+        tile_size: number of pixels along x to rasterize at a time.
+            Defaults to all of them. Bounds the memory of the scanline buffers.
+        filepath: optional path to write the stack into a np.memmap, so the
+            image does not need to fit in memory.
+    """
+    if oversample < 1:
+        raise ValueError(f"oversample = {oversample} needs to be >= 1")
+    if bitpack and oversample > 1:
+        raise ValueError("bitpack only supports 0/1 masks (oversample=1)")
+
+    dbu = component.kcl.dbu
+    pixel = nm_per_pixel * 1e-3 / dbu
+    bbox = component.bbox()
+    nx = int(np.ceil(bbox.width() / pixel)) + 2 * pad_width
+    ny = int(np.ceil(bbox.height() / pixel)) + 2 * pad_width
+    x0 = bbox.left - pad_width * pixel
+    y0 = bbox.bottom - pad_width * pixel
+
+    shape = (len(layers), nx, (ny + 7) // 8 if bitpack else ny)
+    if filepath:
+        img = np.memmap(filepath, dtype=np.uint8, mode="w+", shape=shape)
+    else:
+        img = np.zeros(shape, dtype=np.uint8)
+
+    layer_to_polygons = get_polygons_points_array(
+        component, by="tuple", layers=layers, dbu=True
+    )
+    tile_size = tile_size or nx
+
+    for i, layer in enumerate(layers):
+        points, offsets = layer_to_polygons.get(
+            layer, (np.zeros((0, 2)), np.zeros(1, dtype=np.int64))
+        )
+        edges = _get_edges(points, offsets)
 
-    for layer, value in zip(layers, values):
-        if layer in layer_to_polygons:
-            polygons = layer_to_polygons[layer]
-            for polygon in polygons:
-                r = polygon[:, 0] - xmin
-                c = polygon[:, 1] - ymin
-                rr, cc = skdraw.polygon(
-                    r * pixels_per_um, c * pixels_per_um, shape=shape
-                )
-                img[rr, cc] = value
-
-    return np.pad(img, pad_width=pad_width)
+        for ix in range(0, nx, tile_size):
+            nxt = min(tile_size, nx - ix)
+            coverage = _rasterize(
+                edges,
+                x0=x0 + ix * pixel,
+                y0=y0,
+                pixel=pixel,
+                shape=(nxt, ny),
+                oversample=oversample,
+            )
+            if bitpack:
+                coverage = np.packbits(coverage, axis=-1)
+            img[i, ix : ix + nxt] = coverage
+
+    if filepath:
+        img.flush()
+    return img
+
+
+def _get_edges(points: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Returns (N, 4) array of x1, y1, x2, y2 closed polygon edges."""
+    points = np.asarray(points, dtype=np.float64)
+    next_index = np.arange(1, len(points) + 1)
+    next_index[offsets[1:] - 1] = offsets[:-1]
+    return np.hstack([points, points[next_index]])
+
+
+def _rasterize(
+    edges: np.ndarray,
+    x0: float,
+    y0: float,
+    pixel: float,
+    shape: tuple[int, int],
+    oversample: int = 1,
+) -> np.ndarray:
+    """Returns a uint8 (nx, ny) mask (or coverage if oversample > 1) of edges.
+
+    Each sample column along x is a scanline. Every edge adds its direction
+    (+1, -1) where it crosses a scanline, and a cumulative sum along y gives
+    the winding number of each sample.
+
+    Args:
+        edges: (N, 4) array of x1, y1, x2, y2 in dbu.
+        x0: x of the left side of the first pixel in dbu.
+        y0: y of the bottom side of the first pixel in dbu.
+        pixel: pixel size in dbu.
+        shape: number of pixels along x and y.
+        oversample: samples per pixel along x and y.
+    """
+    nx, ny = shape[0] * oversample, shape[1] * oversample
+    step = pixel / oversample
+
+    xa, ya, xb, yb = edges.T
+    xmin = np.minimum(xa, xb)
+    xmax = np.maximum(xa, xb)
+
+    # scanlines k whose sample x0 + (k + 0.5) * step is in [xmin, xmax)
+    start = np.clip(np.ceil((xmin - x0) / step - 0.5), 0, nx).astype(np.int64)
+    stop = np.clip(np.ceil((xmax - x0) / step - 0.5), 0, nx).astype(np.int64)
+    counts = stop - start
+    crossing = counts > 0
+    counts = counts[crossing]
+    xa, ya, xb, yb, start = (
+        xa[crossing],
+        ya[crossing],
+        xb[crossing],
+        yb[crossing],
+        start[crossing],
+    )
+
+    edge = np.repeat(np.arange(len(counts)), counts)
+    k = start[edge] + np.arange(len(edge)) - np.repeat(np.cumsum(counts) - counts, counts)
+    x = x0 + (k + 0.5) * step
+    y = ya[edge] + (x - xa[edge]) * (yb[edge] - ya[edge]) / (xb[edge] - xa[edge])
+
+    # first sample along y on or above the crossing
+    j = np.clip(np.ceil((y - y0) / step - 0.5), 0, ny).astype(np.int64)
+    index = k * (ny + 1) + j
+    up = xb[edge] > xa[edge]
+    size = nx * (ny + 1)
+    winding = np.bincount(index[up], minlength=size) - np.bincount(
+        index[~up], minlength=size
+    )
+    inside = np.cumsum(winding.reshape(nx, ny + 1), axis=1)[:, :ny] != 0
+
+    if oversample == 1:
+        return inside.astype(np.uint8)
+
+    samples = inside.reshape(shape[0], oversample, shape[1], oversample).sum(
+        axis=(1, 3)
+    )
+    return (samples * 255 // oversample**2).astype(np.uint8)
 
 
 if __name__ == "__main__":
@@ -1,22 +1,43 @@
 from __future__ import annotations
 
+import itertools
+import os
 import pathlib
+import struct
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
+
+import numpy as np
+from kfactory import kdb
 
 from gdsfactory.component import Component
 from gdsfactory.technology import DerivedLayer, LayerStack, LogicalLayer
-from gdsfactory.typings import LayerSpec
+from gdsfactory.typings import LayerSpec, PathType
+
+# binary STL facet: normal, 3 vertices and a 2 byte attribute
+stl_dtype = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")]
+)
 
 
 def to_stl(
     component: Component,
-    filepath: str,
+    filepath: PathType,
     layer_stack: LayerStack | None = None,
     exclude_layers: tuple[LayerSpec, ...] | None = None,
     hull_invalid_polygons: bool = False,
     scale: float | None = None,
+    chunk_size: int = 10000,
+    n_jobs: int | None = None,
 ) -> None:
     """Exports a Component into STL.
 
+    Polygons are extruded in chunks and their facets written straight into a
+    binary STL file, so memory does not grow with the size of the output.
+    The layers of each level are flattened while the level is written, not the
+    whole component at once.
+
     Args:
         component: to export.
         filepath: filepath prefix to write STL to.
@@ -25,22 +46,24 @@ def to_stl(
         exclude_layers: list of layer index to exclude.
         hull_invalid_polygons: If True, replaces invalid polygons (determined by shapely.Polygon.is_valid) with its convex hull.
         scale: Optional factor by which to scale meshes before writing.
+        chunk_size: number of polygons to extrude at a time.
+        n_jobs: number of threads writing one layer file each.
+            None or 1 writes the layers one after another. -1 uses all CPUs.
 
     """
-    import shapely
-    import trimesh.creation
-
     from gdsfactory.pdk import get_active_pdk, get_layer, get_layer_stack
 
     layer_stack = layer_stack or get_layer_stack()
-    has_polygons = False
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
 
     filepath = pathlib.Path(filepath)
     exclude_layers = exclude_layers or ()
     exclude_layers = [get_layer(layer) for layer in exclude_layers]
 
-    component_with_booleans = layer_stack.get_component_with_derived_layers(component)
-    polygons_per_layer = component_with_booleans.get_polygons_points()
+    dbu = component.kcl.dbu
+    # levels writing into the same file overwrite the previous ones
+    jobs: dict[pathlib.Path, tuple[LogicalLayer | DerivedLayer, int, float, float]] = {}
 
     for level in layer_stack.layers.values():
         layer = level.layer
@@ -54,48 +77,150 @@ def to_stl(
             raise ValueError(f"Layer {layer!r} is not a DerivedLayer or LogicalLayer")
 
         layer_tuple = tuple(layer_index)
+        layer_index = int(get_layer(layer_index))
 
         if layer_index in exclude_layers:
             continue
 
-        if layer_index not in polygons_per_layer:
+        if isinstance(layer, LogicalLayer) and component.bbox(layer_index).empty():
             continue
 
         zmin = level.zmin
         if zmin is not None:
-            has_polygons = True
-            polygons = polygons_per_layer[layer_index]
-            height = level.thickness
             layer_name = level.name or f"{layer_tuple[0]}_{layer_tuple[1]}"
             filepath_layer = (
                 filepath.parent / f"{filepath.stem}_{layer_name}{filepath.suffix}"
             )
-            print(
-                f"Write {filepath_layer.absolute()!r} zmin = {zmin:.3f}, height = {height:.3f}"
+            jobs[filepath_layer] = (layer, layer_index, zmin, level.thickness)
+
+    def write_layer(
+        filepath: pathlib.Path,
+        layer: LogicalLayer | DerivedLayer,
+        layer_index: int,
+        zmin: float,
+        height: float,
+    ) -> bool:
+        """Writes the polygons of one level and returns whether it has any."""
+        # only the layers of this level are flattened, and freed once written
+        if isinstance(layer, DerivedLayer):
+            region = layer.get_shapes(component, cache={})
+            if region.is_empty():
+                return False
+            polygons: Iterable[kdb.Polygon] = region.each()
+        else:
+            polygons = _get_polygons_rec(component, layer_index)
+
+        print(f"Write {filepath.absolute()!r} zmin = {zmin:.3f}, height = {height:.3f}")
+        polygons = _get_polygons(polygons, hull_invalid_polygons=hull_invalid_polygons)
+        with open(filepath, "wb") as f:
+            write_stl(
+                f,
+                _extrude_chunks(
+                    polygons,
+                    zmin=zmin,
+                    height=height,
+                    dbu=dbu,
+                    chunk_size=chunk_size,
+                    scale=scale,
+                ),
             )
-            meshes = []
-            for polygon in polygons:
-                p = shapely.geometry.Polygon(polygon)
-
-                if hull_invalid_polygons and not p.is_valid:
-                    p = p.convex_hull
-
-                mesh = trimesh.creation.extrude_polygon(p, height=height)
-                mesh.apply_translation((0, 0, zmin))
-                meshes.append(mesh)
+        return True
+
+    if not n_jobs or n_jobs == 1:
+        written = [
+            write_layer(filepath_layer, *job) for filepath_layer, job in jobs.items()
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(write_layer, filepath_layer, *job)
+                for filepath_layer, job in jobs.items()
+            ]
+            written = [future.result() for future in futures]
+
+    if not any(written):
+        raise ValueError(
+            f"{component.name!r} does not have polygons defined in the "
+            f"layer_stack or layer_views for the active Pdk {get_active_pdk().name!r}"
+        )
 
-        layer_mesh = trimesh.util.concatenate(meshes)
 
-        if scale:
-            layer_mesh.apply_scale(scale)
+def write_stl(f: BinaryIO, meshes: Iterable[tuple[np.ndarray, np.ndarray]]) -> int:
+    """Writes meshes into a binary STL file and returns the number of facets.
 
-        layer_mesh.export(filepath_layer)
+    The facets of each (vertices, faces) mesh are written as they come, and the
+    number of facets is written into the header at the end.
 
-    if not has_polygons:
-        raise ValueError(
-            f"{component.name!r} does not have polygons defined in the "
-            f"layer_stack or layer_views for the active Pdk {get_active_pdk().name!r}"
+    Args:
+        f: binary file opened for writing, needs to be seekable.
+        meshes: iterable of (N, 3) vertices and (M, 3) triangle faces.
+    """
+    start = f.tell()
+    f.write(b"gdsfactory".ljust(80, b" "))
+    f.write(struct.pack("<I", 0))
+    count = 0
+
+    for vertices, faces in meshes:
+        triangles = vertices[faces]
+        normals = np.cross(
+            triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
         )
+        norms = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = np.divide(normals, norms, out=np.zeros_like(normals), where=norms > 0)
+
+        facets = np.zeros(len(faces), dtype=stl_dtype)
+        facets["normal"] = normals
+        facets["vertices"] = triangles
+        f.write(facets.tobytes())
+        count += len(faces)
+
+    end = f.tell()
+    f.seek(start + 80)
+    f.write(struct.pack("<I", count))
+    f.seek(end)
+    return count
+
+
+def _get_polygons_rec(component: Component, layer_index: int) -> Iterator[kdb.Polygon]:
+    """Yields the polygons of a layer of component and its instances, in dbu."""
+    for it in component.begin_shapes_rec(layer_index).each():
+        polygon = it.shape().polygon
+        if polygon is not None:
+            yield polygon.transformed(it.trans())
+
+
+def _get_polygons(
+    polygons: Iterable[kdb.Polygon], hull_invalid_polygons: bool = False
+) -> Iterator[kdb.Polygon]:
+    """Yields polygons, replacing the invalid ones with their convex hull."""
+    import shapely
+
+    for polygon in polygons:
+        if hull_invalid_polygons:
+            p = shapely.geometry.Polygon(
+                [(pt.x, pt.y) for pt in polygon.each_point_hull()]
+            )
+            if not p.is_valid:
+                points = p.convex_hull.exterior.coords[:-1]
+                polygon = kdb.Polygon([kdb.Point(x, y) for x, y in points])
+        yield polygon
+
+
+def _extrude_chunks(
+    polygons: Iterable[kdb.Polygon],
+    zmin: float,
+    height: float,
+    dbu: float,
+    chunk_size: int,
+    scale: float | None = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Yields (vertices, faces) of chunk_size polygons at a time."""
+    from gdsfactory.export.to_3d import extrude_polygons
+
+    polygons = iter(polygons)
+    while chunk := list(itertools.islice(polygons, chunk_size)):
+        vertices, faces = extrude_polygons(chunk, zmin=zmin, height=height, dbu=dbu)
+        yield (vertices * scale if scale else vertices), faces
 
 
 if __name__ == "__main__":
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from typing import TextIO
+
+import numpy as np
+from kfactory import kdb
+
 from gdsfactory.component import Component
-from gdsfactory.technology import LayerStack, LayerViews
-from gdsfactory.typings import Layer
+from gdsfactory.functions import _polygons_to_array
+from gdsfactory.technology import DerivedLayer, LayerStack, LayerViews, LogicalLayer
+from gdsfactory.typings import Layer, PathType
 
 
 def to_svg(
@@ -10,71 +16,175 @@ def to_svg(
     layer_views: LayerViews | None = None,
     layer_stack: LayerStack | None = None,
     exclude_layers: tuple[Layer, ...] | None = None,
-    filename: str = "component.svg",
+    filename: PathType = "component.svg",
     scale: int = 1,
+    chunk_size: int = 1000,
 ) -> None:
-    """Write a 3D svg file from a component.
+    """Write an svg file with the layers of a component in layer_stack order.
+
+    The hierarchy is kept for LogicalLayer levels: the shapes of each cell on
+    each layer are written once into <defs> and each instance is a <use> with
+    the instance transform. DerivedLayer levels are flattened, as they need
+    boolean operations on the shapes of all cells.
 
     Args:
-        component: to extrude in 3D.
+        component: to write.
         layer_views: layer colors from Klayout Layer Properties file.
             Defaults to active PDK.layer_views.
-        layer_stack: contains thickness and zmin for each layer.
+        layer_stack: contains zmin for each layer, layers without zmin are skipped.
             Defaults to active PDK.layer_stack.
         exclude_layers: layers to exclude.
         filename: svg filename.
         scale: scale for the svg.
+        chunk_size: number of polygons per <path>.
     """
-    from gdsfactory.pdk import get_layer_stack, get_layer_views
+    from gdsfactory.pdk import get_layer, get_layer_stack, get_layer_views
 
     layer_views = layer_views or get_layer_views()
     layer_stack = layer_stack or get_layer_stack()
 
     exclude_layers = exclude_layers or ()
-    # layers = layer_views.layer_map.values()
-
-    component_with_booleans = layer_stack.get_component_with_derived_layers(component)
-    component_layers = component_with_booleans.layers
-    xsize = component.dxsize
-    ysize = component.dysize
-    dcx, dcy = component.dcenter.x, component.dcenter.y
-    dx, dy = dcx - xsize / 2, dcy - ysize / 2
-    group_num = 1
-    layer_to_polygons = component_with_booleans.get_polygons()
-
-    with open(filename, "w+") as f:
+    exclude_layers = [get_layer(layer) for layer in exclude_layers]
+    tuple_to_view = {
+        view.layer: view for view in layer_views.get_layer_views().values()
+    }
+
+    # (level, layer index, color) of the levels to write, bottom to top
+    levels = []
+    for level in layer_stack.layers.values():
+        layer = level.layer
+        if isinstance(layer, LogicalLayer):
+            layer_tuple = tuple(layer.layer)
+        elif isinstance(layer, DerivedLayer):
+            layer_tuple = tuple(level.derived_layer.layer)
+        else:
+            raise ValueError(f"Layer {layer!r} is not a DerivedLayer or LogicalLayer")
+        layer_index = int(get_layer(layer_tuple))
+
+        if layer_index in exclude_layers or level.zmin is None:
+            continue
+        if layer_tuple not in tuple_to_view:
+            raise ValueError(
+                f"LayerView {layer_tuple} not in {list(tuple_to_view.keys())}"
+            )
+        layer_view = tuple_to_view[layer_tuple]
+        if layer_view.visible:
+            color = layer_view.fill_color.as_hex(format="short")
+            levels.append((level, layer_index, color))
+
+    layout = component.kcl.layout
+    dbu = component.kcl.dbu
+    bbox = component.dbbox()
+    cell_indexes = {component.cell_index(), *component.called_cells()}
+    cells = [
+        layout.cell(cell_index)
+        for cell_index in layout.each_cell_bottom_up()
+        if cell_index in cell_indexes
+    ]
+    logical_layers = {
+        layer_index
+        for level, layer_index, _ in levels
+        if isinstance(level.layer, LogicalLayer)
+    }
+    cache: dict[int, kdb.Region] = {}
+
+    with open(filename, "w") as f:
         f.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
         f.write(
-            f'<svg\n   width="{xsize * scale:0.6f}" \n   height="{ysize * scale:0.6f}"\n'
-            '   version="1.1"\n'
-            '   xmlns:svg="http://www.w3.org/2000/svg"\n'
-            '   xmlns="http://www.w3.org/2000/svg">\n'
+            f'<svg width="{bbox.width() * scale:0.6f}" '
+            f'height="{bbox.height() * scale:0.6f}" version="1.1" '
+            'xmlns="http://www.w3.org/2000/svg" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink">\n'
         )
 
-        for level in layer_stack.layers.values():
-            layer = level.layer
-
-            if layer not in exclude_layers and layer in component_layers:
-                zmin = level.zmin
-                layer_view = layer_views.get_from_tuple(layer)
-                color = layer_view.fill_color.as_hex(format="short")
-                f.write('  <g id="layer%03i_datatype%03i">\n' % (layer[0], layer[1]))
-                group_num += 1
-                polygons = layer_to_polygons[layer]
-
-                if zmin is not None and layer_view.visible:
-                    for polygon in polygons:
-                        poly_str = f'    <path style="fill:{color}"\n          d="'
-                        for n, p in enumerate(polygon):
-                            poly_str += "M " if n == 0 else "L "
-                            poly_str += f"{(p[0] - dx) * scale:0.6f} {(-(p[1] - dy) + ysize) * scale:0.6f} "
-                        poly_str += 'Z"/>\n'
-                        f.write(poly_str)
-                    f.write("  </g>\n")
+        f.write("<defs>\n")
+        for layer_index in sorted(logical_layers):
+            for cell in cells:
+                if not cell.bbox(layer_index).empty():
+                    _write_cell(f, cell, layer_index, chunk_size=chunk_size)
+        f.write("</defs>\n")
+
+        # from dbu with y up to svg units with y down
+        trans = kdb.DCplxTrans(
+            scale * dbu, 0, True, -bbox.left * scale, bbox.top * scale
+        )
+        f.write(f'<g transform="{_get_matrix(trans)}">\n')
+        for level, layer_index, color in levels:
+            if isinstance(level.layer, LogicalLayer):
+                if component.bbox(layer_index).empty():
+                    continue
+                polygons = []
+            else:
+                polygons = list(level.layer.get_shapes(component, cache=cache).each())
+                if not polygons:
+                    continue
 
+            info = layout.get_info(layer_index)
+            f.write(
+                f'<g id="layer{info.layer:03d}_datatype{info.datatype:03d}" '
+                f'style="fill:{color}">\n'
+            )
+            if polygons:
+                _write_paths(f, polygons, chunk_size=chunk_size)
+            else:
+                href = _get_id(component.cell_index(), layer_index)
+                f.write(f'<use xlink:href="#{href}"/>\n')
+            f.write("</g>\n")
+        f.write("</g>\n")
         f.write("</svg>\n")
 
 
+def _write_cell(f: TextIO, cell: kdb.Cell, layer_index: int, chunk_size: int) -> None:
+    """Writes a <g> with the shapes of a cell on a layer and <use> for its instances."""
+    f.write(f'<g id="{_get_id(cell.cell_index(), layer_index)}">\n')
+    polygons = [
+        shape.polygon
+        for shape in cell.shapes(layer_index).each()
+        if shape.polygon is not None
+    ]
+    _write_paths(f, polygons, chunk_size=chunk_size)
+
+    for inst in cell.each_inst():
+        if inst.cell.bbox(layer_index).empty():
+            continue
+        href = _get_id(inst.cell_index, layer_index)
+        for trans in inst.cell_inst.each_cplx_trans():
+            f.write(f'<use xlink:href="#{href}" transform="{_get_matrix(trans)}"/>\n')
+    f.write("</g>\n")
+
+
+def _write_paths(f: TextIO, polygons: list[kdb.Polygon], chunk_size: int) -> None:
+    """Writes polygons in dbu as <path> elements with chunk_size polygons each.
+
+    Holes are cut into the hull, so the nonzero fill rule fills every polygon.
+    """
+    for i in range(0, len(polygons), chunk_size):
+        points, offsets = _polygons_to_array(polygons[i : i + chunk_size])
+        if not len(points):
+            continue
+        # "x,y" for each point, M at the start and Z at the end of each polygon
+        pairs = np.char.add(
+            np.char.add(points[:, 0].astype(str), ","), points[:, 1].astype(str)
+        )
+        pairs = pairs.astype(object)
+        pairs[offsets[:-1]] = "M" + pairs[offsets[:-1]]
+        pairs[offsets[1:] - 1] = pairs[offsets[1:] - 1] + "Z"
+        f.write(f'<path d="{" ".join(pairs.tolist())}"/>\n')
+
+
+def _get_id(cell_index: int, layer_index: int) -> str:
+    return f"c{cell_index}_l{layer_index}"
+
+
+def _get_matrix(trans: kdb.ICplxTrans | kdb.DCplxTrans) -> str:
+    """Returns the svg matrix(a b c d e f) of a transformation."""
+    angle = np.deg2rad(trans.angle)
+    mirror = -1 if trans.is_mirror() else 1
+    cos, sin = trans.mag * np.cos(angle), trans.mag * np.sin(angle)
+    values = (cos, sin, -sin * mirror, cos * mirror, trans.disp.x, trans.disp.y)
+    return "matrix({})".format(" ".join(f"{round(v, 12) + 0.0:.12g}" for v in values))
+
+
 if __name__ == "__main__":
     import gdsfactory as gf
 
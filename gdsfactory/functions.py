@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import itertools
 import warnings
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Literal
 
 import kfactory as kf
@@ -143,8 +145,7 @@ def get_polygons(
             polygons[layer_key] = []
         if merge:
             r.merge()
-        for p in r.each():
-            polygons[layer_key].append(p)
+        polygons[layer_key].extend(r.each())
     return polygons
 
 
@@ -164,36 +165,94 @@ def get_polygons_points(
         by: the format of the resulting keys in the dictionary ('index', 'name', 'tuple').
         layers: list of layer specs to extract the polygons from. If None, extracts all layers.
     """
-    polygons_dict = get_polygons(
+    polygons_arrays = get_polygons_points_array(
         component_or_instance=component_or_instance, merge=merge, by=by, layers=layers
     )
     polygons_points = {}
-    for layer, polygons in polygons_dict.items():
-        all_points = []
-        for polygon in polygons:
-            if scale:
-                points = np.array(
-                    [
-                        (point.x * scale, point.y * scale)
-                        for point in polygon.to_simple_polygon()
-                        .to_dtype(component_or_instance.kcl.dbu)
-                        .each_point()
-                    ]
-                )
-            else:
-                points = np.array(
-                    [
-                        (point.x, point.y)
-                        for point in polygon.to_simple_polygon()
-                        .to_dtype(component_or_instance.kcl.dbu)
-                        .each_point()
-                    ]
-                )
-            all_points.append(points)
-        polygons_points[layer] = all_points
+    for layer, (points, offsets) in polygons_arrays.items():
+        if scale:
+            points = points * scale
+        offsets = offsets.tolist()
+        polygons_points[layer] = [
+            points[start:end] for start, end in zip(offsets[:-1], offsets[1:])
+        ]
     return polygons_points
 
 
+def get_polygons_points_array(
+    component_or_instance: Component | Instance,
+    merge: bool = False,
+    by: Literal["index"] | Literal["name"] | Literal["tuple"] = "index",
+    layers: LayerSpecs | None = None,
+    dbu: bool = False,
+) -> dict[int | str | tuple[int, int], tuple[ndarray, ndarray]]:
+    """Returns a dict with the points of all polygons per layer in one array.
+
+    Each layer maps to (points, offsets), where points is a contiguous (N, 2)
+    array with the vertices of every polygon and the points of polygon i are
+    points[offsets[i]:offsets[i + 1]].
+
+    Args:
+        component_or_instance: to extract the polygons.
+        merge: if True, merges the polygons.
+        by: the format of the resulting keys in the dictionary ('index', 'name', 'tuple').
+        layers: list of layer specs to extract the polygons from. If None, extracts all layers.
+        dbu: if True, returns int32 points in dbu. Otherwise float64 points in um.
+    """
+    polygons_dict = get_polygons(
+        component_or_instance=component_or_instance, merge=merge, by=by, layers=layers
+    )
+    scale = None if dbu else component_or_instance.kcl.dbu
+    return {
+        layer: _polygons_to_array(polygons, scale=scale)
+        for layer, polygons in polygons_dict.items()
+    }
+
+
+def _polygons_to_array(
+    polygons: list[kf.kdb.Polygon], scale: float | None = None
+) -> tuple[ndarray, ndarray]:
+    """Returns (points, offsets) with the hull points of all polygons.
+
+    Args:
+        polygons: to extract the points from. Holes are cut into the hull.
+        scale: optional factor to convert the int32 dbu points to float64.
+    """
+    coordinates = [_polygon_coordinates(polygon) for polygon in polygons]
+    offsets = np.zeros(len(coordinates) + 1, dtype=np.int64)
+    np.cumsum([len(c) // 2 for c in coordinates], out=offsets[1:])
+    points = np.fromiter(
+        itertools.chain.from_iterable(coordinates),
+        dtype=np.int32,
+        count=2 * int(offsets[-1]),
+    ).reshape(-1, 2)
+    if scale is not None:
+        points = points * scale
+    return points, offsets
+
+
+def _polygon_coordinates(polygon: kf.kdb.Polygon) -> Sequence[int]:
+    """Returns x0, y0, x1, y1 ... in the order of polygon.to_simple_polygon()."""
+    if polygon.is_box():
+        # avoids creating one Point per vertex for the most common shape
+        box = polygon.bbox()
+        return (
+            box.left,
+            box.bottom,
+            box.left,
+            box.top,
+            box.right,
+            box.top,
+            box.right,
+            box.bottom,
+        )
+    if polygon.holes():
+        points = polygon.to_simple_polygon().each_point()
+    else:
+        points = polygon.each_point_hull()
+    return [c for point in points for c in (point.x, point.y)]
+
+
 def get_point_inside(component_or_instance: Component | Instance, layer) -> np.ndarray:
     """Returns a point inside the component or instance.
 
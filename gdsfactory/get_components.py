@@ -0,0 +1,151 @@
+"""Build many components, optionally in parallel worker processes."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import warnings
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import kfactory as kf
+
+import gdsfactory as gf
+from gdsfactory.component import Component
+from gdsfactory.typings import CellSpec, ComponentSpec
+
+
+def get_components(
+    components: Sequence[ComponentSpec],
+    settings: Sequence[dict[str, Any]] | None = None,
+    function: CellSpec | None = None,
+    n_jobs: int | None = None,
+) -> list[Component]:
+    """Returns a list of Components from a list of component specs.
+
+    With n_jobs each component is built in a worker process that works on its own
+    copy of the layout and returns its cells as GDS bytes. The cells are then read
+    into the main layout in the order of the specs. Cells with a name that already
+    exists in the layout are not read again and the existing cell is used instead,
+    so the result does not depend on the number of workers.
+
+    Args:
+        components: component specs.
+        settings: optional settings for each component spec.
+        function: to apply to each component (add padding, grating couplers ...).
+        n_jobs: number of worker processes. None or 1 builds in this process.
+            -1 uses all CPUs.
+
+    .. code::
+
+        import gdsfactory as gf
+
+        components = gf.get_components(
+            ["mmi1x2"] * 3,
+            settings=[dict(length_mmi=length) for length in (5, 10, 15)],
+            n_jobs=2,
+        )
+    """
+    settings = settings or [{}] * len(components)
+    if len(settings) != len(components):
+        raise ValueError(
+            f"Got {len(settings)} settings for {len(components)} components."
+        )
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs and n_jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        warnings.warn(
+            "n_jobs needs the 'fork' start method to share the active PDK with the "
+            "workers. Building components serially.",
+            stacklevel=2,
+        )
+        n_jobs = None
+
+    if not n_jobs or n_jobs == 1:
+        return [
+            _get_component(component, component_settings, function)
+            for component, component_settings in zip(components, settings)
+        ]
+
+    # Components are already built and can not be sent to other processes
+    remote = [
+        i
+        for i, component in enumerate(components)
+        if not isinstance(component, Component)
+    ]
+    results: list[Component | None] = [
+        component if isinstance(component, Component) else None
+        for component in components
+    ]
+    chunksize = max(1, len(remote) // (4 * n_jobs))
+
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, mp_context=multiprocessing.get_context("fork")
+    ) as executor:
+        gds = executor.map(
+            _get_component_gds,
+            [components[i] for i in remote],
+            [settings[i] for i in remote],
+            [function] * len(remote),
+            chunksize=chunksize,
+        )
+        for i, (names, data) in zip(remote, gds):
+            results[i] = _read_component_gds(names, data)
+
+    return results  # type: ignore[return-value]
+
+
+def _get_component(
+    component: ComponentSpec,
+    settings: dict[str, Any],
+    function: CellSpec | None = None,
+) -> Component:
+    c = gf.get_component(component, settings=settings)
+    if function:
+        function = gf.get_cell(function)
+        if not callable(function):
+            raise ValueError(f"Error {function!r} needs to be callable.")
+        c = function(c)
+    return c
+
+
+def _get_component_gds(
+    component: ComponentSpec,
+    settings: dict[str, Any],
+    function: CellSpec | None = None,
+) -> tuple[list[str], bytes]:
+    """Returns the cell names (top cell first) and GDS bytes of a component.
+
+    The GDS includes the ports, info and settings of each cell as metadata.
+    """
+    c = _get_component(component, settings, function)
+    c.insert_vinsts()
+    c.set_meta_data()
+    names = [c.name]
+    for kcell in (c.kcl[ci] for ci in c.called_cells()):
+        kcell.insert_vinsts()
+        kcell.set_meta_data()
+        names.append(kcell.name)
+
+    options = kf.kcell.save_layout_options()
+    options.format = "GDS2"
+    options.select_cell(c.cell_index())
+    return names, c.kcl.layout.write_bytes(options)
+
+
+def _read_component_gds(names: list[str], data: bytes) -> Component:
+    """Reads GDS bytes into the main layout and returns the top cell Component.
+
+    Cells that already exist in the layout are skipped.
+    """
+    kcl = kf.kcl
+    new_names = [name for name in names if not kcl.layout.has_cell(name)]
+    kcl.layout.read_bytes(data, kf.kcell.load_layout_options())
+
+    new_cells = [kcl.layout.cell(name) for name in new_names]
+    for cell in sorted(new_cells, key=lambda cell: cell.hierarchy_levels()):
+        Component(kdb_cell=cell, kcl=kcl)
+
+    return kcl[names[0]]
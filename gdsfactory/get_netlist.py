@@ -128,6 +128,7 @@ def get_netlist(
     get_instance_name: Callable[..., str] = get_instance_name_from_alias,
     allow_multiple: bool = False,
     connection_error_types: dict[str, list[str]] | None = None,
+    tolerance: int = 0,
 ) -> dict[str, Any]:
     """From Component returns a dict with instances, connections and placements.
 
@@ -147,6 +148,7 @@ def get_netlist(
         allow_multiple: False to raise an error if more than two ports share the same connection. \
                 if True, will return key: [value] pairs with [value] a list of all connected instances.
         connection_error_types: optional dictionary of port types and error types to raise an error for.
+        tolerance: max distance in dbu between two ports to consider them connected.
 
     Returns:
         instances: Dict of instance name and settings.
@@ -248,6 +250,7 @@ def get_netlist(
             port_type,
             allow_multiple=allow_multiple,
             connection_error_types=connection_error_types,
+            tolerance=tolerance,
         )
         if warnings_t:
             warnings[port_type] = warnings_t
@@ -287,6 +290,7 @@ def extract_connections(
     validators: dict[str, Callable] | None = None,
     allow_multiple: bool = False,
     connection_error_types: dict[str, list[str]] | None = None,
+    tolerance: int = 0,
 ):
     if validators is None:
         validators = DEFAULT_CONNECTION_VALIDATORS
@@ -299,9 +303,66 @@ def extract_connections(
         connection_validator=validator,
         allow_multiple=allow_multiple,
         connection_error_types=connection_error_types,
+        tolerance=tolerance,
     )
 
 
+def _group_ports_by_position(
+    port_names: list[str], ports: dict[str, Port], tolerance: int = 0
+) -> list[tuple[tuple[int, int], list[str]]]:
+    """Groups port names whose centers are within tolerance dbu.
+
+    Ports are hashed into a grid of tolerance + 1 dbu buckets so each port only
+    compares against the 3x3 neighbouring buckets, which keeps matching linear
+    in the number of ports. Ports within tolerance are merged transitively.
+
+    Args:
+        port_names: list of port names.
+        ports: dict of port names to Port objects.
+        tolerance: max distance in dbu (along x and y) to group two ports.
+
+    Returns:
+        list of (center of the first port, port names) for each group.
+    """
+    centers = [ports[port_name].center for port_name in port_names]
+
+    if tolerance <= 0:
+        by_xy = defaultdict(list)
+        for i, xy in enumerate(centers):
+            by_xy[xy].append(i)
+        groups = by_xy.values()
+
+    else:
+        size = tolerance + 1
+        buckets = defaultdict(list)
+        parent = list(range(len(port_names)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, (x, y) in enumerate(centers):
+            bx, by = x // size, y // size
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for j in buckets.get((bx + dx, by + dy), ()):
+                        xj, yj = centers[j]
+                        if abs(x - xj) <= tolerance and abs(y - yj) <= tolerance:
+                            parent[find(j)] = find(i)
+            buckets[bx, by].append(i)
+
+        by_root = defaultdict(list)
+        for i in range(len(port_names)):
+            by_root[find(i)].append(i)
+        groups = by_root.values()
+
+    return [
+        (centers[indices[0]], [port_names[i] for i in indices]) for indices in groups
+    ]
+
+
 def _extract_connections(
     port_names: list[str],
     ports: dict[str, Port],
@@ -310,6 +371,7 @@ def _extract_connections(
     raise_error_for_warnings: list[str] | None = None,
     allow_multiple: bool = False,
     connection_error_types: dict[str, list[str]] | None = None,
+    tolerance: int = 0,
 ):
     """Extracts connections between ports.
 
@@ -321,6 +383,7 @@ def _extract_connections(
         raise_error_for_warnings: list of warning types to raise an error for.
         allow_multiple: False to raise an error if more than two ports share the same connection.
         connection_error_types: optional dictionary of port types and error types to raise an error for.
+        tolerance: max distance in dbu between two ports to consider them connected.
 
     """
     if connection_error_types is None:
@@ -330,18 +393,11 @@ def _extract_connections(
     if raise_error_for_warnings is None:
         raise_error_for_warnings = connection_error_types.get(port_type, [])
 
-    unconnected_port_names = list(port_names)
     connections = []
-
-    by_xy = defaultdict(list)
-
-    for port_name in unconnected_port_names:
-        port = ports[port_name]
-        by_xy[port.center].append(port_name)
-
+    by_xy = _group_ports_by_position(port_names, ports, tolerance=tolerance)
     unconnected_port_names = []
 
-    for xy, ports_at_xy in by_xy.items():
+    for xy, ports_at_xy in by_xy:
         if len(ports_at_xy) == 1:
             unconnected_port_names.append(ports_at_xy[0])
 
@@ -501,7 +557,7 @@ def get_netlist_recursive(
         kwargs: additional keyword arguments to pass to get_netlist_func.
 
     Keyword Args:
-        tolerance: tolerance in grid_factor to consider two ports connected.
+        tolerance: max distance in dbu between two ports to consider them connected.
         exclude_port_types: optional list of port types to exclude from netlisting.
         get_instance_name: function to get instance name.
 
@@ -510,26 +566,25 @@ def get_netlist_recursive(
 
     """
     all_netlists = {}
+    # cell_index -> whether the cell has references, each unique cell is visited once
+    has_references: dict[int, bool] = {}
 
-    # only components with references (subcomponents) warrant a netlist
-    references = _get_references_to_netlist(component)
+    def _add_netlists(cell: Component) -> bool:
+        # only components with references (subcomponents) warrant a netlist
+        references = _get_references_to_netlist(cell)
+        has_references[cell.cell_index()] = bool(references)
+        if not references:
+            return False
 
-    if references:
-        netlist = get_netlist_func(component, **kwargs)
-        all_netlists[f"{component.name}{component_suffix}"] = netlist
+        netlist = get_netlist_func(cell, **kwargs)
+        all_netlists[f"{cell.name}{component_suffix}"] = netlist
 
         # for each reference, expand the netlist
         for ref in references:
             rcell = ref.cell
-            grandchildren = get_netlist_recursive(
-                component=rcell,
-                component_suffix=component_suffix,
-                get_netlist_func=get_netlist_func,
-                **kwargs,
-            )
-            all_netlists |= grandchildren
-
-            child_references = _get_references_to_netlist(ref.cell)
+            child_references = has_references.get(rcell.cell_index())
+            if child_references is None:
+                child_references = _add_netlists(rcell)
 
             if child_references:
                 inst_name = get_instance_name(ref)
@@ -541,7 +596,9 @@ def get_netlist_recursive(
                 if hasattr(rcell, "info"):
                     netlist_dict.update(info=rcell.info.model_dump(exclude_none=True))
                 netlist["instances"][inst_name] = netlist_dict
+        return True
 
+    _add_netlists(component)
     return all_netlists
 
 
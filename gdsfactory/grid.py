@@ -15,6 +15,7 @@ from gdsfactory.component import Component
 from gdsfactory.components.rectangle import rectangle
 from gdsfactory.components.text_rectangular import text_rectangular
 from gdsfactory.components.triangles import triangle
+from gdsfactory.get_components import get_components
 from gdsfactory.typings import Anchor, ComponentSpec, ComponentSpecs, Float2
 
 
@@ -26,6 +27,7 @@ def grid(
     align_y: Literal["origin", "ymin", "ymax", "center"] = "center",
     rotation: int = 0,
     mirror: bool = False,
+    n_jobs: int | None = None,
 ) -> Component:
     """Returns Component with a 1D or 2D grid of components.
 
@@ -39,6 +41,7 @@ def grid(
         align_y: y alignment along (origin, ymin, ymax, center).
         rotation: for each component in degrees.
         mirror: horizontal mirror y axis (x, 1) (1, 0). most common mirror.
+        n_jobs: number of processes to build the component specs. None builds serially.
 
     Returns:
         Component containing components grid.
@@ -63,7 +66,7 @@ def grid(
     c = gf.Component()
     instances = kf.grid(
         c,
-        kcells=[gf.get_component(component) for component in components],
+        kcells=get_components(components, n_jobs=n_jobs),
         shape=shape,
         spacing=(float(spacing[0]), float(spacing[1]))
         if isinstance(spacing, tuple | list)
@@ -95,6 +98,7 @@ def grid_with_text(
     align_y: Literal["origin", "ymin", "ymax", "center"] = "center",
     rotation: int = 0,
     mirror: bool = False,
+    n_jobs: int | None = None,
 ) -> Component:
     """Returns Component with 1D or 2D grid of components with text labels.
 
@@ -113,6 +117,7 @@ def grid_with_text(
         align_y: y alignment along (origin, ymin, ymax, center).
         rotation: for each component in degrees.
         mirror: horizontal mirror y axis (x, 1) (1, 0). most common mirror.
+        n_jobs: number of processes to build the component specs. None builds serially.
 
 
     .. plot::
@@ -134,7 +139,7 @@ def grid_with_text(
         c.plot()
 
     """
-    components = [gf.get_component(component) for component in components]
+    components = get_components(components, n_jobs=n_jobs)
     text_offsets = text_offsets or [(0, 0)] * len(components)
     text_anchors = text_anchors or ["center"] * len(components)
     c = gf.Component()
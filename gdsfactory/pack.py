@@ -12,6 +12,7 @@ import numpy as np
 
 import gdsfactory as gf
 from gdsfactory.component import Component
+from gdsfactory.get_components import get_components
 from gdsfactory.snap import snap_to_grid
 from gdsfactory.typings import Anchor, ComponentSpec, Float2, Number
 
@@ -107,6 +108,7 @@ def pack(
     v_mirror: bool = False,
     add_ports_prefix: bool = True,
     add_ports_suffix: bool = False,
+    n_jobs: int | None = None,
 ) -> list[Component]:
     """Pack a list of components into as few Components as possible.
 
@@ -131,6 +133,7 @@ def pack(
         v_mirror: vertical mirror using x axis (1, y) (0, y).
         add_ports_prefix: adds port names with prefix.
         add_ports_suffix: adds port names with suffix.
+        n_jobs: number of processes to build the component specs. None builds serially.
 
     .. plot::
         :include-source:
@@ -164,7 +167,7 @@ def pack(
     max_size = np.asarray(max_size, dtype=np.float64)  # In case it's integers
     max_size = max_size / precision
 
-    component_list = [gf.get_component(component) for component in component_list]
+    component_list = get_components(component_list, n_jobs=n_jobs)
 
     # Convert Components to rectangles
     rect_dict = {}
@@ -5,6 +5,7 @@ from __future__ import annotations
 import importlib
 import pathlib
 import warnings
+from collections import OrderedDict
 from collections.abc import Callable
 from functools import cached_property, partial, wraps
 from typing import Any
@@ -13,12 +14,11 @@ import kfactory as kf
 import numpy as np
 import yaml
 from kfactory.kcell import LayerEnum
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from gdsfactory import logger
 from gdsfactory.config import CONF
 from gdsfactory.generic_tech import get_generic_pdk
-from gdsfactory.read.from_yaml_template import cell_from_yaml_template
 from gdsfactory.serialization import convert_tuples_to_lists
 from gdsfactory.symbols import floorplan_with_block_letters
 from gdsfactory.technology import LayerStack, LayerViews, klayout_tech
@@ -53,6 +53,7 @@ constants = {
 }
 
 nm = 1e-3
+cross_section_cache_size = 1024
 
 
 def evanescent_coupler_sample() -> None:
@@ -176,6 +177,11 @@ class Pdk(BaseModel):
         arbitrary_types_allowed=True,
         extra="forbid",
     )
+    # (factory, kwargs) -> cross_section, so equal specs return the same object.
+    # Holds the last cross_section_cache_size specs used, oldest first.
+    _cross_section_cache: OrderedDict[tuple, CrossSection | Transition] = PrivateAttr(
+        default_factory=OrderedDict
+    )
 
     def xsection(self, func):
         """Decorator to register a cross section function.
@@ -214,6 +220,7 @@ class Pdk(BaseModel):
             cells.update(self.cells)
             self.cells.update(cells)
 
+        self._cross_section_cache.clear()
         _set_active_pdk(self)
 
     def register_cells(self, **kwargs) -> None:
@@ -266,6 +273,8 @@ class Pdk(BaseModel):
             if not dirpath.is_dir():
                 raise ValueError(f"{dirpath!r} needs to be a directory.")
 
+            from gdsfactory.read.from_yaml_template import cell_from_yaml_template
+
             for filepath in dirpath.glob("**/*.pic.yml"):
                 name = filepath.stem.split(".")[0]
                 if not update and name in self.cells:
@@ -290,17 +299,10 @@ class Pdk(BaseModel):
 
     def get_cell(self, cell: CellSpec, **kwargs) -> ComponentFactory:
         """Returns ComponentFactory from a cell spec."""
-        cells = set(self.cells.keys())
-
         if callable(cell):
             return cell
         elif isinstance(cell, str):
-            if cell not in cells:
-                cells = sorted(self.cells)
-                raise ValueError(
-                    f"{cell!r} from PDK {self.name!r} not in cells: {cells} "
-                )
-            return self.cells[cell]
+            return self._get_cell_factory(cell, self.cells)
         elif isinstance(cell, dict):
             for key in cell.keys():
                 if key not in component_settings:
@@ -311,19 +313,29 @@ class Pdk(BaseModel):
             settings.update(**kwargs)
 
             cell_name = cell.get("function")
-            if not isinstance(cell_name, str) or cell_name not in cells:
-                cells = list(self.cells.keys())
-                raise ValueError(
-                    f"{cell_name!r} from PDK {self.name!r} not in cells: {cells} "
-                )
-            cell = self.cells[cell_name]
-            return partial(cell, **settings)
+            return partial(self._get_cell_factory(cell_name, self.cells), **settings)
         else:
             raise ValueError(
                 "get_cell expects a CellSpec (ComponentFactory, string or dict),"
                 f"got {type(cell)}"
             )
 
+    def _get_cell_factory(
+        self, cell_name: Any, cells: dict[str, Callable]
+    ) -> ComponentFactory:
+        """Returns the factory registered as cell_name.
+
+        Lookups go straight to the cells dict, so they cost the same for a PDK
+        with 10 or 10k cells. The sorted list of names is only built for errors.
+        """
+        if isinstance(cell_name, str):
+            cell = cells.get(cell_name)
+            if cell is not None:
+                return cell
+        raise ValueError(
+            f"{cell_name!r} from PDK {self.name!r} not in cells: {sorted(cells)} "
+        )
+
     def get_component(
         self, component: ComponentSpec, settings=None, **kwargs
     ) -> Component:
@@ -357,8 +369,6 @@ class Pdk(BaseModel):
             kwargs: settings to override.
 
         """
-        cells = sorted(cells)
-
         settings = settings or {}
         kwargs = kwargs or {}
         kwargs.update(settings)
@@ -370,11 +380,7 @@ class Pdk(BaseModel):
         elif callable(component):
             return component(**kwargs)
         elif isinstance(component, str):
-            if component not in cells:
-                raise ValueError(
-                    f"{component!r} not in PDK {self.name!r} cells: {cells} "
-                )
-            return self.cells[component](**kwargs)
+            return self._get_cell_factory(component, cells)(**kwargs)
         elif isinstance(component, dict):
             for key in component.keys():
                 if key not in component_settings:
@@ -386,13 +392,9 @@ class Pdk(BaseModel):
 
             cell_name = component.get("component", None)
             cell_name = cell_name or component.get("function")
-            cell_name = cell_name.split(".")[-1]
-
-            if not isinstance(cell_name, str) or cell_name not in cells:
-                raise ValueError(
-                    f"{cell_name!r} from PDK {self.name!r} not in cells: {cells} "
-                )
-            return self.cells[cell_name](**settings)
+            if isinstance(cell_name, str):
+                cell_name = cell_name.split(".")[-1]
+            return self._get_cell_factory(cell_name, cells)(**settings)
         else:
             raise ValueError(
                 "get_component expects a ComponentSpec (Component, ComponentFactory, "
@@ -409,13 +411,13 @@ class Pdk(BaseModel):
             kwargs: settings to override.
         """
         if callable(cross_section):
-            return cross_section(**kwargs)
+            return self._get_cross_section_from_factory(cross_section, **kwargs)
         elif isinstance(cross_section, str):
             if cross_section not in self.cross_sections:
                 cross_sections = list(self.cross_sections.keys())
                 raise ValueError(f"{cross_section!r} not in {cross_sections}")
             xs = self.cross_sections[cross_section]
-            return xs(**kwargs)
+            return self._get_cross_section_from_factory(xs, **kwargs)
         elif isinstance(cross_section, dict):
             xs_name = cross_section.get("cross_section", None)
             settings = cross_section.get("settings", {})
@@ -432,6 +434,29 @@ class Pdk(BaseModel):
                 f"CrossSectionFactory, Transition, string or dict), got {type(cross_section)}"
             )
 
+    def _get_cross_section_from_factory(
+        self, factory: CrossSectionFactory, **kwargs
+    ) -> CrossSection | Transition:
+        """Returns factory(**kwargs), reusing the result for the same factory and kwargs.
+
+        CrossSections are frozen, so sharing one instance is safe.
+        Calls with unhashable kwargs (lists, dicts) are not cached. The cache
+        keeps the last cross_section_cache_size specs and is cleared on activate.
+        """
+        cache = self._cross_section_cache
+        try:
+            key = (factory, *((k, type(v), v) for k, v in sorted(kwargs.items())))
+            xs = cache.get(key)
+        except TypeError:
+            return factory(**kwargs)
+        if xs is None:
+            xs = cache[key] = factory(**kwargs)
+            if len(cache) > cross_section_cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return xs
+
     def get_layer(self, layer: LayerSpec) -> LayerEnum:
         """Returns layer from a layer spec."""
         if isinstance(layer, LayerEnum):
@@ -206,6 +206,329 @@ def port_array(
     ]
 
 
+class PortArray:
+    """Struct of arrays view of ports for bulk port operations.
+
+    Holds the centers, orientations, widths, layers and port types of the ports
+    as numpy arrays, so filtering, sorting and transforming many ports (pad
+    arrays with thousands of electrical ports) are array operations. Filtering
+    and sorting return new views on the same ports, so renaming the ports of a
+    view renames the ports of the component.
+
+    Args:
+        ports: ports to view.
+
+    .. code::
+
+        import gdsfactory as gf
+
+        c = gf.components.pad_array(columns=100)
+        ports = gf.port.PortArray(c.ports).select(orientation=270).sort_clockwise()
+        ports.rename([f"e{i}" for i in range(len(ports))])
+    """
+
+    directions = "ENWS"
+
+    def __init__(self, ports: typing.Iterable[kf.Port] = ()) -> None:
+        """Initializes PortArray."""
+        ports = list(ports)
+        self._ports = np.empty(len(ports), dtype=object)
+        self._ports[:] = ports
+        self._source: tuple[np.ndarray, kf.kdb.DCplxTrans] | None = None
+
+        kcl = ports[0].kcl if ports else kf.kcl
+        dbu = kcl.dbu
+        rows = [_get_port_row(p, dbu if p.kcl is kcl else p.kcl.dbu) for p in ports]
+        x, y, orientation, mirror, width, layer, port_type, names = (
+            zip(*rows) if rows else [()] * 8
+        )
+        self.centers = np.column_stack(
+            [np.array(x, dtype=float), np.array(y, dtype=float)]
+        )
+        self.orientations = np.array(orientation, dtype=float) % 360
+        self.mirror = np.array(mirror, dtype=bool)
+        self.widths = np.array(width, dtype=np.int64)
+        self.layers = np.array(layer, dtype=np.int64)
+        codes: dict[str, int] = {}
+        self.type_codes = np.array(
+            [codes.setdefault(t, len(codes)) for t in port_type], dtype=np.int64
+        )
+        self.port_types = np.array(list(codes), dtype=str)
+        self.names = np.empty(len(ports), dtype=object)
+        self.names[:] = names
+
+    def __len__(self) -> int:
+        """Returns the number of ports."""
+        return len(self.names)
+
+    def __iter__(self) -> typing.Iterator[kf.Port]:
+        """Iterates over the ports."""
+        return iter(self.ports)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> kf.Port: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice | np.ndarray | list[int]) -> PortArray: ...
+
+    def __getitem__(self, index: typing.Any) -> kf.Port | PortArray:
+        """Returns the port at an index, or a view of the ports at an index array."""
+        if isinstance(index, int | np.integer):
+            return self.ports[index]
+        view = object.__new__(PortArray)
+        view._ports = self._ports[index]
+        view._source = (
+            None if self._source is None else (self._source[0][index], self._source[1])
+        )
+        view.centers = self.centers[index]
+        view.orientations = self.orientations[index]
+        view.mirror = self.mirror[index]
+        view.widths = self.widths[index]
+        view.layers = self.layers[index]
+        view.port_types = self.port_types
+        view.type_codes = self.type_codes[index]
+        view.names = self.names[index]
+        return view
+
+    def __repr__(self) -> str:
+        """Returns the representation of the ports."""
+        return f"PortArray({list(self.names)})"
+
+    @property
+    def ports(self) -> list[kf.Port]:
+        """Returns the ports. Transformed ports are created on the first access."""
+        if self._source is not None:
+            source, trans = self._source
+            self._ports = np.empty(len(source), dtype=object)
+            self._ports[:] = [p.copy(trans) for p in source]
+            self._source = None
+        return list(self._ports)
+
+    def to_ports(self, kcl: kf.KCLayout | None = None) -> kf.Ports:
+        """Returns the ports as kf.Ports.
+
+        Args:
+            kcl: layout of the ports. Defaults to the layout of the first port.
+        """
+        ports = self.ports
+        kcl = kcl or (ports[0].kcl if ports else kf.kcl)
+        return kf.Ports(kcl=kcl, ports=ports)
+
+    def get_directions(self) -> np.ndarray:
+        """Returns the direction index in PortArray.directions ("ENWS") of each port.
+
+        East is within 45 degrees of 0, north of 90, west of 180 and south of 270.
+        """
+        o = self.orientations
+        return np.select(
+            [(o <= 45) | (o >= 315), o <= 135, o <= 225], [0, 1, 2], default=3
+        )
+
+    def select(
+        self,
+        layer: LayerSpec | None = None,
+        prefix: str | None = None,
+        suffix: str | None = None,
+        orientation: float | None = None,
+        width: float | None = None,
+        layers_excluded: LayerSpecs | None = None,
+        port_type: str | None = None,
+        names: typing.Iterable[str] | None = None,
+        direction: str | None = None,
+    ) -> PortArray:
+        """Returns the view of the ports that match all the filters.
+
+        Args:
+            layer: port GDS layer.
+            prefix: port name prefix.
+            suffix: port name suffix.
+            orientation: in degrees.
+            width: port width in dbu.
+            layers_excluded: layers to exclude.
+            port_type: optical, electrical, vertical_te ...
+            names: port names.
+            direction: the ports face (E, N, W or S).
+        """
+        from gdsfactory.pdk import get_layer
+
+        mask = np.ones(len(self), dtype=bool)
+        if layer:
+            mask &= self.layers == get_layer(layer)
+        if prefix:
+            mask &= np.char.startswith(self.names.astype(str), prefix)
+        if suffix:
+            mask &= np.char.endswith(self.names.astype(str), suffix)
+        if orientation is not None:
+            mask &= np.isclose(self.orientations, orientation)
+        if layers_excluded:
+            excluded = [get_layer(layer) for layer in layers_excluded]
+            mask &= ~np.isin(self.layers, excluded)
+        if width:
+            mask &= self.widths == width
+        if port_type:
+            codes = np.flatnonzero(self.port_types == port_type)
+            mask &= np.isin(self.type_codes, codes)
+        if names:
+            mask &= np.isin(self.names.astype(str), [str(name) for name in names])
+        if direction:
+            if direction not in self.directions:
+                raise PortOrientationError(
+                    f"{direction} must be in {list(self.directions)} "
+                )
+            mask &= self.get_directions() == self.directions.index(direction)
+        return self[mask]
+
+    def sort_clockwise(self, start: str = "W") -> PortArray:
+        """Returns the ports sorted clockwise, starting from the side start.
+
+        .. code::
+
+                3   4
+                |___|_
+            2 -|      |- 5
+               |      |
+            1 -|______|- 6
+                |   |
+                8   7
+
+        """
+        order = "WNES" * 2
+        order = order[order.index(start) :][:4]
+        return self.sort_by_direction(order, keys=_clockwise_keys)
+
+    def sort_counter_clockwise(self, start: str = "E") -> PortArray:
+        """Returns the ports sorted counter-clockwise, starting from the side start.
+
+        .. code::
+
+                4   3
+                |___|_
+            5 -|      |- 2
+               |      |
+            6 -|______|- 1
+                |   |
+                7   8
+
+        """
+        order = "ENWS" * 2
+        order = order[order.index(start) :][:4]
+        return self.sort_by_direction(order, keys=_counter_clockwise_keys)
+
+    def sort_by_direction(
+        self,
+        order: str = "WNES",
+        keys: dict[str, tuple[int, int]] | None = None,
+        directions: np.ndarray | None = None,
+    ) -> PortArray:
+        """Returns the ports grouped by direction in order, each group sorted by key.
+
+        The sort is stable, so ports with the same key keep their order.
+
+        Args:
+            order: of the directions.
+            keys: {direction: (axis, sign)} sorts the ports facing direction by
+                sign * center[axis]. Defaults to clockwise.
+            directions: direction index of each port. Defaults to get_directions().
+        """
+        keys = keys or _clockwise_keys
+        directions = self.get_directions() if directions is None else directions
+        rank = np.full(4, len(order))
+        axis = np.zeros(4, dtype=int)
+        sign = np.zeros(4)
+        for i, direction in enumerate(order):
+            d = self.directions.index(direction)
+            rank[d] = i
+            axis[d], sign[d] = keys[direction]
+        key = sign[directions] * self.centers[np.arange(len(self)), axis[directions]]
+        index = np.lexsort((key, rank[directions]))
+        return self[index[rank[directions][index] < len(order)]]
+
+    def rename(self, names: typing.Iterable[str | int]) -> None:
+        """Renames the ports in order."""
+        names = list(names)
+        if len(names) != len(self):
+            raise ValueError(f"Got {len(names)} names for {len(self)} ports.")
+        for port, name in zip(self.ports, names):
+            port.name = name
+        self.names = np.array(names, dtype=object)
+
+    def transformed(self, trans: kf.kdb.DCplxTrans | kf.kdb.DTrans) -> PortArray:
+        """Returns the ports transformed by a rotation, mirror and displacement in um.
+
+        The arrays are transformed at once and the ports are only created when
+        accessed.
+        """
+        trans = kf.kdb.DCplxTrans(trans)
+        if trans.is_mag():
+            raise ValueError(f"Ports can not be magnified. Got {trans}")
+        angle = np.deg2rad(trans.angle)
+        cos, sin = np.cos(angle), np.sin(angle)
+        x, y = self.centers.T
+        if trans.is_mirror():
+            y = -y
+        view = self[np.arange(len(self))]
+        view._source = (
+            (self._ports, trans)
+            if self._source is None
+            else (
+                self._source[0],
+                trans * self._source[1],
+            )
+        )
+        view.centers = np.column_stack(
+            [x * cos - y * sin + trans.disp.x, x * sin + y * cos + trans.disp.y]
+        )
+        orientations = -self.orientations if trans.is_mirror() else self.orientations
+        view.orientations = (orientations + trans.angle) % 360
+        view.mirror = self.mirror ^ trans.is_mirror()
+        return view
+
+
+# {direction: (axis, sign)} sorts the ports facing direction by sign * center[axis]
+_clockwise_keys = {"W": (1, 1), "N": (0, 1), "E": (1, -1), "S": (0, -1)}
+_counter_clockwise_keys = {"E": (1, 1), "N": (0, -1), "W": (1, -1), "S": (0, 1)}
+
+
+def _get_simple_trans(port: kf.Port) -> kf.kdb.Trans | None:
+    """Returns the simple (dbu) transformation of a port.
+
+    Returns None for ports with a complex transformation (off-grid or any
+    angle), and for kfactory versions that do not store it, so the caller
+    falls back to port.dcplx_trans. Unlike port.trans it never rounds.
+    """
+    return getattr(port, "_trans", None)
+
+
+def _get_port_row(
+    port: kf.Port, dbu: float
+) -> tuple[float, float, float, bool, int, int, str, str | None]:
+    """Returns x, y, orientation, mirror, width, layer, port type and name of a port.
+
+    Reads the simple transformation of the port directly, as converting it to a
+    complex transformation takes most of the time for large port arrays.
+    """
+    trans = _get_simple_trans(port)
+    if trans is not None:
+        disp = trans.disp
+        x, y = disp.x * dbu, disp.y * dbu
+        orientation = trans.angle * 90
+    else:
+        trans = port.dcplx_trans
+        disp = trans.disp
+        x, y = disp.x, disp.y
+        orientation = trans.angle
+    return (
+        x,
+        y,
+        orientation,
+        trans.is_mirror(),
+        port.width,
+        port.layer,
+        port.port_type,
+        port.name,
+    )
+
+
 def read_port_markers(component: object, layers: LayerSpecs = ("PORT",)) -> Component:
     """Returns extracted polygons from component layers.
 
@@ -245,34 +568,7 @@ def sort_ports_clockwise(ports: kf.Ports) -> kf.Ports:
             8   7
 
     """
-    port_list = ports
-    direction_ports: PortsMap = {x: [] for x in ["E", "N", "W", "S"]}
-
-    for p in port_list:
-        angle = p.angle * 90
-        if angle <= 45 or angle >= 315:
-            direction_ports["E"].append(p)
-        elif angle <= 135 and angle >= 45:
-            direction_ports["N"].append(p)
-        elif angle <= 225 and angle >= 135:
-            direction_ports["W"].append(p)
-        else:
-            direction_ports["S"].append(p)
-
-    east_ports = direction_ports["E"]
-    east_ports.sort(key=lambda p: -p.dy)  # sort north to south
-
-    north_ports = direction_ports["N"]
-    north_ports.sort(key=lambda p: +p.dx)  # sort west to east
-
-    west_ports = direction_ports["W"]
-    west_ports.sort(key=lambda p: +p.dy)  # sort south to north
-
-    south_ports = direction_ports["S"]
-    south_ports.sort(key=lambda p: -p.dx)  # sort east to west
-
-    ports = west_ports + north_ports + east_ports + south_ports
-    return list(ports)
+    return PortArray(ports).sort_clockwise().ports
 
 
 def sort_ports_counter_clockwise(ports: kf.Ports) -> kf.Ports:
@@ -289,34 +585,7 @@ def sort_ports_counter_clockwise(ports: kf.Ports) -> kf.Ports:
             7   8
 
     """
-    port_list = list(ports)
-    direction_ports: PortsMap = {x: [] for x in ["E", "N", "W", "S"]}
-
-    for p in port_list:
-        angle = p.angle * 90
-        if angle <= 45 or angle >= 315:
-            direction_ports["E"].append(p)
-        elif angle <= 135 and angle >= 45:
-            direction_ports["N"].append(p)
-        elif angle <= 225 and angle >= 135:
-            direction_ports["W"].append(p)
-        else:
-            direction_ports["S"].append(p)
-
-    east_ports = direction_ports["E"]
-    east_ports.sort(key=lambda p: +p.dy)  # sort south to north
-
-    north_ports = direction_ports["N"]
-    north_ports.sort(key=lambda p: -p.dx)  # sort east to west
-
-    west_ports = direction_ports["W"]
-    west_ports.sort(key=lambda p: -p.dy)  # sort north to south
-
-    south_ports = direction_ports["S"]
-    south_ports.sort(key=lambda p: +p.dx)  # sort west to east
-
-    ports = east_ports + north_ports + west_ports + south_ports
-    return list(ports)
+    return PortArray(ports).sort_counter_clockwise().ports
 
 
 def select_ports(
@@ -353,35 +622,25 @@ def select_ports(
     """
     if isinstance(ports, kf.Instance):
         ports = ports.ports
-
-    if layer:
-        from gdsfactory.pdk import get_layer
-
-        layer = get_layer(layer)
-        ports = [p for p in ports if get_layer(p.layer) == layer]
-
-    if prefix:
-        ports = [p for p in ports if p.name.startswith(prefix)]
-    if suffix:
-        ports = [p for p in ports if p.name.endswith(suffix)]
-    if orientation is not None:
-        ports = [p for p in ports if np.isclose(p.dangle, orientation)]
-
-    if layers_excluded:
-        ports = [p for p in ports if p.layer not in layers_excluded]
-    if width:
-        ports = [p for p in ports if p.width == width]
-    if port_type:
-        ports = [p for p in ports if p.port_type == port_type]
-    if names:
-        ports = [p for p in ports if p.name in names]
-
+    if isinstance(ports, dict):
+        ports = ports.values()
+
+    port_array = PortArray(ports).select(
+        layer=layer,
+        prefix=prefix,
+        suffix=suffix,
+        orientation=orientation,
+        width=width,
+        layers_excluded=layers_excluded,
+        port_type=port_type,
+        names=names,
+    )
     if sort_ports:
         if clockwise:
-            ports = sort_ports_clockwise(ports)
+            port_array = port_array.sort_clockwise()
         else:
-            ports = sort_ports_counter_clockwise(ports)
-    return ports
+            port_array = port_array.sort_counter_clockwise()
+    return port_array.ports
 
 
 select_ports_optical = partial(select_ports, port_type="optical")
@@ -422,24 +681,11 @@ def get_ports_facing(ports: list[Port], direction: str = "W") -> list[Port]:
         raise PortOrientationError(f"{direction} must be in {valid_directions} ")
 
     if isinstance(ports, dict):
-        ports = list(ports)
+        ports = list(ports.values())
     elif isinstance(ports, Component | ComponentReference):
         ports = list(ports.ports)
 
-    direction_ports: dict[str, list[Port]] = {x: [] for x in ["E", "N", "W", "S"]}
-
-    for p in ports:
-        angle = p.orientation % 360 if p.orientation is not None else 0
-        if angle <= 45 or angle >= 315:
-            direction_ports["E"].append(p)
-        elif angle <= 135 and angle >= 45:
-            direction_ports["N"].append(p)
-        elif angle <= 225 and angle >= 135:
-            direction_ports["W"].append(p)
-        else:
-            direction_ports["S"].append(p)
-
-    return direction_ports[direction]
+    return PortArray(ports).select(direction=direction).ports
 
 
 def deco_rename_ports(component_factory: Callable) -> Callable:
@@ -452,23 +698,36 @@ def deco_rename_ports(component_factory: Callable) -> Callable:
     return auto_named_component_factory
 
 
+def _sort_direction_ports(
+    direction_ports: PortsMap, order: str, keys: dict[str, tuple[int, int]]
+) -> PortArray:
+    """Returns the ports of direction_ports grouped by direction in order.
+
+    Args:
+        direction_ports: {direction: ports facing direction}.
+        order: of the directions.
+        keys: {direction: (axis, sign)} sorts the ports facing direction by
+            sign * center[axis].
+    """
+    ports = PortArray(p for direction in order for p in direction_ports[direction])
+    directions = np.repeat(
+        [PortArray.directions.index(direction) for direction in order],
+        [len(direction_ports[direction]) for direction in order],
+    )
+    return ports.sort_by_direction(order, keys=keys, directions=directions)
+
+
 def _rename_ports_facing_side(
     direction_ports: dict[str, list[Port]], prefix: str = ""
 ) -> None:
     """Renames ports clockwise."""
     for direction, list_ports in list(direction_ports.items()):
-        if direction in ["E", "W"]:
-            # first sort along x then y
-            list_ports.sort(key=lambda p: p.dx)
-            list_ports.sort(key=lambda p: p.dy)
-
-        if direction in ["S", "N"]:
-            # first sort along y then x
-            list_ports.sort(key=lambda p: p.dy)
-            list_ports.sort(key=lambda p: p.dx)
-
-        for i, p in enumerate(list_ports):
-            p.name = prefix + direction + str(i)
+        ports = PortArray(list_ports)
+        x, y = ports.centers.T
+        # E and W sort along y then x, S and N along x then y
+        keys = (x, y) if direction in ["E", "W"] else (y, x)
+        ports = ports[np.lexsort(keys)]
+        ports.rename(f"{prefix}{direction}{i}" for i in range(len(ports)))
 
 
 def _rename_ports_facing_side_ccw(
@@ -476,80 +735,31 @@ def _rename_ports_facing_side_ccw(
 ) -> None:
     """Renames ports counter-clockwise."""
     for direction, list_ports in list(direction_ports.items()):
-        if direction in ["E", "W"]:
-            # first sort along x then y
-            list_ports.sort(key=lambda p: -p.dx)
-            list_ports.sort(key=lambda p: -p.dy)
-
-        if direction in ["S", "N"]:
-            # first sort along y then x
-            list_ports.sort(key=lambda p: -p.dy)
-            list_ports.sort(key=lambda p: -p.dx)
-
-        for i, p in enumerate(list_ports):
-            p.name = prefix + direction + str(i)
+        ports = PortArray(list_ports)
+        x, y = -ports.centers.T
+        # E and W sort along -y then -x, S and N along -x then -y
+        keys = (x, y) if direction in ["E", "W"] else (y, x)
+        ports = ports[np.lexsort(keys)]
+        ports.rename(f"{prefix}{direction}{i}" for i in range(len(ports)))
 
 
 def _rename_ports_counter_clockwise(direction_ports, prefix="") -> None:
-    east_ports = direction_ports["E"]
-    east_ports.sort(key=lambda p: +p.dy)  # sort south to north
-
-    north_ports = direction_ports["N"]
-    north_ports.sort(key=lambda p: -p.dx)  # sort east to west
-
-    west_ports = direction_ports["W"]
-    west_ports.sort(key=lambda p: -p.dy)  # sort north to south
-
-    south_ports = direction_ports["S"]
-    south_ports.sort(key=lambda p: +p.dx)  # sort west to east
-
-    ports = east_ports + north_ports + west_ports + south_ports
-
-    for i, p in enumerate(ports):
-        p.name = f"{prefix}{i+1}" if prefix else i + 1
+    ports = _sort_direction_ports(direction_ports, "ENWS", _counter_clockwise_keys)
+    ports.rename(f"{prefix}{i + 1}" if prefix else i + 1 for i in range(len(ports)))
 
 
 def _rename_ports_clockwise(direction_ports: PortsMap, prefix: str = "") -> None:
     """Rename ports in the clockwise directionjstarting from the bottom left corner."""
-    east_ports = direction_ports["E"]
-    east_ports.sort(key=lambda p: -p.dy)  # sort north to south
-
-    north_ports = direction_ports["N"]
-    north_ports.sort(key=lambda p: +p.dx)  # sort west to east
-
-    west_ports = direction_ports["W"]
-    west_ports.sort(key=lambda p: +p.dy)  # sort south to north
-
-    south_ports = direction_ports["S"]
-    south_ports.sort(key=lambda p: -p.dx)  # sort east to west
-    # south_ports.sort(key=lambda p: p.dy)  #  south first
-
-    ports = west_ports + north_ports + east_ports + south_ports
-
-    for i, p in enumerate(ports):
-        p.name = f"{prefix}{i+1}" if prefix else i + 1
+    ports = _sort_direction_ports(direction_ports, "WNES", _clockwise_keys)
+    ports.rename(f"{prefix}{i + 1}" if prefix else i + 1 for i in range(len(ports)))
 
 
 def _rename_ports_clockwise_top_right(
     direction_ports: PortsMap, prefix: str = ""
 ) -> None:
     """Rename ports in clockwise direction starting from the top right corner."""
-    east_ports = direction_ports["E"]
-    east_ports.sort(key=lambda p: -p.dy)  # sort north to south
-
-    north_ports = direction_ports["N"]
-    north_ports.sort(key=lambda p: +p.dx)  # sort west to east
-
-    west_ports = direction_ports["W"]
-    west_ports.sort(key=lambda p: +p.dy)  # sort south to north
-
-    south_ports = direction_ports["S"]
-    south_ports.sort(key=lambda p: -p.dx)  # sort east to west
-
-    ports = east_ports + south_ports + west_ports + north_ports
-
-    for i, p in enumerate(ports):
-        p.name = f"{prefix}{i+1}" if prefix else i + 1
+    ports = _sort_direction_ports(direction_ports, "ESWN", _clockwise_keys)
+    ports.rename(f"{prefix}{i + 1}" if prefix else i + 1 for i in range(len(ports)))
 
 
 def rename_ports_by_orientation(
@@ -589,22 +799,11 @@ def rename_ports_by_orientation(
 
     ports_on_layer = [p for p in ports if p.layer not in layers_excluded]
 
-    for p in ports_on_layer:
+    directions = PortArray(ports_on_layer).get_directions()
+    for p, direction in zip(ports_on_layer, directions):
         # Make sure we can backtrack the parent component from the port
         p.parent = component
-
-        if p.orientation is not None:
-            angle = p.orientation % 360
-            if angle <= 45 or angle >= 315:
-                direction_ports["E"].append(p)
-            elif angle <= 135 and angle >= 45:
-                direction_ports["N"].append(p)
-            elif angle <= 225 and angle >= 135:
-                direction_ports["W"].append(p)
-            else:
-                direction_ports["S"].append(p)
-        else:
-            direction_ports["S"].append(p)
+        direction_ports[PortArray.directions[direction]].append(p)
 
     function(direction_ports, prefix=prefix)
     return component
@@ -825,6 +1024,7 @@ def auto_rename_ports_layer_orientation(
 
 __all__ = [
     "Port",
+    "PortArray",
     "port_array",
     "read_port_markers",
     "csv2port",
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import gzip
+import os
 import pathlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Literal
+
+from kfactory import kdb
 
 from gdsfactory import logger
 from gdsfactory.component import Component
 from gdsfactory.read.import_gds import import_gds
 from gdsfactory.typings import ComponentOrPath, PathType
 
+cell_conflict_resolutions = {
+    "rename": kdb.LoadLayoutOptions.CellConflictResolution.RenameCell,
+    "skip": kdb.LoadLayoutOptions.CellConflictResolution.SkipNewCell,
+    "overwrite": kdb.LoadLayoutOptions.CellConflictResolution.OverwriteCell,
+}
+
 
 def from_gdspaths(cells: tuple[ComponentOrPath, ...]) -> Component:
     """Combine all GDS files or gf.components into a gf.component.
@@ -32,7 +46,94 @@ def from_gdsdir(dirpath: PathType) -> Component:
     """Merges GDS cells from a directory into a single Component."""
     dirpath = pathlib.Path(dirpath)
     assert dirpath.exists(), f"{dirpath} does not exist"
-    return from_gdspaths(list(dirpath.glob("*.gds")))
+    return from_gdspaths(sorted(dirpath.glob("*.gds")))
+
+
+def merge_gdspaths(
+    gdspaths: Iterable[PathType],
+    gdspath: PathType,
+    name: str = "merged",
+    cell_conflict: Literal["rename", "skip", "overwrite"] = "rename",
+    n_jobs: int | None = None,
+) -> pathlib.Path:
+    """Merges GDS or OASIS files into one file with a top cell of all top cells.
+
+    The files are read one after the other straight into the output layout,
+    without importing each one as a Component. Cell name conflicts are resolved
+    in the order of gdspaths, so the result does not depend on n_jobs.
+
+    Args:
+        gdspaths: files to merge. Files ending in .gz are decompressed.
+        gdspath: output file. The format follows the suffix (.gds, .oas ...).
+        name: of the top cell, which instantiates the top cells of each file.
+        cell_conflict: for cells with a name already read from a previous file.
+            "rename" renames the new cell (name$1), "skip" uses the existing cell
+            instead, "overwrite" replaces the existing cell.
+        n_jobs: number of threads that read and decompress the next files while
+            the current one is parsed. None or 1 reads in the parsing thread.
+            -1 uses all CPUs.
+    """
+    layout = kdb.Layout()
+    options = kdb.LoadLayoutOptions()
+    options.warn_level = 0
+    options.cell_conflict_resolution = cell_conflict_resolutions[cell_conflict]
+    gdspaths = [pathlib.Path(path) for path in gdspaths]
+    top_cells: dict[int, None] = {}  # in the order of the files
+    dbu = None
+
+    for path, data in zip(gdspaths, _read_files(gdspaths, n_jobs=n_jobs)):
+        logger.info(f"Merging {str(path)!r}")
+        layout.read_bytes(data, options)
+        if dbu is None:
+            dbu = layout.dbu
+        elif layout.dbu != dbu:
+            raise ValueError(
+                f"{str(path)!r} has a dbu of {layout.dbu}, expected {dbu} from "
+                f"{str(gdspaths[0])!r}."
+            )
+        top_cells.update(
+            (cell.cell_index(), None)
+            for cell in layout.top_cells()
+            if cell.cell_index() not in top_cells
+        )
+
+    top = layout.create_cell(name)
+    for ci in top_cells:
+        if layout.cell(ci).is_top():
+            top.insert(kdb.CellInstArray(ci, kdb.Trans()))
+
+    gdspath = pathlib.Path(gdspath)
+    gdspath.parent.mkdir(parents=True, exist_ok=True)
+    layout.write(str(gdspath))
+    return gdspath
+
+
+def _read_files(
+    paths: Iterable[pathlib.Path], n_jobs: int | None = None
+) -> Iterator[bytes]:
+    """Yields the (decompressed) contents of the files in order.
+
+    With n_jobs, up to 2 * n_jobs files are read ahead in threads.
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if not n_jobs or n_jobs == 1:
+        yield from map(_read_file, paths)
+        return
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures: deque[Future[bytes]] = deque()
+        for path in paths:
+            futures.append(executor.submit(_read_file, path))
+            if len(futures) > 2 * n_jobs:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+
+def _read_file(path: pathlib.Path) -> bytes:
+    data = path.read_bytes()
+    return gzip.decompress(data) if path.suffix == ".gz" else data
 
 
 if __name__ == "__main__":
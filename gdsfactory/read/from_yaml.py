@@ -63,8 +63,10 @@ import yaml
 
 from gdsfactory.add_pins import add_instance_label
 from gdsfactory.component import Component, ComponentReference, Instance
+from gdsfactory.get_components import get_components
 from gdsfactory.schematic import Bundle, Netlist, Placement
 from gdsfactory.schematic import Instance as NetlistInstance
+from gdsfactory.serialization import get_component_key
 
 valid_placement_keys = [
     "x",
@@ -669,16 +671,22 @@ def from_yaml(
     routing_strategy: dict[str, Callable] | None = None,
     label_instance_function: Callable = add_instance_label,
     name: str | None = None,
+    n_jobs: int | None = None,
 ) -> Component:
     """Returns Component from YAML string or file.
 
     YAML includes instances, placements, routes, ports and connections.
 
+    Instances with the same component and settings share one component, which
+    is only built once.
+
     Args:
         yaml_str: YAML string or file.
         routing_strategy: for each route.
         label_instance_function: to label each instance.
         name: Optional name.
+        n_jobs: number of worker processes to build the unique instance
+            components. None builds them in this process. See get_components.
 
     .. code::
 
@@ -747,18 +755,211 @@ def from_yaml(
                     mmi_top,o3: mmi_bot,o1
 
     """
-    c = Component()
-    dct = _load_yaml_str(yaml_str)
-    pdk = _activate_pdk_by_name(dct.get("pdk", ""))
-    net = Netlist.model_validate(dct)
-    g = _get_dependency_graph(net)
-    refs = _get_references(c, pdk, net.instances)
-    _place_and_connect(g, refs, net.connections, net.placements)
-    c = _add_routes(c, refs, net.routes, routing_strategy)
-    c = _add_ports(c, refs, net.ports)
-    c = _add_labels(c, refs, label_instance_function)
-    c.name = name or net.name or c.name
-    return c
+    compiler = YamlCompiler(
+        routing_strategy=routing_strategy,
+        label_instance_function=label_instance_function,
+        name=name,
+        n_jobs=n_jobs,
+    )
+    return compiler.update(yaml_str)
+
+
+class YamlCompiler:
+    """Compiles YAML netlists into a Component, reusing the previous compilation.
+
+    The first update builds the Component like `from_yaml`. Each later update
+    compares the new netlist with the previous one and only places again the
+    instances with a changed component, array, placement or connection, and the
+    instances placed or connected relative to them. Only the bundles with changed
+    links or settings, or with a moved instance, are routed again. The other
+    references and routes are reused.
+
+    Instance labels are found by their text, the instance name, to move them with
+    the instances. If an update fails the next update compiles from scratch.
+
+    Args:
+        routing_strategy: for each route.
+        label_instance_function: to label each instance.
+        name: Optional name.
+        n_jobs: number of worker processes to build the unique instance
+            components. See get_components.
+
+    .. code::
+
+        compiler = YamlCompiler()
+        c = compiler.update(yaml_str)
+        c = compiler.update(yaml_str_with_a_new_placement)
+    """
+
+    def __init__(
+        self,
+        routing_strategy: dict[str, Callable] | None = None,
+        label_instance_function: Callable = add_instance_label,
+        name: str | None = None,
+        n_jobs: int | None = None,
+    ) -> None:
+        """Initialize the compiler without a Component."""
+        self.routing_strategy = routing_strategy
+        self.label_instance_function = label_instance_function
+        self.name = name
+        self.n_jobs = n_jobs
+        self.component: Component | None = None
+        self.netlist: Netlist | None = None
+        self.refs: dict[str, ComponentReference] = {}
+        self.routes: dict[str, dict[str, Any]] = {}
+        self._route_instances: dict[str, tuple[list[Instance], list[Any]]] = {}
+
+    def update(
+        self, yaml_str: str | pathlib.Path | IO[Any] | dict[str, Any]
+    ) -> Component:
+        """Returns the Component of a YAML string or file, updated in place."""
+        dct = _load_yaml_str(yaml_str)
+        pdk = _activate_pdk_by_name(dct.get("pdk", ""))
+        components, instance_keys = _get_components(
+            dct.get("instances") or {}, n_jobs=self.n_jobs
+        )
+        net = Netlist.model_validate(dct, context={"components": components})
+        g = _get_dependency_graph(net)
+        instance_components = {
+            name: components[key] for name, key in instance_keys.items()
+        }
+
+        try:
+            if (
+                self.component is None
+                or self.netlist is None
+                or net.pdk != self.netlist.pdk
+            ):
+                self._compile(pdk, net, g, instance_components)
+            else:
+                self._recompile(pdk, net, g, instance_components)
+        except BaseException:
+            self.component = None
+            self.netlist = None
+            raise
+
+        self.netlist = net
+        c = self.component
+        assert c is not None
+        c.name = self.name or net.name or c.name
+        return c
+
+    def _compile(
+        self,
+        pdk,
+        net: Netlist,
+        g: nx.DiGraph,
+        components: dict[str, Component],
+    ) -> None:
+        c = self.component = Component()
+        self.refs = _get_references(c, pdk, net.instances, components)
+        self.routes = {}
+        self._route_instances = {}
+        _place_and_connect(g, self.refs, net.connections, net.placements)
+        for bundle_name, bundle in net.routes.items():
+            self._add_route(bundle_name, bundle)
+        c.routes = _merge_routes(self.routes, net.routes)  # type: ignore
+        _add_ports(c, self.refs, net.ports)
+        _add_labels(c, self.refs, self.label_instance_function)
+
+    def _recompile(
+        self,
+        pdk,
+        net: Netlist,
+        g: nx.DiGraph,
+        components: dict[str, Component],
+    ) -> None:
+        c = self.component
+        old = self.netlist
+        assert c is not None and old is not None
+        refs = self.refs
+
+        removed = set(refs) - set(net.instances)
+        replaced = {
+            name
+            for name, inst in net.instances.items()
+            if name not in refs
+            or refs[name].cell_index != components[name].cell_index()
+            or _get_array(inst) != _get_array(old.instances[name])
+        }
+        dirty = set(replaced)
+        dirty.update(
+            name
+            for name in set(old.placements) | set(net.placements)
+            if old.placements.get(name) != net.placements.get(name)
+        )
+        connections = set(old.connections.items()) ^ set(net.connections.items())
+        dirty.update(ip1.split(",")[0] for ip1, _ in connections)
+        for name in list(dirty):
+            if name in g:
+                dirty.update(nx.descendants(g, name))
+        dirty = {
+            name for name in dirty if _parse_maybe_arrayed_instance(name)[0] in refs
+        } | replaced
+
+        moved = {_parse_maybe_arrayed_instance(name)[0] for name in dirty} | removed
+        if not moved and old.routes == net.routes and old.ports == net.ports:
+            return
+
+        rerouted = [
+            bundle_name
+            for bundle_name in set(old.routes) | set(net.routes)
+            if old.routes.get(bundle_name) != net.routes.get(bundle_name)
+            or _get_bundle_instances(old.routes[bundle_name]) & moved
+        ]
+        for bundle_name in rerouted:
+            insts, vinsts = self._route_instances.pop(bundle_name, ([], []))
+            for inst in insts:
+                if not inst._instance._destroyed():
+                    inst._instance.delete()
+            for vinst in vinsts:
+                c.vinsts.remove(vinst)
+            self.routes.pop(bundle_name, None)
+
+        for name in removed | replaced:
+            if name in refs:
+                refs.pop(name)._instance.delete()
+        c.insts.clean()
+        _remove_labels(c, moved)
+
+        refs.update(
+            _get_references(
+                c,
+                pdk,
+                {name: net.instances[name] for name in replaced},
+                components,
+            )
+        )
+        for name in dirty - replaced:
+            if name in refs:
+                refs[name].dcplx_trans = kf.kdb.DCplxTrans()
+        _place_and_connect(g, refs, net.connections, net.placements, nodes=dirty)
+
+        for bundle_name, bundle in net.routes.items():
+            if bundle_name in rerouted:
+                self._add_route(bundle_name, bundle)
+        c.routes = _merge_routes(self.routes, net.routes)  # type: ignore
+
+        c.ports = kf.Ports(c.kcl)
+        _add_ports(c, refs, net.ports)
+        _add_labels(
+            c,
+            {name: ref for name, ref in refs.items() if name in moved},
+            self.label_instance_function,
+        )
+
+    def _add_route(self, bundle_name: str, bundle: Bundle) -> None:
+        """Routes a bundle and keeps its routes and instances."""
+        c = self.component
+        assert c is not None
+        n_insts, n_vinsts = len(c.insts), len(c.vinsts)
+        self.routes[bundle_name] = _add_route(
+            c, self.refs, bundle_name, bundle, self.routing_strategy
+        )
+        self._route_instances[bundle_name] = (
+            c.insts._insts[n_insts:],
+            c.vinsts[n_vinsts:],
+        )
 
 
 # Define a custom constructor that converts YAML sequences to tuples
@@ -831,8 +1032,8 @@ def _get_dependency_graph(net: Netlist) -> nx.DiGraph:
             i2, _ = v.split(",")
             _graph_connect(g, i1, i2)
 
-    cycles = list(nx.simple_cycles(g))
-    if cycles:
+    if not nx.is_directed_acyclic_graph(g):
+        cycles = [_find_cycle(g.subgraph(nodes)) for nodes in _graph_cyclic_nodes(g)]
         raise RuntimeError(
             "Cyclical references when placing / connecting instances:\n"
             + "\n".join("->".join(cyc + cyc[:1]) for cyc in cycles)
@@ -840,12 +1041,51 @@ def _get_dependency_graph(net: Netlist) -> nx.DiGraph:
     return g
 
 
-def _get_references(c: Component, pdk, instances: dict[str, NetlistInstance]):
+def _get_components(
+    instances: dict[str, Any], n_jobs: int | None = None
+) -> tuple[dict[str, Component], dict[str, str]]:
+    """Builds each unique instance component and settings once.
+
+    Args:
+        instances: instance name to instance dict with component and settings.
+        n_jobs: number of worker processes. See get_components.
+
+    Returns:
+        components: {key: Component} with key = get_component_key(component, settings).
+        instance_keys: {instance name: key}.
+    """
+    specs: dict[str, dict[str, Any]] = {}
+    instance_keys = {}
+    for name, inst in instances.items():
+        if not isinstance(inst, dict) or "component" not in inst:
+            continue  # reported by the Netlist validation
+        key = get_component_key(inst["component"], inst.get("settings") or {})
+        instance_keys[name] = key
+        specs.setdefault(key, inst)
+
+    components = get_components(
+        [inst["component"] for inst in specs.values()],
+        [inst.get("settings") or {} for inst in specs.values()],
+        n_jobs=n_jobs,
+    )
+    return dict(zip(specs, components)), instance_keys
+
+
+def _get_references(
+    c: Component,
+    pdk,
+    instances: dict[str, NetlistInstance],
+    components: dict[str, Component] | None = None,
+):
+    components = components or {}
     refs = {}
     for name, inst in instances.items():
         na, nb = inst.na, inst.nb
         dax, day, dbx, dby = inst.dax, inst.day, inst.dbx, inst.dby
-        comp = pdk.get_component(component=inst.component, settings=inst.settings)
+        if name in components:
+            comp = components[name]
+        else:
+            comp = pdk.get_component(component=inst.component, settings=inst.settings)
         if na < 2 and nb < 2:
             ref = c.add_ref(comp, name=name)
         else:
@@ -876,21 +1116,26 @@ def _place_and_connect(
     refs: dict[str, ComponentReference],
     connections: dict[str, str],
     placements: dict[str, Placement],
+    nodes: set[str] | None = None,
 ):
+    """Places and connects the instances, or only the instances in nodes."""
     directed_connections = _get_directed_connections(connections)
 
-    for root in _graph_roots(g):
-        pl = placements.get(root)
+    # every instance is placed after the instances it is placed or connected to
+    for i1 in nx.topological_sort(g):
+        if nodes is not None and i1 not in nodes:
+            continue
+        pl = placements.get(i1)
+        if g.in_degree(i1) == 0:
+            _update_reference_by_placement(
+                refs, i1, pl if pl is not None else Placement()
+            )
+            continue
         if pl is not None:
-            _update_reference_by_placement(refs, root, pl)
-        else:
-            _update_reference_by_placement(refs, root, Placement())
-        for i2, i1 in nx.dfs_edges(g, root):
+            _update_reference_by_placement(refs, i1, pl)
+        for i2 in g.predecessors(i1):
             ports = directed_connections.get(i1, {}).get(i2, None)
-            pl = placements.get(i1)
-            if pl is not None:
-                _update_reference_by_placement(refs, i1, pl)
-            if ports is not None:  # no elif!
+            if ports is not None:
                 p1, p2 = ports
                 i2name, i2a, i2b = _parse_maybe_arrayed_instance(i2)
                 if (i2a is not None) or (i2b is not None):
@@ -899,52 +1144,88 @@ def _place_and_connect(
                     refs[i1].connect(p1, refs[i2].ports[p2])
 
 
-def _add_routes(
+def _add_route(
     c: Component,
     refs: dict[str, ComponentReference],
-    routes: dict[str, Bundle],
+    bundle_name: str,
+    bundle: Bundle,
     routing_strategies: dict[str, Callable] | None = None,
-):
+) -> dict[str, Any]:
+    """Routes a bundle and returns {route name: route}."""
     from gdsfactory.pdk import get_routing_strategies
 
-    routes_dict = {}
     routing_strategies = routing_strategies or get_routing_strategies()
-    for bundle_name, bundle in routes.items():
-        try:
-            routing_strategy = routing_strategies[bundle.routing_strategy]  # type: ignore
-        except KeyError as e:
+    try:
+        routing_strategy = routing_strategies[bundle.routing_strategy]  # type: ignore
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown routing strategy.\nvalid strategies: {list(routing_strategies)}\n"
+            f"Got:{bundle.routing_strategy}"
+        ) from e
+
+    ports1 = []
+    ports2 = []
+    route_names = []
+
+    for ip1, ip2 in bundle.links.items():
+        i1, p1s = _split_route_link(ip1)
+        i2, p2s = _split_route_link(ip2)
+        if len(p1s) != len(p2s):
             raise ValueError(
-                f"Unknown routing strategy.\nvalid strategies: {list(routing_strategies)}\n"
-                f"Got:{bundle.routing_strategy}"
-            ) from e
-
-        ports1 = []
-        ports2 = []
-        route_names = []
-
-        for ip1, ip2 in bundle.links.items():
-            i1, p1s = _split_route_link(ip1)
-            i2, p2s = _split_route_link(ip2)
-            if len(p1s) != len(p2s):
-                raise ValueError(
-                    f"length of array bundles don't match. Got {ip1} <-> {ip2}"
-                )
-            ports1 += _get_ports_from_portnames(refs, i1, p1s)
-            ports2 += _get_ports_from_portnames(refs, i2, p2s)
-            route_names += [
-                f"{bundle_name}-{i1},{p1}-{i2},{p2}" for p1, p2 in zip(p1s, p2s)
-            ]
+                f"length of array bundles don't match. Got {ip1} <-> {ip2}"
+            )
+        ports1 += _get_ports_from_portnames(refs, i1, p1s)
+        ports2 += _get_ports_from_portnames(refs, i2, p2s)
+        route_names += [
+            f"{bundle_name}-{i1},{p1}-{i2},{p2}" for p1, p2 in zip(p1s, p2s)
+        ]
+
+    routes_list = routing_strategy(  # type: ignore
+        c,
+        ports1=ports1,
+        ports2=ports2,
+        **bundle.settings,
+    )
+    return dict(zip(route_names, routes_list))
+
+
+def _merge_routes(
+    routes: dict[str, dict[str, Any]], bundles: dict[str, Bundle]
+) -> dict[str, Any]:
+    """Returns {route name: route} of all bundles, in bundle order."""
+    return {
+        route_name: route
+        for bundle_name in bundles
+        for route_name, route in routes[bundle_name].items()
+    }
 
-        routes_list = routing_strategy(  # type: ignore
-            c,
-            ports1=ports1,
-            ports2=ports2,
-            **bundle.settings,
-        )
-        for route_name, route in zip(route_names, routes_list):
-            routes_dict[route_name] = route
-        c.routes = routes_dict  # type: ignore
-    return c
+
+def _get_bundle_instances(bundle: Bundle) -> set[str]:
+    """Returns the names of the instances linked by a bundle."""
+    return {
+        _parse_maybe_arrayed_instance(_split_route_link(ip)[0])[0]
+        for link in bundle.links.items()
+        for ip in link
+    }
+
+
+def _get_array(inst: NetlistInstance) -> tuple[float, ...]:
+    return inst.na, inst.nb, inst.dax, inst.day, inst.dbx, inst.dby
+
+
+def _remove_labels(c: Component, names: set[str]) -> None:
+    """Removes the texts of the component with one of the names."""
+    if not names:
+        return
+    for layer in c.kcl.layout.layer_indexes():
+        shapes = c.shapes(layer)
+        texts = [
+            shape
+            for shape in shapes.each(kf.kdb.Shapes.STexts)
+            if shape.text_string in names
+        ]
+        for shape in texts:
+            shapes.erase(shape)
 
 
 def _add_ports(
@@ -958,7 +1239,7 @@ def _add_ports(
         ref = refs[i]
         ps = [p.name for p in ref.ports]
         if p not in ps:
-            raise ValueError(f"{p!r} not in {ps} for" f" {i!r}.")
+            raise ValueError(f"{p!r} not in {ps} for {i!r}.")
         inst_port = ref.ports[p] if ia is None else ref.ports[p, ia, ib]
         c.add_port(name, port=inst_port)
     return c
@@ -972,8 +1253,18 @@ def _add_labels(
     return c
 
 
-def _graph_roots(g: nx.DiGraph) -> list[str]:
-    return [node for node in g.nodes if g.in_degree(node) == 0]
+def _graph_cyclic_nodes(g: nx.DiGraph) -> list[set[str]]:
+    """Returns the strongly connected components of g with a cycle."""
+    return [
+        nodes
+        for nodes in nx.strongly_connected_components(g)
+        if len(nodes) > 1 or g.has_edge(*nodes, *nodes)
+    ]
+
+
+def _find_cycle(g: nx.DiGraph) -> list[str]:
+    """Returns the nodes of a cycle of g."""
+    return [i for i, _ in nx.find_cycle(g)]
 
 
 def _graph_connect(g: nx.DiGraph, i1: str, i2: str):
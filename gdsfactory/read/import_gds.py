@@ -1,9 +1,32 @@
+"""Import GDS files as Components.
+
+`import_gds` caches the imported Components in `import_gds_cache`. The cache is
+keyed on the file path and version (size and modification time, or a content
+hash), so a file that changes on disk is imported again, and the old version is
+dropped. The cache can be bounded by the total file size and shape count of the
+imported components, and evicts the least recently used ones first.
+
+.. code::
+
+    import gdsfactory as gf
+    from gdsfactory.read.import_gds import import_gds_cache
+
+    import_gds_cache.max_bytes = 2**30
+    import_gds_cache.delete_evicted = True
+    c = gf.import_gds("black_box.gds")
+    print(import_gds_cache.info())
+"""
+
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import threading
 import warnings
+from collections import OrderedDict
 from collections.abc import Callable, Hashable, Iterable
-from functools import cache
 from pathlib import Path
+from typing import Any
 
 import kfactory as kf
 from kfactory import KCLayout
@@ -11,7 +34,167 @@ from kfactory import KCLayout
 from gdsfactory.component import Component
 
 
-@cache
+@dataclasses.dataclass
+class ImportGdsCacheInfo:
+    """Statistics of an ImportGdsCache."""
+
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+    shapes: int = 0
+
+
+@dataclasses.dataclass
+class _Entry:
+    component: Component
+    bytes: int
+    shapes: int
+
+
+class ImportGdsCache:
+    """Least recently used cache of imported GDS files.
+
+    Entries are keyed on (resolved path, size, modification time or content hash,
+    cellname, post_process). When a file changes on disk the next import misses
+    and the entries of the old version are dropped as stale.
+
+    Args:
+        max_bytes: maximum total size of the cached GDS files. None is unbounded.
+        max_shapes: maximum total number of shapes of the cells of the cached
+            components. None is unbounded.
+        hash_content: key on a hash of the file contents instead of its
+            modification time. Reads each file once per import.
+        delete_evicted: also delete evicted and stale components (and their
+            subcells) from the layout, unless they are instantiated in another
+            cell. Only use it if evicted components are not used anymore.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        max_shapes: int | None = None,
+        hash_content: bool = False,
+        delete_evicted: bool = False,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.max_bytes = max_bytes
+        self.max_shapes = max_shapes
+        self.hash_content = hash_content
+        self.delete_evicted = delete_evicted
+        self._entries: OrderedDict[tuple[Any, ...], _Entry] = OrderedDict()
+        self._versions: dict[str, tuple[int, int | str]] = {}
+        self._info = ImportGdsCacheInfo()
+        self._lock = threading.RLock()
+
+    def get(
+        self,
+        gdspath: str | Path,
+        cellname: str | None,
+        post_process: Hashable | None,
+        load: Callable[[], Component],
+    ) -> Component:
+        """Returns the cached component of a GDS file, or loads and caches it."""
+        path = Path(gdspath).resolve()
+        version = self._get_version(path)
+        key = (str(path), *version, cellname, post_process)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._info.hits += 1
+                return entry.component
+            self._info.misses += 1
+            if self._versions.get(str(path), version) != version:
+                self._info.stale += self._remove(str(path))
+            self._versions[str(path)] = version
+
+        c = load()
+        entry = _Entry(component=c, bytes=version[0], shapes=_count_shapes(c))
+        with self._lock:
+            if key in self._entries:  # loaded by another thread meanwhile
+                return self._entries[key].component
+            self._entries[key] = entry
+            self._info.bytes += entry.bytes
+            self._info.shapes += entry.shapes
+            self._evict()
+        return c
+
+    def invalidate(self, gdspath: str | Path | None = None) -> int:
+        """Drops the entries of a GDS file, or all entries, and returns how many."""
+        with self._lock:
+            if gdspath is None:
+                n = self._remove(None)
+                self._versions.clear()
+                return n
+            path = str(Path(gdspath).resolve())
+            self._versions.pop(path, None)
+            return self._remove(path)
+
+    def info(self) -> ImportGdsCacheInfo:
+        """Returns the hit, miss and eviction counts and the current size."""
+        with self._lock:
+            return dataclasses.replace(self._info, entries=len(self._entries))
+
+    def clear(self) -> None:
+        """Drops all entries and resets the statistics."""
+        with self._lock:
+            self.invalidate()
+            self._info = ImportGdsCacheInfo()
+
+    def _get_version(self, path: Path) -> tuple[int, int | str]:
+        stat = path.stat()
+        if not self.hash_content:
+            return stat.st_size, stat.st_mtime_ns
+        digest = hashlib.blake2b()
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+        return stat.st_size, digest.hexdigest()
+
+    def _evict(self) -> None:
+        """Evicts the least recently used entries, but not the last one."""
+        while len(self._entries) > 1 and (
+            (self.max_bytes is not None and self._info.bytes > self.max_bytes)
+            or (self.max_shapes is not None and self._info.shapes > self.max_shapes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._drop(entry)
+            self._info.evictions += 1
+
+    def _remove(self, path: str | None) -> int:
+        """Removes the entries of a path, or all entries, and returns how many."""
+        keys = [key for key in self._entries if path is None or key[0] == path]
+        for key in keys:
+            self._drop(self._entries.pop(key))
+        return len(keys)
+
+    def _drop(self, entry: _Entry) -> None:
+        self._info.bytes -= entry.bytes
+        self._info.shapes -= entry.shapes
+        c = entry.component
+        if self.delete_evicted and not c._destroyed() and not c.parent_cells():
+            c.kcl.layout.prune_cell(c.cell_index(), -1)
+            c.kcl.rebuild()
+
+
+def _count_shapes(c: Component) -> int:
+    """Returns the number of shapes of the cell and its subcells."""
+    layout = c.kcl.layout
+    layers = layout.layer_indexes()
+    return sum(
+        layout.cell(ci).shapes(layer).size()
+        for ci in [c.cell_index(), *c.called_cells()]
+        for layer in layers
+    )
+
+
+import_gds_cache = ImportGdsCache()
+
+
 def import_gds(
     gdspath: str | Path,
     cellname: str | None = None,
@@ -25,11 +208,26 @@ def import_gds(
         cellname: name of the cell to return. Defaults to top cell.
         post_process: function to run after reading the GDS file.
         kwargs: deprecated and ignored.
+
+    The components are cached in `import_gds_cache`, see ImportGdsCache.
     """
     if kwargs:
         for k in kwargs:
             warnings.warn(f"kwargs {k!r} is deprecated and ignored")
 
+    return import_gds_cache.get(
+        gdspath,
+        cellname=cellname,
+        post_process=post_process,
+        load=lambda: _import_gds(gdspath, cellname, post_process),
+    )
+
+
+def _import_gds(
+    gdspath: str | Path,
+    cellname: str | None = None,
+    post_process: Iterable[Callable[[Component], None]] | None = None,
+) -> Component:
     temp_kcl = KCLayout(name=str(gdspath))
     options = kf.kcell.load_layout_options()
     options.warn_level = 0
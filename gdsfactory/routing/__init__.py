@@ -29,8 +29,10 @@ from gdsfactory.routing.route_single_from_steps import (
 )
 from gdsfactory.routing.route_single_sbend import route_single_sbend
 from gdsfactory.routing.route_south import route_south
+from gdsfactory.routing.routing_context import RoutingContext
 
 __all__ = [
+    "RoutingContext",
     "add_electrical_pads_shortest",
     "add_electrical_pads_top",
     "add_electrical_pads_top_dc",
@@ -21,7 +21,9 @@ import gdsfactory as gf
 from gdsfactory.components.straight import straight as straight_function
 from gdsfactory.components.wire import wire_corner
 from gdsfactory.port import Port
+from gdsfactory.routing.routing_context import RoutingContext, get_route_layers
 from gdsfactory.routing.sort_ports import get_port_x, get_port_y
+from gdsfactory.routing.straight_pool import StraightPool
 from gdsfactory.typings import (
     Component,
     ComponentSpec,
@@ -99,6 +101,8 @@ def route_bundle(
     radius: float | None = None,
     route_width: float | list[float] | None = None,
     straight: ComponentSpec = straight_function,
+    straight_pool: bool = False,
+    routing_context: RoutingContext | None = None,
 ) -> list[OpticalManhattanRoute]:
     """Places a bundle of routes to connect two groups of ports.
 
@@ -125,6 +129,15 @@ def route_bundle(
         radius: bend radius. If None, defaults to cross_section.radius.
         route_width: width of the route. If None, defaults to cross_section.width.
         straight: function for the straight. Defaults to straight.
+        straight_pool: composes the straights from power of two length straights,
+            so the bundle creates few straight cells.
+            Off by default, as it places more instances and routes slower.
+            See StraightPool.
+        routing_context: spatial index of the component instances and routes.
+            If bboxes is None, routes around the bboxes of the instances with
+            ports1 or ports2, and checks collisions on collision_check_layers
+            (default the port layers) with the routes placed before with the
+            same routing_context, instead of the router flattening the component.
 
 
     .. plot::
@@ -199,6 +212,12 @@ def route_bundle(
             cross_section=cross_section,
         )
 
+    pool = (
+        StraightPool(component, straight=straight, cross_section=cross_section)
+        if straight_pool
+        else None
+    )
+
     dbu = component.kcl.dbu
     end_straight = round(end_straight_length / dbu)
     start_straight = round(start_straight_length / dbu)
@@ -208,25 +227,40 @@ def route_bundle(
             gf.get_layer(layer) for layer in collision_check_layers
         ]
 
-    return kf.routing.optical.route_bundle(
+    if routing_context:
+        routing_context.update()
+        if bboxes is None:
+            bboxes = routing_context.get_bboxes(ports1 + ports2)
+
+    routes = kf.routing.optical.route_bundle(
         component,
         ports1,
         ports2,
         round(separation / component.kcl.dbu),
-        straight_factory=straight_dbu,
+        straight_factory=straight_dbu if pool is None else pool,
         bend90_cell=bend90,
         taper_cell=taper_cell,
         start_straights=start_straight,
         end_straights=end_straight,
         min_straight_taper=round(min_straight_taper / dbu),
         place_port_type=port_type,
-        collision_check_layers=collision_check_layers,
-        on_collision=on_collision,
+        # with a routing_context, collisions are checked from its index
+        collision_check_layers=None if routing_context else collision_check_layers,
+        on_collision=None if routing_context else on_collision,
         allow_width_mismatch=allow_width_mismatch,
         bboxes=bboxes or [],
         route_width=width_dbu,
         sort_ports=sort_ports,
     )
+    if pool is not None:
+        pool.compose(routes)
+    if routing_context:
+        routing_context.add_routes(
+            routes,
+            layers=collision_check_layers or get_route_layers(ports1),
+            on_collision=on_collision,
+        )
+    return routes
 
 
 route_bundle_electrical = partial(
@@ -11,6 +11,7 @@ from kfactory.routing.aa.optical import (
 
 from gdsfactory.components.bend_euler import bend_euler_all_angle
 from gdsfactory.components.straight import straight_all_angle
+from gdsfactory.routing.routing_context import RoutingContext, get_route_layers
 from gdsfactory.typings import ComponentSpec, CrossSectionSpec, Port
 
 
@@ -25,6 +26,7 @@ def route_bundle_all_angle(
     bend_ports: tuple[str, str] = ("o1", "o2"),
     straight_ports: tuple[str, str] = ("o1", "o2"),
     cross_section: CrossSectionSpec | None = None,
+    routing_context: RoutingContext | None = None,
 ) -> list[OpticalAllAngleRoute]:
     """Route a bundle of ports to another bundle of ports with all angles.
 
@@ -39,6 +41,9 @@ def route_bundle_all_angle(
         bend_ports: tuple of ports to connect the bends.
         straight_ports: tuple of ports to connect the straights.
         cross_section: cross_section to use. Overrides the  cross_section.
+        routing_context: spatial index of the component instances and routes.
+            Warns if the routes collide with the routes placed before with the
+            same routing_context.
     """
     if cross_section:
         straight = partial(straight, cross_section=cross_section)
@@ -48,7 +53,7 @@ def route_bundle_all_angle(
     if backbone:
         backbone = [kf.kdb.DPoint(*p) for p in backbone]
 
-    return route_bundle(
+    routes = route_bundle(
         c=component,
         start_ports=ports1,
         end_ports=ports2,
@@ -59,6 +64,9 @@ def route_bundle_all_angle(
         bend_ports=bend_ports,
         straight_ports=straight_ports,
     )
+    if routing_context:
+        routing_context.add_routes(routes, layers=get_route_layers(ports1))
+    return routes
 
 
 if __name__ == "__main__":
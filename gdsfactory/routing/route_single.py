@@ -36,6 +36,8 @@ from gdsfactory.component import Component
 from gdsfactory.components.bend_euler import bend_euler
 from gdsfactory.components.straight import straight as straight_function
 from gdsfactory.port import Port
+from gdsfactory.routing.routing_context import RoutingContext, get_route_layers
+from gdsfactory.routing.straight_pool import StraightPool
 from gdsfactory.typings import (
     ComponentSpec,
     Coordinates,
@@ -60,6 +62,8 @@ def route_single(
     allow_width_mismatch: bool = False,
     radius: float | None = None,
     route_width: float | None = None,
+    straight_pool: bool = False,
+    routing_context: RoutingContext | None = None,
 ) -> OpticalManhattanRoute:
     """Returns a Manhattan Route between 2 ports.
 
@@ -81,6 +85,13 @@ def route_single(
         allow_width_mismatch: allow different port widths.
         radius: bend radius. If None, defaults to cross_section.radius.
         route_width: width of the route in um. If None, defaults to cross_section.width.
+        straight_pool: composes the straights from power of two length straights,
+            so routes create few straight cells.
+            Off by default, as it places more instances and routes slower.
+            See StraightPool.
+        routing_context: spatial index of the component instances and routes.
+            Warns if the route collides with the routes placed before with the
+            same routing_context.
 
 
     .. plot::
@@ -124,6 +135,13 @@ def route_single(
             cross_section=cross_section,
         )
 
+    pool = (
+        StraightPool(component, straight=straight, cross_section=cross_section)
+        if straight_pool
+        else None
+    )
+    straight_factory = straight_dbu if pool is None else pool
+
     dbu = component.kcl.dbu
     end_straight = round(end_straight_length / dbu)
     start_straight = round(start_straight_length / dbu)
@@ -136,11 +154,11 @@ def route_single(
             w += [kf.kdb.Point(*p2.center)]
             waypoints = w
 
-        return place90(
+        optical_route = place90(
             component,
             p1=p1,
             p2=p2,
-            straight_factory=straight_dbu,
+            straight_factory=straight_factory,
             bend90_cell=bend90,
             taper_cell=taper_cell,
             pts=waypoints,
@@ -150,11 +168,11 @@ def route_single(
         )
 
     else:
-        return route(
+        optical_route = route(
             component,
             p1=p1,
             p2=p2,
-            straight_factory=straight_dbu,
+            straight_factory=straight_factory,
             bend90_cell=bend90,
             taper_cell=taper_cell,
             start_straight=start_straight,
@@ -164,6 +182,12 @@ def route_single(
             route_width=route_width,
         )
 
+    if pool is not None:
+        pool.compose([optical_route])
+    if routing_context:
+        routing_context.add_routes([optical_route], layers=get_route_layers([p1]))
+    return optical_route
+
 
 # FIXME
 # route_single_electrical = partial(
@@ -0,0 +1,276 @@
+"""Spatial index of the instances and routes of a Component.
+
+Placing many bundles into one Component with `route_bundle` rebuilds the
+obstacle boxes and collision regions on every call. A `RoutingContext` keeps
+them in an incremental spatial index instead, so each call only queries the
+neighborhood of its ports and routes.
+"""
+
+from __future__ import annotations
+
+import warnings
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+import kfactory as kf
+from kfactory import kdb
+
+import gdsfactory as gf
+from gdsfactory.component import Component
+from gdsfactory.port import Port
+from gdsfactory.routing.utils import RouteWarning
+from gdsfactory.typings import LayerSpecs
+
+
+class ShapeIndex:
+    """Incremental spatial index of boxes with an integer id.
+
+    KLayout keeps the shapes of a `kdb.Shapes` container in a box tree, which is
+    sorted again after every change. The index keeps the boxes in chunks, each
+    more than twice the size of the next one, and merges only the chunks smaller
+    than a new batch. So each box is sorted amortized O(log n) times, and a
+    query visits the box trees of O(log n) chunks.
+    """
+
+    def __init__(self) -> None:
+        """Creates an empty index."""
+        self._chunks: list[kdb.Shapes] = []
+
+    def __len__(self) -> int:
+        """Returns the number of boxes."""
+        return sum(shapes.size() for shapes in self._chunks)
+
+    def insert(self, items: Iterable[tuple[kdb.Box, int]]) -> None:
+        """Inserts (box, id) items."""
+        shapes = kdb.Shapes()
+        for box, id in items:
+            shapes.insert(box, id)
+        if shapes.is_empty():
+            return
+        while self._chunks and self._chunks[-1].size() <= 2 * shapes.size():
+            shapes.insert(self._chunks.pop())
+        self._chunks.append(shapes)
+
+    def touching(self, box: kdb.Box) -> Iterator[tuple[kdb.Box, int]]:
+        """Yields (box, id) for the boxes touching or overlapping box."""
+        for shapes in self._chunks:
+            for shape in shapes.each_touching(kdb.Shapes.SBoxes, box):
+                yield shape.box, shape.prop_id
+
+
+class RoutingContext:
+    """Obstacles and routed geometry of a Component, for routing into it.
+
+    Instances placed in the component are indexed by bounding box. Route
+    instances added with `add_routes` are also indexed by their bounding box on
+    each layer, and checked against the routes added before them.
+
+    Instances are placed at the end of `component.insts`, so each call only
+    indexes the instances after the ones indexed before, and the component is
+    only scanned again after instances were removed. A moved instance is
+    indexed again when a query finds its old bounding box. Call `update` with
+    full=True after moving instances onto ports that are routed later.
+
+    Args:
+        component: to route into.
+
+    .. code::
+
+        import gdsfactory as gf
+
+        c = gf.Component()
+        context = gf.routing.RoutingContext(c)
+        for ports1, ports2 in bundles:
+            gf.routing.route_bundle(c, ports1, ports2, routing_context=context)
+    """
+
+    def __init__(self, component: Component) -> None:
+        """Indexes the instances of component."""
+        self.component = component
+        self.instances = ShapeIndex()
+        self.routes: dict[int, ShapeIndex] = {}
+        # id in the instances index -> (instance, transformation when indexed),
+        # None once the instance is deleted or indexed again under a new id
+        self._instances: list[tuple[kf.Instance, kdb.ICplxTrans] | None] = []
+        # known instances -> id in the instances index, -1 for route instances
+        self._ids: dict[kdb.Instance, int] = {}
+        # the instances of the component up to the last one seen by update
+        self._n_insts = 0
+        self._last_inst: kf.Instance | None = None
+        self._route_shapes: list[tuple[kf.Instance | kf.VInstance, int]] = []
+        self._regions: dict[int, kdb.Region] = {}
+        self.update()
+
+    def update(self, full: bool = False) -> None:
+        """Indexes the instances placed in the component since the last update.
+
+        Args:
+            full: scans all instances of the component, and indexes the moved
+                ones again.
+        """
+        insts = self.component.insts
+        n = self._n_insts
+        if full or len(insts) < n or (n and insts[n - 1] is not self._last_inst):
+            self._scan()
+        else:
+            self._index(
+                [
+                    insts[i]
+                    for i in range(n, len(insts))
+                    if insts[i]._instance not in self._ids
+                ]
+            )
+        self._n_insts = len(insts)
+        self._last_inst = insts[-1] if len(insts) else None
+
+    def get_bboxes(self, ports: Iterable[Port]) -> list[kdb.Box]:
+        """Returns the bounding boxes of the (not route) instances with the ports."""
+        ports = list(ports)
+        bboxes: dict[int, kdb.Box] = {}
+        moved = []
+        for port in ports:
+            point = kdb.Point(*port.center)
+            for box, id in self.instances.touching(kdb.Box(point, point)):
+                if self._instances[id] is None or id in bboxes:
+                    continue
+                inst = self._instances[id][0]
+                if not inst.is_valid():
+                    self._instances[id] = None
+                elif self._is_moved(id):
+                    # found at its old place, looked up again at the new one
+                    self._instances[id] = None
+                    moved.append(inst)
+                elif box.contains(point):
+                    bboxes[id] = box
+        if moved:
+            self._index(moved)
+            return self.get_bboxes(ports)
+        return list(bboxes.values())
+
+    def add_routes(
+        self,
+        routes: Sequence[Any],
+        layers: LayerSpecs,
+        on_collision: str | None = "show_error",
+    ) -> kdb.Region:
+        """Indexes the instances of routes and returns their collisions.
+
+        A collision is any overlap on layers with another route, placed before
+        or in the same call. Routes that only touch each other do not collide.
+        Only route instances with touching bounding boxes are compared shape
+        by shape.
+
+        Args:
+            routes: routes with the instances placed by a router.
+            layers: to check for collisions.
+            on_collision: "error" raises ValueError, "show_error" warns with a
+                RouteWarning, None does not check.
+        """
+        layer_indexes = [gf.get_layer(layer) for layer in layers]
+        collisions = kdb.Region()
+
+        for route in routes:
+            new: dict[int, list[tuple[kdb.Box, int]]] = {}
+            for inst in route.instances:
+                if not isinstance(inst, kf.VInstance):
+                    self._ids[inst._instance] = -1
+                for layer in layer_indexes:
+                    id = len(self._route_shapes)
+                    self._route_shapes.append((inst, layer))
+                    box = _get_bbox(inst, layer)
+                    if box.empty():
+                        continue
+                    new.setdefault(layer, []).append((box, id))
+                    if on_collision is None or layer not in self.routes:
+                        continue
+                    for _, other in self.routes[layer].touching(box):
+                        if _is_deleted(self._route_shapes[other][0]):
+                            continue
+                        collisions += self._get_region(id) & self._get_region(other)
+            for layer, items in new.items():
+                self.routes.setdefault(layer, ShapeIndex()).insert(items)
+
+        if not collisions.is_empty():
+            message = (
+                f"Routes in {self.component.name!r} collide with other routes "
+                f"at {collisions.bbox().to_dtype(self.component.kcl.dbu)}"
+            )
+            if on_collision == "error":
+                raise ValueError(message)
+            warnings.warn(message, RouteWarning, stacklevel=3)
+        return collisions
+
+    def _scan(self) -> None:
+        """Indexes the instances of the component again, apart from the routes."""
+        ids = self._ids
+        self._ids = {}
+        new = []
+        for inst in self.component.insts:
+            id = ids.pop(inst._instance, None)
+            if id is None:
+                new.append(inst)
+            elif id >= 0 and self._is_moved(id):
+                self._instances[id] = None
+                new.append(inst)
+            else:
+                self._ids[inst._instance] = id
+        for id in ids.values():
+            if id >= 0:
+                self._instances[id] = None
+        self._index(new)
+
+    def _index(self, instances: list[kf.Instance]) -> None:
+        """Indexes instances by their bounding box under new ids."""
+        items = []
+        for inst in instances:
+            id = len(self._instances)
+            self._ids[inst._instance] = id
+            self._instances.append((inst, inst.cplx_trans))
+            items.append((inst.bbox(), id))
+        self.instances.insert(items)
+
+    def _is_moved(self, id: int) -> bool:
+        inst, trans = self._instances[id]
+        return inst.cplx_trans != trans
+
+    def _get_region(self, id: int) -> kdb.Region:
+        """Returns the shapes of a route instance on a layer, computed once."""
+        if id not in self._regions:
+            inst, layer = self._route_shapes[id]
+            self._regions[id] = _get_region(inst, layer)
+        return self._regions[id]
+
+
+def get_route_layers(ports: Iterable[Port]) -> list[int]:
+    """Returns the layers of the ports, the default layers to check for collisions."""
+    return list({port.layer: None for port in ports})
+
+
+def _is_deleted(inst: kf.Instance | kf.VInstance) -> bool:
+    return not isinstance(inst, kf.VInstance) and not inst.is_valid()
+
+
+def _get_bbox(inst: kf.Instance | kf.VInstance, layer: int) -> kdb.Box:
+    """Returns the bounding box of an instance on a layer in dbu."""
+    if not isinstance(inst, kf.VInstance):
+        return inst.bbox(layer)
+    return _get_region(inst, layer).bbox()
+
+
+def _get_region(inst: kf.Instance | kf.VInstance, layer: int) -> kdb.Region:
+    """Returns the shapes of an instance on a layer in dbu."""
+    if not isinstance(inst, kf.VInstance):
+        return kdb.Region(inst.cell.begin_shapes_rec(layer)).transformed(
+            inst.cplx_trans
+        )
+
+    trans = kdb.CplxTrans(inst.cell.kcl.dbu).inverted() * inst.trans
+    region = kdb.Region()
+    for shape in inst.cell.shapes(layer).each():
+        if isinstance(shape, kdb.DPath):
+            shape = shape.polygon()
+        elif isinstance(shape, kdb.DBox):
+            shape = kdb.DPolygon(shape)
+        if isinstance(shape, kdb.DPolygon | kdb.DSimplePolygon):
+            region.insert(shape.transformed(trans))
+    return region
@@ -51,6 +51,9 @@ def sort_ports(
     if not ports2:
         raise ValueError("ports2 is an empty list")
 
+    # original index of each port in ports1, to sort ports2 in accordance
+    ports1_index = {id(p1): i for i, p1 in enumerate(ports1)}
+
     if ports1[0].orientation in [0, 180] and ports2[0].orientation in [0, 180]:
         _sort(get_port_y, ports1, enforce_port_ordering, ports2)
     elif ports1[0].orientation in [90, 270] and ports2[0].orientation in [90, 270]:
@@ -63,7 +66,7 @@ def sort_ports(
             ports2.sort(key=f_key1)
 
     if enforce_port_ordering:
-        ports2 = [ports2[ports1.index(p1)] for p1 in ports1]
+        ports2 = [ports2[ports1_index[id(p1)]] for p1 in ports1]
 
     return ports1, ports2
 
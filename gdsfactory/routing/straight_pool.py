@@ -0,0 +1,137 @@
+"""Routing scoped pool of straights.
+
+Routers place one straight per route segment, so a bundle with many different
+segment lengths creates one straight cell per length. `StraightPool` is a
+straight factory (in dbu) for the routers that caches the straights of a routing
+call. `StraightPool.compose` then replaces each straight by a chain of power of
+two length straights, so the routes only use about log2(max length) straight
+cells per width, and the straights that are no longer used are deleted.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import kfactory as kf
+from kfactory.routing.optical import OpticalManhattanRoute
+
+import gdsfactory as gf
+from gdsfactory.component import Component
+from gdsfactory.typings import ComponentSpec, CrossSectionSpec
+
+
+class StraightPool:
+    """Straight factory in dbu that can compose straights from power of two lengths.
+
+    Args:
+        component: component the routes are placed in.
+        straight: straight spec. Needs to be translation invariant along x,
+            with the first port at the origin and the second port at x=length.
+        cross_section: for the straights.
+
+    .. code::
+
+        pool = StraightPool(c, straight="straight", cross_section="strip")
+        routes = kf.routing.optical.route_bundle(c, ..., straight_factory=pool)
+        pool.compose(routes)
+    """
+
+    def __init__(
+        self,
+        component: Component,
+        straight: ComponentSpec = "straight",
+        cross_section: CrossSectionSpec = "strip",
+    ) -> None:
+        """Creates an empty pool of straights for component."""
+        self.component = component
+        self.straight = straight
+        self.cross_section = cross_section
+        self.straights: dict[tuple[int, int], Component] = {}
+        self._new_cells: set[int] = set()
+
+    def __call__(self, length: int, width: int) -> Component:
+        """Returns a straight with length and width in dbu."""
+        key = (length, width)
+        if key not in self.straights:
+            kcl = self.component.kcl
+            cells = len(kcl.kcells)
+            c = gf.get_component(
+                self.straight,
+                length=length * kcl.dbu,
+                width=width * kcl.dbu,
+                cross_section=self.cross_section,
+            )
+            if len(kcl.kcells) > cells:
+                self._new_cells.add(c.cell_index())
+            self.straights[key] = c
+        return self.straights[key]
+
+    def compose(self, routes: Sequence[OpticalManhattanRoute]) -> None:
+        """Replaces the straights of the routes by power of two length straights.
+
+        Straights created by the pool that are no longer used are deleted.
+        """
+        straights = {
+            c.cell_index(): key
+            for key, c in self.straights.items()
+            if self._is_composable(c, length=key[0])
+        }
+        composed = False
+
+        for route in routes:
+            instances = []
+            for inst in route.instances:
+                key = straights.get(inst.cell_index)
+                if key is None or _is_pooled(key[0]) or inst.is_complex():
+                    instances.append(inst)
+                    continue
+
+                length, width = key
+                x = 0
+                for piece in _get_lengths(length):
+                    ref = self.component << self(piece, width)
+                    ref.trans = inst.trans * kf.kdb.Trans(x, 0)
+                    instances.append(ref)
+                    x += piece
+                inst._instance.delete()
+                composed = True
+            route.instances = instances
+
+        if not composed:
+            return
+
+        self.component.insts.clean()
+        kcl = self.component.kcl
+        for ci in self._new_cells:
+            cell = kcl.layout.cell(ci)
+            if cell is not None and not cell.parent_cells():
+                key = straights.get(ci)
+                if key is not None and not _is_pooled(key[0]):
+                    del self.straights[key]
+                    kcl.delete_cell(ci)
+
+    def _is_composable(self, c: Component, length: int) -> bool:
+        """True if the straight has its first two ports at (0, 0) and (length, 0)."""
+        ports = list(c.ports)
+        return (
+            len(ports) >= 2
+            and ports[0].trans == kf.kdb.Trans(2, False, 0, 0)
+            and ports[1].trans == kf.kdb.Trans(0, False, length, 0)
+        )
+
+
+def _get_lengths(length: int) -> list[int]:
+    """Returns the pooled lengths that add up to length, longest first.
+
+    Pooled lengths are powers of two from 2 and 3, as 1 dbu straights have no area.
+    """
+    remainder = 3 if length % 2 else 0
+    rest = length - remainder
+    lengths = [
+        1 << bit for bit in reversed(range(rest.bit_length())) if rest >> bit & 1
+    ]
+    return lengths + [remainder] if remainder else lengths
+
+
+def _is_pooled(length: int) -> bool:
+    return length <= 3 or length.bit_count() == 1
@@ -1,3 +1,10 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+from collections.abc import Iterator
+from fractions import Fraction
+from functools import partial
 from warnings import warn
 
 import numpy as np
@@ -49,8 +56,6 @@ def is_invalid_bundle_topology(ports1: list[Port], ports2: list[Port]) -> bool:
     # OR all lines intersect and all ports1 > 90, ports2 < 90, or vice versa
     # the topology is valid
     # (actually, the bundle can contain 2 groups-- one of each, and still maintain valid, as long as there are no crossings between them)
-    import shapely.geometry as sg
-    from shapely import intersection_all
 
     # this is not really quite angle, but a threshold to check if dot products are effectively above/below zero, excluding numerical errors
     ANGLE_TOLERANCE = 1e-10
@@ -62,36 +67,196 @@ def is_invalid_bundle_topology(ports1: list[Port], ports2: list[Port]) -> bool:
         # don't check if the ports do not have orientation
         return False
 
-    lines = [sg.LineString([p1.dcenter, p2.dcenter]) for p1, p2 in zip(ports1, ports2)]
-
-    # Positive if BOTH ports are EITHER facing towards OR away from the vector of the outgoing line between them
-    # Zero if either is orthogonal
-    # Negative if one is facing and the other not
-    ports_facing = []
-    for p1, p2 in zip(ports1, ports2):
-        dy_line = p2.dcenter[1] - p1.dcenter[1]
-        dx_line = p2.dcenter[0] - p1.dcenter[0]
-
-        dy_p1 = np.sin(np.deg2rad(p1.orientation))
-        dx_p1 = np.cos(np.deg2rad(p1.orientation))
-
-        dy_p2 = np.sin(np.deg2rad(p2.orientation))
-        dx_p2 = np.cos(np.deg2rad(p2.orientation))
-        dot1 = np.vdot([dx_line, dy_line], [dx_p1, dy_p1])
-        dot2 = np.vdot([-dx_line, -dy_line], [dx_p2, dy_p2])
-        both_facing = dot1 * dot2
-        # print(both_facing)
-        ports_facing.append(both_facing)
-
-    intersections = intersection_all(lines)
-    # print(intersections)
-    if intersections.is_empty and all(s < -ANGLE_TOLERANCE for s in ports_facing):
-        return True
-    elif not intersections.is_empty and all(s > ANGLE_TOLERANCE for s in ports_facing):
-        return True
+    ports_facing = get_ports_facing(ports1, ports2)
+
+    if np.all(ports_facing < -ANGLE_TOLERANCE):
+        return not has_bundle_crossing(ports1, ports2)
+    elif np.all(ports_facing > ANGLE_TOLERANCE):
+        # all lines cross
+        return _is_reversed(ports1, ports2)
 
     # NOTE: there are more complicated cases we are ignoring for now and giving "the benefit of the doubt"
     # i.e. if ports2 is perpendicular to ports1 and located somewhere laterally in between ports1
     # or some cases where ports are not properly ordered
     # for now we call these cases potentially valid, but we could be stricter in the future
     return False
+
+
+def get_ports_facing(ports1: list[Port], ports2: list[Port]) -> np.ndarray:
+    """Returns the product of the port directions with the line between each port pair.
+
+    Positive if BOTH ports are EITHER facing towards OR away from the line between
+    them, zero if either is orthogonal and negative if one is facing and the other not.
+
+    Args:
+        ports1: the starting ports of the bundle.
+        ports2: the ending ports of the bundle.
+    """
+    centers1 = np.array([p.dcenter for p in ports1], dtype=float).reshape(-1, 2)
+    centers2 = np.array([p.dcenter for p in ports2], dtype=float).reshape(-1, 2)
+    angles1 = np.deg2rad([p.orientation for p in ports1])
+    angles2 = np.deg2rad([p.orientation for p in ports2])
+    lines = centers2 - centers1
+    dot1 = lines[:, 0] * np.cos(angles1) + lines[:, 1] * np.sin(angles1)
+    dot2 = -lines[:, 0] * np.cos(angles2) - lines[:, 1] * np.sin(angles2)
+    return dot1 * dot2
+
+
+def get_bundle_crossings(
+    ports1: list[Port], ports2: list[Port]
+) -> list[tuple[int, int]]:
+    """Returns the (i, j) index pairs, i < j, of the port pairs whose lines cross.
+
+    The line of each pair goes from ports1[i] to ports2[i]. Lines that touch or
+    overlap also cross.
+
+    Args:
+        ports1: the starting ports of the bundle.
+        ports2: the ending ports of the bundle.
+    """
+    return get_segment_crossings(_get_bundle_segments(ports1, ports2))
+
+
+def has_bundle_crossing(ports1: list[Port], ports2: list[Port]) -> bool:
+    """Returns True if the lines of any two port pairs cross.
+
+    Stops at the first crossing found, see get_bundle_crossings.
+
+    Args:
+        ports1: the starting ports of the bundle.
+        ports2: the ending ports of the bundle.
+    """
+    segments = _get_bundle_segments(ports1, ports2)
+    return next(_iter_segment_crossings(segments), None) is not None
+
+
+def _get_bundle_segments(
+    ports1: list[Port], ports2: list[Port]
+) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    return [(tuple(p1.center), tuple(p2.center)) for p1, p2 in zip(ports1, ports2)]
+
+
+def _is_reversed(ports1: list[Port], ports2: list[Port]) -> bool:
+    """Returns True if ports2 are in the reverse order of ports1 along the bundle.
+
+    The ports are sorted along the direction orthogonal to the first port of
+    ports1. In O(n log n), unlike testing that every pair of lines crosses.
+    """
+    angle = np.deg2rad(ports1[0].orientation)
+    axis = np.array([-np.sin(angle), np.cos(angle)])
+    positions1 = np.array([p.center for p in ports1], dtype=float) @ axis
+    positions2 = np.array([p.center for p in ports2], dtype=float) @ axis
+    order = np.argsort(positions1, kind="stable")
+    return bool(np.all(np.diff(positions2[order]) < 0))
+
+
+def get_segment_crossings(
+    segments: list[tuple[tuple[int, int], tuple[int, int]]],
+) -> list[tuple[int, int]]:
+    """Returns the (i, j) index pairs, i < j, of the segments that intersect.
+
+    Bentley-Ottmann sweep line in O((n + k) log n) for n segments and k crossing
+    points: only segments that are neighbors along the sweep line are tested for
+    crossings. Segments that touch or overlap also intersect.
+
+    Args:
+        segments: ((x1, y1), (x2, y2)) segments with integer coordinates (dbu).
+    """
+    return sorted(set(_iter_segment_crossings(segments)))
+
+
+def _iter_segment_crossings(
+    segments: list[tuple[tuple[int, int], tuple[int, int]]],
+) -> Iterator[tuple[int, int]]:
+    """Yields the (i, j) index pairs, i < j, of the segments that intersect.
+
+    Pairs are yielded as the sweep finds them, and can repeat.
+    """
+    if not segments:
+        return
+
+    # Sweep along u = scale * x + y, so there are no vertical segments, and use
+    # exact rational arithmetic for the crossing points.
+    ys = [y for segment in segments for _, y in segment]
+    scale = 2 * (max(ys) - min(ys)) + 1
+    ends: list[tuple[int, int, int, int]] = []
+    starts: dict[tuple[int, int], list[int]] = {}
+    for i, ((x1, y1), (x2, y2)) in enumerate(segments):
+        p1, p2 = (scale * x1 + y1, y1), (scale * x2 + y2, y2)
+        p1, p2 = min(p1, p2), max(p1, p2)
+        ends.append((*p1, *p2))
+        starts.setdefault(p1, []).append(i)
+        starts.setdefault(p2, [])
+
+    def slope(i: int) -> Fraction:
+        u1, y1, u2, y2 = ends[i]
+        return Fraction(y2 - y1, u2 - u1)
+
+    events = list(starts)
+    heapq.heapify(events)
+    queued = set(events)
+    status: list[int] = []  # segments ordered by y just before the sweep line
+
+    def add_crossing_event(i: int, j: int, point: tuple[Fraction, Fraction]) -> None:
+        q = _crossing_point(ends[i], ends[j])
+        if q is not None and q > point and q not in queued:
+            queued.add(q)
+            heapq.heappush(events, q)
+
+    while events:
+        point = heapq.heappop(events)
+        below = partial(_below, ends=ends, point=point)
+        lo = bisect.bisect_left(status, 0, key=below)
+        hi = bisect.bisect_right(status, 0, lo=lo, key=below)
+
+        # segments that start at, end at or go through the point
+        through = status[lo:hi]
+        started = starts.get(point, [])
+        meeting = through + started
+        for a, i in enumerate(meeting):
+            for j in meeting[a + 1 :]:
+                yield min(i, j), max(i, j)
+
+        # segments that continue after the point, in their order after the point
+        after = [i for i in through if (ends[i][2], ends[i][3]) != point]
+        after += [i for i in started if ends[i][0] != ends[i][2]]
+        after.sort(key=slope)
+        status[lo:hi] = after
+
+        if not after:
+            if 0 < lo < len(status):
+                add_crossing_event(status[lo - 1], status[lo], point)
+        else:
+            if lo > 0:
+                add_crossing_event(status[lo - 1], after[0], point)
+            end = lo + len(after)
+            if end < len(status):
+                add_crossing_event(after[-1], status[end], point)
+
+
+def _below(
+    i: int,
+    ends: list[tuple[int, int, int, int]],
+    point: tuple[Fraction, Fraction],
+) -> Fraction | int:
+    """Returns < 0 if segment i is below the point and 0 if it goes through it."""
+    u1, y1, u2, y2 = ends[i]
+    u, y = point
+    return (y2 - y1) * (u - u1) - (u2 - u1) * (y - y1)
+
+
+def _crossing_point(
+    e1: tuple[int, int, int, int], e2: tuple[int, int, int, int]
+) -> tuple[Fraction, Fraction] | None:
+    """Returns the crossing point of two segments, None if they do not cross in one point."""
+    u1, y1, u2, y2 = e1
+    u3, y3, u4, y4 = e2
+    du1, dy1, du2, dy2 = u2 - u1, y2 - y1, u4 - u3, y4 - y3
+    denominator = du1 * dy2 - dy1 * du2
+    if denominator == 0:
+        return None
+    t = Fraction((u3 - u1) * dy2 - (y3 - y1) * du2, denominator)
+    s = Fraction((u3 - u1) * dy1 - (y3 - y1) * du1, denominator)
+    if not (0 <= t <= 1 and 0 <= s <= 1):
+        return None
+    return u1 + t * du1, y1 + t * dy1
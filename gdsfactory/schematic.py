@@ -2,7 +2,7 @@ import json
 from typing import Any
 
 import yaml
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, ValidationInfo, model_validator
 
 from gdsfactory.config import PATH
 from gdsfactory.typings import Anchor, Component
@@ -23,15 +23,29 @@ class Instance(BaseModel):
 
     @model_validator(mode="before")
     @classmethod
-    def update_settings_and_info(cls, values):
-        """Validator to update component, settings and info based on the component."""
+    def update_settings_and_info(cls, values, validation_info: ValidationInfo):
+        """Validator to update component, settings and info based on the component.
+
+        A validation context {"components": {key: Component}} keyed by
+        get_component_key(component, settings) reuses the components built for
+        the same spec and settings.
+        """
         component = values.get("component")
         settings = values.get("settings", {})
+        context = validation_info.context or {}
         info = values.get("info", {})
 
         import gdsfactory as gf
-
-        c = gf.get_component(component, settings=settings)
+        from gdsfactory.serialization import get_component_key
+
+        if "components" in context:
+            components = context["components"]
+            key = get_component_key(component, settings)
+            if key not in components:
+                components[key] = gf.get_component(component, settings=settings)
+            c = components[key]
+        else:
+            c = gf.get_component(component, settings=settings)
         component_info = c.info.model_dump(exclude_none=True)
         component_settings = c.settings.model_dump(exclude_none=True)
         values["info"] = {**component_info, **info}
@@ -171,6 +171,15 @@ def clean_value_name(value: Any) -> str:
     return str(clean_value_json(value))
 
 
+def get_component_key(component: Any, settings: dict[str, Any] | None = None) -> str:
+    """Returns a string of a component spec and settings, independent of the settings order."""
+    return orjson.dumps(
+        [component, settings or {}],
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        default=clean_value_name,
+    ).decode()
+
+
 def get_hash(value: Any) -> str:
     return hashlib.md5((clean_value_name(value)).encode()).hexdigest()[:8]
 
@@ -111,23 +111,30 @@ class LogicalLayer(AbstractLayer):
         """
         return hash(self.layer)
 
-    def get_shapes(self, component: Component) -> kf.kdb.Region:
+    def get_shapes(
+        self, component: Component, cache: dict[int, kf.kdb.Region] | None = None
+    ) -> kf.kdb.Region:
         """Return the shapes of the component argument corresponding to this layer.
 
         Arguments:
             component: Component from which to extract shapes on this layer.
+            cache: optional dict of layer hash to Region, shared between calls
+                so each layer is only flattened once.
 
         Returns:
             kf.kdb.Region: A region of polygons on this layer.
         """
         from gdsfactory.pdk import get_layer
 
-        polygons_per_layer = component.get_polygons()
+        key = hash(self)
+        if cache is not None and key in cache:
+            return cache[key]
+
         layer_index = get_layer(self.layer)
-        polygons = (
-            polygons_per_layer[layer_index] if layer_index in polygons_per_layer else []
-        )
-        return kf.kdb.Region(polygons)
+        region = kf.kdb.Region(component.begin_shapes_rec(layer_index))
+        if cache is not None:
+            cache[key] = region
+        return region
 
     def __repr__(self) -> str:
         """Print text representation."""
@@ -185,18 +192,29 @@ class DerivedLayer(AbstractLayer):
         else:
             return self.operation
 
-    def get_shapes(self, component: Component) -> kf.kdb.Region:
+    def get_shapes(
+        self, component: Component, cache: dict[int, kf.kdb.Region] | None = None
+    ) -> kf.kdb.Region:
         """Return the shapes of the component argument corresponding to this layer.
 
         Arguments:
             component: Component from which to extract shapes on this layer.
+            cache: optional dict of layer hash to Region, shared between calls
+                so common sub-expressions are only evaluated once.
 
         Returns:
             kf.kdb.Region: A region of polygons on this layer.
         """
-        r1 = self.layer1.get_shapes(component)
-        r2 = self.layer2.get_shapes(component)
-        return gf.component.boolean_operations[self.operation](r1, r2)
+        key = hash(self)
+        if cache is not None and key in cache:
+            return cache[key]
+
+        r1 = self.layer1.get_shapes(component, cache=cache)
+        r2 = self.layer2.get_shapes(component, cache=cache)
+        region = gf.component.boolean_operations[self.operation](r1, r2)
+        if cache is not None:
+            cache[key] = region
+        return region
 
     def __repr__(self) -> str:
         """Print text representation."""
@@ -576,6 +594,8 @@ def get_component_with_derived_layers(component, layer_stack: LayerStack) -> Com
     from gdsfactory.pdk import get_layer
 
     component_derived = Component()
+    # layer hash -> Region, so each layer and shared sub-expression is evaluated once
+    cache: dict[int, kf.kdb.Region] = {}
 
     for layer_name, level in layer_stack.layers.items():
         if isinstance(level.layer, LogicalLayer):
@@ -590,7 +610,7 @@ def get_component_with_derived_layers(component, layer_stack: LayerStack) -> Com
         else:
             raise ValueError("layer must be one of LogicalLayer or DerivedLayer")
 
-        shapes = level.layer.get_shapes(component=component)
+        shapes = level.layer.get_shapes(component=component, cache=cache)
         component_derived.shapes(derived_layer_index).insert(shapes)
 
     component_derived.add_ports(component.ports)
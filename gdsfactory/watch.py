@@ -17,17 +17,34 @@ from IPython.terminal.embed import embed
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from gdsfactory.component import Component
 from gdsfactory.config import cwd
 from gdsfactory.pdk import get_active_pdk
-from gdsfactory.read.from_yaml_template import cell_from_yaml_template
+from gdsfactory.read.from_yaml import YamlCompiler
+from gdsfactory.read.from_yaml_template import (
+    _evaluate_yaml_template,
+    _split_yaml_definition,
+    cell_from_yaml_template,
+    get_default_settings_dict,
+)
 from gdsfactory.typings import ComponentSpec, PathType
 
 
 class FileWatcher(FileSystemEventHandler):
-    """Captures *.py or *.pic.yml file change events."""
+    """Captures *.py or *.pic.yml file change events.
+
+    The events of a file are coalesced, and the file is built once no new event
+    came for `debounce` seconds. Each *.pic.yml file is compiled with a
+    YamlCompiler, which only places and routes again what changed since the
+    last save.
+    """
 
     def __init__(
-        self, path: str | None = None, run_main: bool = False, run_cells: bool = True
+        self,
+        path: str | None = None,
+        run_main: bool = False,
+        run_cells: bool = True,
+        debounce: float = 0.2,
     ) -> None:
         """Initialize the YAML event handler.
 
@@ -35,12 +52,17 @@ class FileWatcher(FileSystemEventHandler):
             path: the path to the directory to watch.
             run_main: if True, will execute the main function of the file.
             run_cells: if True, will execute the cells of the file.
+            debounce: seconds to wait for more events of a file before building it.
         """
         super().__init__()
 
         self.logger = logging.root
         self.run_cells = run_cells
         self.run_main = run_main
+        self.debounce = debounce
+        self.compilers: dict[str, YamlCompiler] = {}
+        self.pending: dict[str, float] = {}
+        self.lock = threading.Lock()
 
         pdk = get_active_pdk()
         pdk.register_cells_yaml(dirpath=path, update=True)
@@ -58,7 +80,9 @@ class FileWatcher(FileSystemEventHandler):
         while not self.stopping.is_set():
             if not self.observer.is_alive():
                 self.observer.start()
-            time.sleep(1)
+            for filepath in self.pop_pending():
+                self.get_component(filepath)
+            time.sleep(0.05)
         self.observer.stop()
         self.observer.join()
 
@@ -66,6 +90,20 @@ class FileWatcher(FileSystemEventHandler):
         self.stopping.set()
         self.thread.join()
 
+    def schedule(self, src_path) -> None:
+        """Builds a file once no new event came for it for `debounce` seconds."""
+        with self.lock:
+            self.pending[str(src_path)] = time.monotonic() + self.debounce
+
+    def pop_pending(self) -> list[str]:
+        """Returns the scheduled files that are due and unschedules them."""
+        now = time.monotonic()
+        with self.lock:
+            due = [path for path, t in self.pending.items() if t <= now]
+            for path in due:
+                del self.pending[path]
+        return due
+
     def update_cell(self, src_path, update: bool = False) -> Callable:
         """Parses a YAML file to a cell function and registers into active pdk.
 
@@ -96,8 +134,9 @@ class FileWatcher(FileSystemEventHandler):
         what = "directory" if event.is_directory else "file"
         if what == "file" and event.dest_path.endswith(".pic.yml"):
             self.logger.info("Moved %s: %s", what, event.src_path)
+            self.compilers.pop(event.src_path, None)
             self.update_cell(event.dest_path)
-            self.get_component(event.src_path)
+            self.schedule(event.dest_path)
 
     def on_created(self, event) -> None:
         super().on_created(event)
@@ -109,7 +148,7 @@ class FileWatcher(FileSystemEventHandler):
             or event.src_path.endswith(".py")
         ):
             self.logger.info("Created %s: %s", what, event.src_path)
-            self.get_component(event.src_path)
+            self.schedule(event.src_path)
 
     def on_deleted(self, event) -> None:
         super().on_deleted(event)
@@ -122,6 +161,7 @@ class FileWatcher(FileSystemEventHandler):
             filepath = pathlib.Path(event.src_path)
             cell_name = filepath.stem.split(".")[0]
             pdk.remove_cell(cell_name)
+            self.compilers.pop(event.src_path, None)
 
     def on_modified(self, event) -> None:
         super().on_modified(event)
@@ -133,7 +173,7 @@ class FileWatcher(FileSystemEventHandler):
             or event.src_path.endswith(".py")
         ):
             self.logger.info("Modified %s: %s", what, event.src_path)
-            self.get_component(event.src_path)
+            self.schedule(event.src_path)
 
     def update(self):
         pass
@@ -156,8 +196,8 @@ class FileWatcher(FileSystemEventHandler):
 
             if filepath.exists():
                 if str(filepath).endswith(".pic.yml"):
-                    cell_func = self.update_cell(filepath, update=True)
-                    c = cell_func()
+                    self.update_cell(filepath, update=True)
+                    c = self.compile_yaml(filepath)
                     gdspath = dirpath / str(filepath.relative_to(self.path)).replace(
                         ".pic.yml", ".gds"
                     )
@@ -188,6 +228,22 @@ class FileWatcher(FileSystemEventHandler):
             traceback.print_exc(file=sys.stdout)
             print(e)
 
+    def compile_yaml(self, filepath: pathlib.Path) -> Component:
+        """Returns the Component of a *.pic.yml file with its default settings.
+
+        The YamlCompiler of the file reuses the references and routes that did not
+        change since the last compilation.
+        """
+        cell_name = filepath.stem.split(".")[0]
+        compiler = self.compilers.setdefault(
+            str(filepath), YamlCompiler(name=cell_name)
+        )
+        yaml_body, default_settings = _split_yaml_definition(filepath)
+        evaluated_text = _evaluate_yaml_template(
+            yaml_body, get_default_settings_dict(default_settings), {}
+        )
+        return compiler.update(evaluated_text)
+
 
 def watch(
     path: PathType | None = cwd,
@@ -195,6 +251,7 @@ def watch(
     run_main: bool = False,
     run_cells=True,
     pre_run=False,
+    debounce: float = 0.2,
 ) -> None:
     """Starts the file watcher.
 
@@ -205,6 +262,7 @@ def watch(
         run_cells: if True, will execute the cells of the file.
         run_cells: if True, will execute the cells of the file.
         pre_run: build all cells on startup
+        debounce: seconds to wait for more events of a file before building it.
     """
     path = str(path)
     logging.basicConfig(
@@ -214,7 +272,9 @@ def watch(
     )
     if pdk:
         get_active_pdk(name=pdk)
-    watcher = FileWatcher(path=path, run_main=run_main, run_cells=run_cells)
+    watcher = FileWatcher(
+        path=path, run_main=run_main, run_cells=run_cells, debounce=debounce
+    )
     watcher.start()
     if pre_run:
         for root, _, fns in os.walk(path):
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 import trimesh
 
@@ -60,6 +61,34 @@ def test_missing_zmin_or_thickness() -> None:
         to_3d(c, layer_stack=layer_stack)
 
 
+def test_instances() -> None:
+    """Tests that instanced cells give the same solid as the flattened layers."""
+    rectangle = gf.components.rectangle(size=(4, 2), layer=(1, 0))
+    polygon = gf.Component()
+    polygon.add_polygon([(0, 0), (6, 0), (6, 6), (3, 2), (0, 6)], layer=(1, 0))
+    c = gf.Component()
+    c.add_ref(rectangle, columns=3, rows=2, spacing=(10, 10))
+    ref = c << polygon
+    ref.dmirror()
+    ref.drotate(30)
+    ref.dmove((0, 40))
+
+    layer_stack = get_layer_stack()
+    scene = to_3d(c, layer_stack=layer_stack)
+    assert len(scene.geometry) == 2
+    assert len(scene.graph.nodes_geometry) == 7
+
+    flat = to_3d(c, layer_stack=layer_stack, instances=False)
+    assert len(flat.geometry) == 1
+    mesh = scene.to_geometry()
+    flat_mesh = flat.to_geometry()
+    assert mesh.is_watertight
+    # the flattened polygons are snapped to the dbu grid
+    assert mesh.volume == pytest.approx(6 * 8 + 24)
+    assert flat_mesh.volume == pytest.approx(mesh.volume, rel=1e-4)
+    assert np.allclose(mesh.bounds, flat_mesh.bounds, atol=1e-3)
+
+
 if __name__ == "__main__":
     # test_valid_component()
     # test_no_polygons_defined()
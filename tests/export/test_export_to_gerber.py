@@ -0,0 +1,55 @@
+import pathlib
+import re
+
+import numpy as np
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.export.to_gerber import GerberLayer, to_gerber
+
+
+def get_area(text: str) -> float:
+    """Returns the area in um2 of the G36/G37 regions with 6 mm decimals."""
+    area = 0.0
+    for region in re.findall(r"G36\*\n(.*?)G37\*", text, re.S):
+        xy = np.array(re.findall(r"X(-?\d+)Y(-?\d+)", region), dtype=float) * 1e-3
+        assert (xy[0] == xy[-1]).all(), "contour is not closed"
+        x, y = xy.T
+        area += 0.5 * abs(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+    return area
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_to_gerber(tmp_path: pathlib.Path, n_jobs: int | None) -> None:
+    c = gf.Component()
+    ref = c << gf.components.text("GF", size=20, layer=(1, 0))
+    ref.drotate(30)
+    c << gf.components.ring(layer=(2, 0))
+    layermap_to_gerber_layer = {
+        (1, 0): GerberLayer(
+            name="F Cu", function=["Copper", "L1", "Top"], polarity="Positive"
+        ),
+        (2, 0): GerberLayer(
+            name="B_Cu", function=["Copper", "L2", "Bot"], polarity="Positive"
+        ),
+    }
+    to_gerber(c, tmp_path, layermap_to_gerber_layer, n_jobs=n_jobs)
+
+    for filename, layer in (("F_Cu.gbr", (1, 0)), ("B_Cu.gbr", (2, 0))):
+        text = (tmp_path / filename).read_text()
+        assert "%FSLAX46Y46*%" in text
+        assert text.endswith("M02*\n")
+        # c.area sums the polygons, the regions are merged
+        assert get_area(text) == pytest.approx(c.area(layer), rel=1e-5)
+
+
+def test_to_gerber_same_name(tmp_path: pathlib.Path) -> None:
+    c = gf.Component()
+    c << gf.components.rectangle(size=(10, 10), layer=(1, 0))
+    c << gf.components.rectangle(size=(20, 10), layer=(2, 0))
+    layer = GerberLayer(
+        name="Cu", function=["Copper", "L1", "Top"], polarity="Positive"
+    )
+    # the last layer named Cu overwrites the others, as when written serially
+    to_gerber(c, tmp_path, {(1, 0): layer, (2, 0): layer}, n_jobs=2)
+    assert get_area((tmp_path / "Cu.gbr").read_text()) == pytest.approx(200)
@@ -0,0 +1,38 @@
+import numpy as np
+
+import gdsfactory as gf
+from gdsfactory.export.to_np import to_np, to_np_layers
+
+
+def test_to_np_rectangle() -> None:
+    c = gf.components.rectangle(size=(1, 2), layer=(1, 0))
+    img = to_np(c, nm_per_pixel=100, pad_width=1)
+    assert img.shape == (12, 22)
+    assert img.sum() == 10 * 20
+
+
+def test_to_np_layers_area_coverage() -> None:
+    c = gf.components.circle(radius=5, layer=(1, 0))
+    coverage = to_np_layers(c, nm_per_pixel=50, oversample=4)[0]
+    area = coverage.sum() / 255 * 0.05**2
+    assert np.isclose(area, c.area((1, 0)), rtol=1e-2)
+
+
+def test_to_np_layers_tiled_bitpacked(tmp_path) -> None:
+    c = gf.components.bend_circular(radius=5)
+    masks = to_np_layers(c, nm_per_pixel=20, layers=((1, 0), (2, 0)))
+    assert masks.shape[0] == 2
+    assert masks[0].any()
+    assert not masks[1].any()
+
+    packed = to_np_layers(
+        c,
+        nm_per_pixel=20,
+        layers=((1, 0), (2, 0)),
+        bitpack=True,
+        tile_size=37,
+        filepath=tmp_path / "masks.bin",
+    )
+    assert isinstance(packed, np.memmap)
+    unpacked = np.unpackbits(packed, axis=-1)[..., : masks.shape[-1]]
+    np.testing.assert_array_equal(unpacked, masks)
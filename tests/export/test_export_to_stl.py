@@ -36,3 +36,25 @@ def test_export_exclude_layers() -> None:
         to_stl(component, filepath, exclude_layers=exclude_layers)
         filepath = "test_49_0.stl"
         assert not pathlib.Path(filepath).exists()
+
+
+# Tests that the streamed binary STL does not depend on chunk_size and n_jobs.
+def test_export_chunks(tmp_path: pathlib.Path) -> None:
+    component = gf.c.ring_single()
+    to_stl(component, tmp_path / "a.stl")
+    to_stl(component, tmp_path / "b.stl", chunk_size=2, n_jobs=2)
+
+    filepaths = sorted(tmp_path.glob("a_*.stl"))
+    assert filepaths
+    for filepath in filepaths:
+        data = filepath.read_bytes()
+        count = int.from_bytes(data[80:84], "little")
+        assert count > 0
+        assert len(data) == 84 + 50 * count
+        # boxes are written first in each chunk, so only the facets are the same
+        other = (tmp_path / filepath.name.replace("a_", "b_", 1)).read_bytes()
+        assert sorted(_get_facets(data)) == sorted(_get_facets(other))
+
+
+def _get_facets(data: bytes) -> list[bytes]:
+    return [data[i : i + 50] for i in range(84, len(data), 50)]
@@ -0,0 +1,47 @@
+import pathlib
+import xml.etree.ElementTree as ET
+
+import gdsfactory as gf
+from gdsfactory.export.to_svg import to_svg
+from gdsfactory.technology import LayerLevel, LayerStack, LogicalLayer
+
+svg = "{http://www.w3.org/2000/svg}"
+href = "{http://www.w3.org/1999/xlink}href"
+
+
+def get_layer_stack() -> LayerStack:
+    """Returns dummy LayerStack."""
+    return LayerStack(
+        layers=dict(
+            metal=LayerLevel(
+                layer=LogicalLayer(layer=(49, 0)),
+                thickness=1,
+                zmin=0,
+                material="al",
+                mesh_order=99,
+            )
+        )
+    )
+
+
+def test_to_svg_hierarchy(tmp_path: pathlib.Path) -> None:
+    c = gf.Component()
+    ref = c << gf.components.pad_array(columns=3, rows=2)
+    ref.dmirror()
+    filepath = tmp_path / "pads.svg"
+    to_svg(c, layer_stack=get_layer_stack(), filename=filepath)
+
+    root = ET.parse(filepath).getroot()
+    defs = {g.get("id"): g for g in root.find(f"{svg}defs")}
+    # the pad is written once and instanced 6 times
+    paths = [path for g in defs.values() for path in g.iter(f"{svg}path")]
+    assert len(paths) == 1
+    assert paths[0].get("d") == "M-50000,-50000 -50000,50000 50000,50000 50000,-50000Z"
+    uses = [use for g in defs.values() for use in g.iter(f"{svg}use")]
+    assert len(uses) == 7
+    assert all(use.get(href)[1:] in defs for use in uses)
+
+    (group,) = root.find(f"{svg}g")
+    assert group.get("id") == "layer049_datatype000"
+    assert float(root.get("width")) == c.dxsize
+    assert float(root.get("height")) == c.dysize
@@ -5,6 +5,7 @@ from pytest_regressions.data_regression import DataRegressionFixture
 
 import gdsfactory as gf
 from gdsfactory.difftest import difftest
+from gdsfactory.read.from_yaml import YamlCompiler, _get_components
 
 mirror_port = """
 name: mirror_port
@@ -112,6 +113,91 @@ def test_components(
         data_regression.check(c.to_dict())
 
 
+def test_instances_share_components() -> None:
+    instances = {
+        f"s{i}": {
+            "component": "straight",
+            "settings": {"length": 1 + i % 2, "npoints": 2}
+            if i % 3
+            else {"npoints": 2, "length": 1 + i % 2},
+        }
+        for i in range(6)
+    }
+    components, instance_keys = _get_components(instances)
+    assert len(components) == 2
+    assert len(instance_keys) == 6
+
+    c = gf.read.from_yaml({"instances": instances})
+    assert len({inst.cell.cell_index() for inst in c.insts}) == 2
+
+
+def get_geometry(c: gf.Component) -> dict[int, tuple]:
+    """Returns {layer: (polygons, texts)} of a component, flattened."""
+    geometry = {}
+    for layer in c.kcl.layout.layer_indexes():
+        region = gf.kdb.Region(c.begin_shapes_rec(layer))
+        texts = gf.kdb.Texts(c.begin_shapes_rec(layer))
+        geometry[layer] = (
+            region,
+            sorted((t.string, t.x, t.y) for t in texts.each()),
+        )
+    return geometry
+
+
+def assert_same_component(c1: gf.Component, c2: gf.Component) -> None:
+    geometry1, geometry2 = get_geometry(c1), get_geometry(c2)
+    for layer in geometry1:
+        region1, texts1 = geometry1[layer]
+        region2, texts2 = geometry2[layer]
+        assert (region1 ^ region2).is_empty(), layer
+        assert texts1 == texts2, layer
+    assert [(p.name, p.trans, p.width) for p in c1.ports] == [
+        (p.name, p.trans, p.width) for p in c2.ports
+    ]
+
+
+def test_yaml_compiler_update() -> None:
+    netlist = {
+        "instances": {
+            "a": {"component": "mmi1x2"},
+            "b": {"component": "mmi1x2"},
+            "c": {"component": "straight"},
+            "d": {"component": "straight"},
+            "e": {"component": "straight"},
+        },
+        "placements": {
+            "b": {"x": "a,o2", "dx": 50, "dy": 40},
+            "d": {"y": -100},
+            "e": {"x": 200, "y": -100},
+        },
+        "connections": {"c,o1": "b,o2"},
+        "routes": {
+            "r1": {"links": {"a,o3": "b,o1"}},
+            "r2": {"links": {"d,o2": "e,o1"}},
+        },
+        "ports": {"o1": "a,o1", "o2": "c,o2"},
+    }
+    compiler = YamlCompiler()
+    c = compiler.update(netlist)
+    assert_same_component(c, gf.read.from_yaml(netlist))
+    refs = dict(compiler.refs)
+    r2 = list(compiler.routes["r2"].values())
+
+    netlist["placements"]["b"]["dy"] = 60
+    c = compiler.update(netlist)
+    assert_same_component(c, gf.read.from_yaml(netlist))
+    for name in "ade":
+        assert compiler.refs[name] is refs[name]
+    assert list(compiler.routes["r2"].values()) == r2
+
+    netlist["instances"]["e"]["settings"] = {"length": 20}
+    del netlist["routes"]["r1"]
+    c = compiler.update(netlist)
+    assert_same_component(c, gf.read.from_yaml(netlist))
+    assert list(compiler.routes) == ["r2"]
+    assert list(compiler.routes["r2"].values()) != r2
+
+
 if __name__ == "__main__":
     c = gf.read.from_yaml(rotation)
     c.show()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from kfactory import kdb
+
+from gdsfactory.read.from_gdspaths import merge_gdspaths
+
+
+def write_tile(gdspath, width: int) -> None:
+    layout = kdb.Layout()
+    tile = layout.create_cell("tile")
+    box = layout.create_cell("box")
+    box.shapes(layout.layer(1, 0)).insert(kdb.Box(width * 1000, 1000))
+    tile.insert(kdb.CellInstArray(box.cell_index(), kdb.Trans()))
+    layout.write(str(gdspath))
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_merge_gdspaths(tmp_path, n_jobs: int | None) -> None:
+    gdspaths = [tmp_path / f"tile{width}.gds" for width in (1, 2, 3)]
+    for width, gdspath in zip((1, 2, 3), gdspaths):
+        write_tile(gdspath, width)
+    gdspaths[-1] = tmp_path / "tile3.gds.gz"
+    gdspaths[-1].write_bytes(gzip.compress((tmp_path / "tile3.gds").read_bytes()))
+
+    gdspath = merge_gdspaths(gdspaths, tmp_path / "merged.oas", n_jobs=n_jobs)
+    layout = kdb.Layout()
+    layout.read(str(gdspath))
+    top = layout.top_cell()
+    assert top.name == "merged"
+    tiles = sorted(top.each_inst(), key=lambda inst: inst.cell.name)
+    assert [inst.cell.name for inst in tiles] == ["tile", "tile$1", "tile$2"]
+    assert [inst.cell.dbbox().width() for inst in tiles] == [1, 2, 3]
+
+    gdspath = merge_gdspaths(gdspaths, tmp_path / "merged.gds", cell_conflict="skip")
+    layout = kdb.Layout()
+    layout.read(str(gdspath))
+    assert [inst.cell.name for inst in layout.top_cell().each_inst()] == ["tile"]
+    assert layout.top_cell().dbbox().width() == 1
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import json
+from functools import partial
 
 import jsondiff
 import pandas as pd
 
 import gdsfactory as gf
 from gdsfactory.generic_tech import LAYER
-from gdsfactory.read.import_gds import import_gds
+from gdsfactory.read.import_gds import (
+    ImportGdsCache,
+    _import_gds,
+    import_gds,
+    import_gds_cache,
+)
 
 
 def test_import_gds_info() -> None:
@@ -81,6 +87,47 @@ def import_same_file_twice() -> None:
     assert c
 
 
+def test_import_gds_cache(tmp_path) -> None:
+    gdspath = tmp_path / "cached.gds"
+    gf.components.straight(length=1).write_gds(gdspath)
+    info = import_gds_cache.info()
+
+    c1 = import_gds(gdspath)
+    c2 = import_gds(str(gdspath))
+    assert c1 is c2
+    assert import_gds_cache.info().hits == info.hits + 1
+
+    gf.components.straight(length=2).write_gds(gdspath)
+    c3 = import_gds(gdspath)
+    assert c3 is not c1
+    assert c3.dxsize == 2
+    assert import_gds_cache.info().stale == info.stale + 1
+
+    assert import_gds_cache.invalidate(gdspath) == 1
+    assert import_gds(gdspath) is not c3
+
+
+def test_import_gds_cache_eviction(tmp_path) -> None:
+    gdspaths = []
+    for length in range(1, 5):
+        gdspath = tmp_path / f"straight{length}.gds"
+        gf.components.straight(length=length).write_gds(gdspath)
+        gdspaths.append(gdspath)
+
+    cache = ImportGdsCache(max_shapes=2, hash_content=True, delete_evicted=True)
+    components = [
+        cache.get(gdspath, None, None, load=partial(_import_gds, gdspath))
+        for gdspath in gdspaths
+    ]
+    info = cache.info()
+    assert info.entries == 2
+    assert info.evictions == 2
+    assert info.shapes == 2
+    assert components[0]._destroyed()
+    assert not components[-1]._destroyed()
+    assert cache.get(gdspaths[-1], None, None, load=gf.Component) is components[-1]
+
+
 if __name__ == "__main__":
     # test_import_gds_info()
     c1 = gf.components.straight(length=1.234)
@@ -21,3 +21,29 @@ def test_route_single(
     if check:
         lengths = dict(length=route.length)
         data_regression.check(lengths)
+
+
+def test_route_single_straight_pool() -> None:
+    c1 = gf.Component()
+    c2 = gf.Component()
+    routes = []
+    for c, straight_pool in ((c1, False), (c2, True)):
+        mmi1 = c << gf.components.mmi1x2()
+        mmi2 = c << gf.components.mmi1x2()
+        mmi2.dmove((100.123, 50.011))
+        route = gf.routing.route_single(
+            c, mmi1.ports["o3"], mmi2.ports["o1"], straight_pool=straight_pool
+        )
+        routes.append(route)
+    assert routes[0].length == routes[1].length
+    assert len(routes[1].instances) > len(routes[0].instances)
+    for inst in routes[1].instances:
+        length = inst.cell.settings.get("length")
+        if length is not None:
+            length_dbu = round(length / c2.kcl.dbu)
+            assert length_dbu == 3 or length_dbu.bit_count() == 1
+
+    layer = gf.get_layer((1, 0))
+    r1 = gf.kdb.Region(c1.begin_shapes_rec(layer))
+    r2 = gf.kdb.Region(c2.begin_shapes_rec(layer))
+    assert (r1 ^ r2).is_empty()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import random
+import time
+import warnings
+
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.routing.routing_context import RoutingContext, ShapeIndex
+from gdsfactory.routing.utils import RouteWarning
+
+
+def test_shape_index() -> None:
+    random.seed(0)
+    boxes = []
+    index = ShapeIndex()
+    for i in range(300):
+        x, y = random.randint(0, 1000), random.randint(0, 1000)
+        boxes.append(gf.kdb.Box(x, y, x + 20, y + 20))
+        index.insert([(boxes[-1], i)])
+
+    query = gf.kdb.Box(200, 200, 400, 400)
+    expected = {i for i, box in enumerate(boxes) if box.touches(query)}
+    assert {i for _, i in index.touching(query)} == expected
+    assert len(index) == len(boxes)
+
+
+def test_routing_context_collision() -> None:
+    c = gf.Component()
+    context = RoutingContext(c)
+    s1 = c << gf.components.straight()
+    s2 = c << gf.components.straight()
+    s2.dmove((100, 100))
+    s3 = c << gf.components.straight()
+    s3.dmove((0, 100))
+    s4 = c << gf.components.straight()
+    s4.dmove((100, 0))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RouteWarning)
+        gf.routing.route_single(
+            c, s1.ports["o2"], s2.ports["o1"], routing_context=context
+        )
+    with pytest.warns(RouteWarning):
+        gf.routing.route_single(
+            c, s3.ports["o2"], s4.ports["o1"], routing_context=context
+        )
+
+
+def test_routing_context_bboxes() -> None:
+    c = gf.Component()
+    mmi = c << gf.components.mmi2x2()
+    pad = c << gf.components.straight()
+    pad.dmove((100, 0))
+    context = RoutingContext(c)
+    assert context.get_bboxes(mmi.ports) == [mmi.bbox()]
+    assert context.get_bboxes([mmi.ports["o1"], pad.ports["o1"]]) == [
+        mmi.bbox(),
+        pad.bbox(),
+    ]
+
+
+def test_routing_context_deleted_instances() -> None:
+    c = gf.Component()
+    s1 = c << gf.components.straight()
+    s2 = c << gf.components.straight()
+    s2.dmove((100, 0))
+    context = RoutingContext(c)
+
+    s1._instance.delete()
+    del c.insts[0]
+    assert context.get_bboxes([*s1.ports, *s2.ports]) == [s2.bbox()]
+
+    # as many instances placed as deleted are only found by a full update
+    s3 = c << gf.components.straight()
+    s3.dmove((0, 100))
+    context.update(full=True)
+    assert context.get_bboxes([*s2.ports, *s3.ports]) == [s2.bbox(), s3.bbox()]
+
+
+def test_routing_context_moved_instances() -> None:
+    c = gf.Component()
+    s1 = c << gf.components.straight()
+    s2 = c << gf.components.straight()
+    s2.dmove((100, 0))
+    context = RoutingContext(c)
+
+    # found at the old place and indexed again
+    s1.dmove((2, 0))
+    assert context.get_bboxes(s1.ports) == [s1.bbox()]
+    assert context.get_bboxes([s2.ports["o1"]]) == [s2.bbox()]
+    s2.dmove((0, 200))
+    context.update(full=True)
+    assert context.get_bboxes(s2.ports) == [s2.bbox()]
+    assert context.get_bboxes([s1.ports["o1"]]) == [s1.bbox()]
+
+
+def test_routing_context_update(monkeypatch: pytest.MonkeyPatch) -> None:
+    c = gf.Component()
+    mmis = [c << gf.components.mmi1x2() for _ in range(2)]
+    mmis[1].dmove((200, 0))
+    context = RoutingContext(c)
+    monkeypatch.setattr(
+        RoutingContext, "_scan", lambda self: pytest.fail("scanned component")
+    )
+    gf.routing.route_bundle(
+        c, [mmis[0].ports["o2"]], [mmis[1].ports["o1"]], routing_context=context
+    )
+    mmi = c << gf.components.mmi1x2()
+    mmi.dmove((0, 100))
+
+    # the route instances are known, and only the new mmi is indexed
+    context.update()
+    assert len(context.instances) == 3
+    assert context.get_bboxes(mmi.ports) == [mmi.bbox()]
+
+
+def _route_bundles(n: int, routing_context: bool) -> float:
+    """Returns the time to route n bundles between mmis placed one by one."""
+    c = gf.Component()
+    context = RoutingContext(c) if routing_context else None
+    mmi = gf.components.mmi1x2()
+    start = time.perf_counter()
+    for i in range(n):
+        a = c << mmi
+        a.dmove((0, i * 40))
+        b = c << mmi
+        b.dmirror_x()
+        b.dmove((300, i * 40))
+        ports1 = [a.ports["o2"], a.ports["o3"]]
+        ports2 = [b.ports["o3"], b.ports["o2"]]
+        bboxes = None
+        if context is None:
+            points = [gf.kdb.Point(*port.center) for port in ports1 + ports2]
+            bboxes = [
+                inst.bbox()
+                for inst in c.insts
+                if any(inst.bbox().contains(point) for point in points)
+            ]
+        gf.routing.route_bundle(
+            c,
+            ports1,
+            ports2,
+            sort_ports=True,
+            bboxes=bboxes,
+            collision_check_layers=[(1, 0)],
+            routing_context=context,
+        )
+    return time.perf_counter() - start
+
+
+def test_routing_context_many_bundles() -> None:
+    with_context = min(_route_bundles(100, True) for _ in range(3))
+    without_context = min(_route_bundles(100, False) for _ in range(3))
+    assert with_context < without_context
@@ -459,6 +459,40 @@ def test_route_bundle_small() -> None:
         assert np.isclose(route.length, 74500), route.length
 
 
+def test_route_bundle_straight_pool() -> None:
+    """Pooled straights draw the same routes with fewer straight cells."""
+    components = []
+    for straight_pool in (False, True):
+        c = gf.Component()
+        top = c << gf.components.nxn(north=32, south=0, east=0, west=0, xsize=320)
+        bot = c << gf.components.nxn(north=32, south=0, east=0, west=0, xsize=320)
+        bot.dmovex(-233.3)
+        top.drotate(180)
+        top.dmove((320, 520))
+        route_bundle(
+            c,
+            bot.ports,
+            top.ports,
+            radius=5,
+            sort_ports=True,
+            straight_pool=straight_pool,
+        )
+        components.append(c)
+
+    def get_straights(c: Component) -> set[str]:
+        return {
+            c.kcl[ci].name
+            for ci in c.called_cells()
+            if c.kcl[ci].name.startswith("straight")
+        }
+
+    assert len(get_straights(components[1])) < len(get_straights(components[0])) / 2
+    layer = gf.get_layer((1, 0))
+    r1 = gf.kdb.Region(components[0].begin_shapes_rec(layer))
+    r2 = gf.kdb.Region(components[1].begin_shapes_rec(layer))
+    assert (r1 ^ r2).is_empty()
+
+
 if __name__ == "__main__":
     test_route_bundle_small()
     # test_route_bundle_udirect(None, check=False)
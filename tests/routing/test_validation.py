@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import itertools
+import random
+
+import gdsfactory as gf
+from gdsfactory.routing.validation import (
+    get_bundle_crossings,
+    get_segment_crossings,
+    has_bundle_crossing,
+    is_invalid_bundle_topology,
+)
+
+
+def _geometry(segment):
+    import shapely.geometry as sg
+
+    start, end = segment
+    return sg.Point(start) if start == end else sg.LineString(segment)
+
+
+def _intersect(segment1, segment2) -> bool:
+    return _geometry(segment1).intersects(_geometry(segment2))
+
+
+def test_get_segment_crossings() -> None:
+    rng = random.Random(0)
+    for size in (2, 5, 1000):
+        for _ in range(50):
+            segments = [
+                tuple((rng.randint(0, size), rng.randint(0, size)) for _ in range(2))
+                for _ in range(rng.randint(0, 12))
+            ]
+            expected = [
+                (i, j)
+                for i, j in itertools.combinations(range(len(segments)), 2)
+                if _intersect(segments[i], segments[j])
+            ]
+            assert get_segment_crossings(segments) == expected, segments
+
+
+def _ports(xs, ys, orientation: float, prefix: str) -> list[gf.Port]:
+    return [
+        gf.Port(
+            f"{prefix}{i}",
+            center=(x, y),
+            width=0.5,
+            orientation=orientation,
+            layer=(1, 0),
+        )
+        for i, (x, y) in enumerate(zip(xs, ys))
+    ]
+
+
+def test_get_bundle_crossings() -> None:
+    n = 1000
+    ys = [10.0 * i for i in range(n)]
+    ports1 = _ports([0] * n, ys, 0, "in")
+    ports2 = _ports([500] * n, ys, 180, "out")
+    assert get_bundle_crossings(ports1, ports2) == []
+    assert not is_invalid_bundle_topology(ports1, ports2)
+
+    ports2[10], ports2[20] = ports2[20], ports2[10]
+    crossings = get_bundle_crossings(ports1, ports2)
+    assert crossings == [(10, i) for i in range(11, 21)] + [
+        (i, 20) for i in range(11, 20)
+    ]
+
+    # facing ports that all cross need to be reordered
+    assert is_invalid_bundle_topology(ports1[:3], ports2[:3][::-1])
+
+
+def test_is_invalid_bundle_topology() -> None:
+    n = 2000
+    ys = [10.0 * i for i in range(n)]
+    ports1 = _ports([0] * n, ys, 0, "in")
+
+    # facing ports are unroutable only if every pair of lines crosses
+    assert is_invalid_bundle_topology(ports1, _ports([500] * n, ys[::-1], 180, "out"))
+    ports2 = _ports([500] * n, ys[::-1], 180, "out")
+    ports2[0], ports2[1] = ports2[1], ports2[0]
+    assert not is_invalid_bundle_topology(ports1, ports2)
+
+    # with one port facing the other way, no lines may cross
+    ports2 = _ports([500] * n, ys, 0, "out")
+    assert has_bundle_crossing(ports1, ports2) is False
+    assert is_invalid_bundle_topology(ports1, ports2)
+    ports2[10], ports2[20] = ports2[20], ports2[10]
+    assert has_bundle_crossing(ports1, ports2)
+    assert not is_invalid_bundle_topology(ports1, ports2)
@@ -1,6 +1,8 @@
 import pytest
 
+import gdsfactory as gf
 from gdsfactory.generic_tech import LAYER_STACK
+from gdsfactory.technology.layer_stack import LogicalLayer
 
 
 @pytest.mark.skip(
@@ -26,5 +28,24 @@ def test_component_with_derived_layers() -> None:
     assert True
 
 
+def test_derived_layer_shapes_cache() -> None:
+    c = gf.Component()
+    c << gf.components.rectangle(size=(10, 10), layer=(1, 0))
+    r = c << gf.components.rectangle(size=(10, 10), layer=(2, 0))
+    r.dmove((5, 5))
+
+    layer1 = LogicalLayer(layer=(1, 0))
+    layer2 = LogicalLayer(layer=(2, 0))
+    overlap = layer1 & layer2
+    derived = layer1 - overlap
+
+    cache = {}
+    region = derived.get_shapes(c, cache=cache)
+    assert len(cache) == 4
+    assert overlap.get_shapes(c, cache=cache) is cache[hash(overlap)]
+    assert (region ^ derived.get_shapes(c)).is_empty()
+    assert region.area() == 75 / c.kcl.dbu**2
+
+
 if __name__ == "__main__":
     test_component_with_derived_layers()
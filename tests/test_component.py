@@ -59,3 +59,13 @@ def test_trim() -> None:
 def test_from_kcell() -> None:
     kf.kcl.infos = kf.LayerInfos(WG=kf.kdb.LayerInfo(1, 0))
     gf.Component.from_kcell(kf.cells.straight.straight(1, 1, gf.kcl.get_info(LAYER.WG)))
+
+
+def test_to_image() -> None:
+    c = gf.c.mzi()
+    img = c.to_image(width=200, height=100)
+    assert img.shape[:2] == (100, 200)
+    assert img.std() > 0
+
+    png = c.to_image(width=200, height=100, png=True)
+    assert png.startswith(b"\x89PNG")
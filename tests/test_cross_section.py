@@ -61,6 +61,40 @@ def test_name() -> None:
     assert s.name == "strip"
 
 
+def test_hash_cached() -> None:
+    xs1 = gf.cross_section.cross_section(width=0.5)
+    assert xs1.hash == xs1.hash
+    assert xs1["_default"].width == 0.5
+
+    xs2 = xs1.copy(width=2)
+    assert xs2.hash != xs1.hash
+    assert xs2["_default"].width == 2
+    assert xs1 == gf.cross_section.cross_section(width=0.5)
+
+
+def test_get_cross_section_interned() -> None:
+    xs1 = gf.get_cross_section("strip", width=1)
+    xs2 = gf.get_cross_section("strip", width=1)
+    assert xs1 is xs2
+    assert gf.get_cross_section("strip", width=2) is not xs1
+
+
+def test_get_cross_section_cache_size(monkeypatch) -> None:
+    monkeypatch.setattr(gf.pdk, "cross_section_cache_size", 2)
+    pdk = gf.get_active_pdk()
+    pdk.activate()
+    xs1 = gf.get_cross_section("strip", width=1)
+    gf.get_cross_section("strip", width=2)
+    assert gf.get_cross_section("strip", width=1) is xs1
+    gf.get_cross_section("strip", width=3)
+    assert len(pdk._cross_section_cache) == 2
+    assert gf.get_cross_section("strip", width=1) is xs1
+
+    pdk.activate()
+    assert not pdk._cross_section_cache
+    assert gf.get_cross_section("strip", width=1) is not xs1
+
+
 xc_sin = partial(
     gf.cross_section.cross_section,
     width=1.0,
@@ -1,6 +1,21 @@
+import importlib
+import json
+import shutil
+from functools import partial
 from pathlib import Path
+from xml.etree import ElementTree
 
-from gdsfactory.difftest import diff
+import pytest
+from kfactory import kdb
+
+import gdsfactory as gf
+from gdsfactory.difftest import (
+    _get_different_layers,
+    diff,
+    difftest_batch,
+    get_geometry_digests,
+    read_geometry_digests,
+)
 
 
 def assert_xor_fails(ref_gds, run_gds, test_name, capsys, layers_with_xor) -> None:
@@ -38,3 +53,151 @@ def test_xor2(capsys) -> None:
         capsys=capsys,
         layers_with_xor=["2/0"],
     )
+
+
+def write_boxes(gdspath: Path, boxes, name: str = "top") -> Path:
+    layout = kdb.Layout()
+    top = layout.create_cell(name)
+    child = layout.create_cell("child")
+    for layer, box in boxes:
+        child.shapes(layout.layer(*layer)).insert(box)
+    top.insert(kdb.CellInstArray(child.cell_index(), kdb.Trans()))
+    layout.write(str(gdspath))
+    return gdspath
+
+
+def test_geometry_digests(tmp_path) -> None:
+    ref_file = write_boxes(
+        tmp_path / "ref.gds",
+        [((1, 0), kdb.Box(0, 0, 10, 10)), ((2, 0), kdb.Box(0, 0, 5, 5))],
+    )
+    # same geometry, split into two boxes and in another cell
+    same_file = write_boxes(
+        tmp_path / "same.gds",
+        [
+            ((1, 0), kdb.Box(0, 0, 10, 5)),
+            ((1, 0), kdb.Box(0, 5, 10, 10)),
+            ((2, 0), kdb.Box(0, 0, 5, 5)),
+        ],
+        name="other",
+    )
+    run_file = write_boxes(
+        tmp_path / "run.gds",
+        [((1, 0), kdb.Box(0, 0, 10, 10)), ((2, 0), kdb.Box(0, 0, 8, 5))],
+    )
+
+    ref_digests = read_geometry_digests(ref_file)
+    assert not (tmp_path / "ref.digest.json").exists()
+    assert read_geometry_digests(ref_file, write=True) == ref_digests
+    assert (tmp_path / "ref.digest.json").exists()
+    assert read_geometry_digests(ref_file) == ref_digests
+
+    same_digests = get_geometry_digests(same_file)
+    assert not _get_different_layers(ref_digests, same_digests)
+    assert ref_digests["cells"] != same_digests["cells"]
+
+    run_digests = get_geometry_digests(run_file)
+    assert _get_different_layers(ref_digests, run_digests) == [(2, 0)]
+    assert diff(ref_file, run_file, test_name="digest1", layers=[(1, 0)]) is False
+    assert diff(
+        ref_file,
+        run_file,
+        test_name="digest2",
+        layers=_get_different_layers(ref_digests, run_digests),
+    )
+
+
+def test_geometry_digests_cache(tmp_path, monkeypatch) -> None:
+    # gf.difftest is the function, not the module
+    difftest = importlib.import_module("gdsfactory.difftest")
+    monkeypatch.setattr(difftest, "_digests_max_files", 2)
+    monkeypatch.setattr(difftest, "_digests", difftest.OrderedDict())
+    gdspaths = [
+        write_boxes(tmp_path / f"{i}.gds", [((1, 0), kdb.Box(0, 0, i + 1, 1))])
+        for i in range(3)
+    ]
+    digests = [get_geometry_digests(gdspath) for gdspath in gdspaths]
+    assert list(difftest._digests) == [str(path.resolve()) for path in gdspaths[1:]]
+    assert get_geometry_digests(gdspaths[0]) == digests[0]
+    assert len(difftest._digests) == 2
+
+
+def test_diff_report(tmp_path) -> None:
+    ref_file = write_boxes(
+        tmp_path / "ref.gds",
+        [((1, 0), kdb.Box(0, 0, 50000, 1000)), ((3, 0), kdb.Box(0, 0, 10, 10))],
+    )
+    run_file = write_boxes(
+        tmp_path / "run.gds",
+        [
+            ((1, 0), kdb.Box(0, 0, 50000, 1000)),
+            ((1, 0), kdb.Box(5000, 0, 15000, 2000)),
+            ((1, 0), kdb.Box(40000, 0, 41000, 3000)),
+        ],
+    )
+    report = tmp_path / "report.json"
+    assert diff(
+        ref_file, run_file, test_name="report", tile_size=10, threads=2, report=report
+    )
+    layers = json.loads(report.read_text())["layers"]
+    assert layers["3/0"] == {
+        "status": "only_in_ref",
+        "count": 1,
+        "bbox": [0, 0, 0.01, 0.01],
+    }
+    assert layers["1/0"]["status"] == "xor"
+    assert layers["1/0"]["count"] == 2
+    assert layers["1/0"]["bbox"] == [5, 1, 41, 3]
+    tiles = layers["1/0"]["tiles"]
+    assert [(tile["ix"], tile["count"]) for tile in tiles] == [(0, 1), (1, 1), (4, 1)]
+    assert tiles[0]["bbox"] == [5, 1, 10, 2]
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_difftest_batch(tmp_path, n_jobs: int | None) -> None:
+    cells = {
+        "straight_short": partial(gf.components.straight, length=1),
+        "straight_long": partial(gf.components.straight, length=2),
+        "broken": partial(gf.components.straight, length=-1),
+    }
+    kwargs = dict(dirpath=tmp_path / "ref", dirpath_run=tmp_path / "run", n_jobs=n_jobs)
+    results = difftest_batch(cells, **kwargs)
+    assert [result.status for result in results] == [
+        "missing_reference",
+        "missing_reference",
+        "error",
+    ]
+
+    shutil.copy(
+        tmp_path / "ref" / "straight_long.gds", tmp_path / "ref" / "straight_short.gds"
+    )
+    report = tmp_path / "report.json"
+    junit = tmp_path / "junit.xml"
+    results = difftest_batch(cells, report=report, junit=junit, **kwargs)
+    assert [result.status for result in results] == ["different", "identical", "error"]
+    assert results[0].layers == ["1/0"]
+    assert json.loads(report.read_text())["statuses"] == {
+        "different": 1,
+        "identical": 1,
+        "error": 1,
+    }
+    suite = ElementTree.parse(junit).getroot()
+    assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == (
+        "3",
+        "1",
+        "1",
+    )
+
+    difftest_batch(cells, update_references=True, **kwargs)
+    results = difftest_batch(cells, **kwargs)
+    assert [result.passed for result in results] == [True, True, False]
+
+
+def test_difftest_batch_names(tmp_path) -> None:
+    cells = [partial(gf.components.straight, length=3), "broken_cell_name"]
+    results = difftest_batch(
+        cells, dirpath=tmp_path / "ref", dirpath_run=tmp_path / "run"
+    )
+    assert results[0].name == gf.components.straight(length=3).name
+    assert results[0].status == "missing_reference"
+    assert (results[1].name, results[1].status) == ("broken_cell_name", "error")
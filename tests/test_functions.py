@@ -1,3 +1,5 @@
+import numpy as np
+
 import gdsfactory as gf
 from gdsfactory.generic_tech import LAYER
 
@@ -19,6 +21,26 @@ def test_get_polygons():
     assert key == "WG"
 
 
+def test_get_polygons_points_array():
+    c = gf.Component()
+    c << gf.c.rectangle(size=(10, 10), layer=(1, 0))
+    c << gf.c.circle(radius=5, layer=(1, 0))
+
+    points, offsets = gf.functions.get_polygons_points_array(c, by="tuple")[(1, 0)]
+    polygons = c.get_polygons_points(by="tuple")[(1, 0)]
+    assert len(offsets) == len(polygons) + 1
+    assert points.dtype == np.float64
+    for start, end, polygon in zip(offsets[:-1], offsets[1:], polygons):
+        np.testing.assert_array_equal(points[start:end], polygon)
+
+    points_dbu, offsets_dbu = gf.functions.get_polygons_points_array(
+        c, by="tuple", dbu=True
+    )[(1, 0)]
+    assert points_dbu.dtype == np.int32
+    np.testing.assert_array_equal(offsets_dbu, offsets)
+    np.testing.assert_allclose(points_dbu * c.kcl.dbu, points)
+
+
 def test_trim() -> None:
     layer = (1, 0)
     c1 = gf.c.rectangle(size=(11, 11), centered=True, layer=layer)
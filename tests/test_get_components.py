@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import gdsfactory as gf
+
+
+def test_get_components_parallel() -> None:
+    settings = [dict(length=length) for length in (1.5, 2.5, 3.5)]
+    components = gf.get_components(["straight"] * 3, settings, n_jobs=2)
+    for c, s in zip(components, settings):
+        ref = gf.components.straight(**s)
+        assert c.name == ref.name
+        assert c.settings == ref.settings
+        assert [p.name for p in c.ports] == [p.name for p in ref.ports]
+        assert c.ports["o2"].center == ref.ports["o2"].center
+
+
+def test_pack_doe_parallel() -> None:
+    c = gf.components.pack_doe(
+        doe="mmi1x2",
+        settings=dict(length_mmi=(3.1, 4.1), width_mmi=(4.1, 5.1)),
+        do_permutations=True,
+        n_jobs=2,
+    )
+    assert len(c.doe_names) == 4
+    assert c.doe_names[0] == gf.components.mmi1x2(length_mmi=3.1, width_mmi=4.1).name
@@ -156,6 +156,23 @@ def test_get_netlist_close_enough_fails() -> None:
     assert len(links) == 0
 
 
+def test_get_netlist_close_enough_tolerance() -> None:
+    """Move connection 1nm outwards and connect it with 1 dbu tolerance."""
+    c = gf.Component()
+    i1 = c.add_ref(gf.components.straight(), "i1")
+    i2 = c.add_ref(gf.components.straight(), "i2")
+    i2.connect("o2", i1.ports["o1"])
+    i2.dmovex(0.001)
+    i2.dmovey(0.001)
+    assert len(c.get_netlist()["nets"]) == 0
+    netlist = c.get_netlist(tolerance=1)
+    links = netlist["nets"]
+    assert len(links) == 1
+    extracted_port_pair = set(links[0].values())
+    expected_port_pair = {"i2,o2", "i1,o1"}
+    assert extracted_port_pair == expected_port_pair
+
+
 def test_get_netlist_close_enough_orthogonal_fails() -> None:
     c = gf.Component()
     i1 = c.add_ref(gf.components.straight(), "i1")
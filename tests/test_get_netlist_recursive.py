@@ -4,7 +4,7 @@ We use the `get_missing_models` function in `sax` to extract that it is represen
 """
 
 import gdsfactory as gf
-from gdsfactory.get_netlist import get_netlist_recursive
+from gdsfactory.get_netlist import get_netlist, get_netlist_recursive
 
 
 def test_no_effect_on_original_components():
@@ -43,3 +43,19 @@ def test_n_netlists():
     assert len(netlists) == 2
     assert "hcomponent_top" in netlists
     assert "hcomponent_l2" in netlists
+
+
+def test_netlist_each_unique_cell_once():
+    calls = []
+
+    def get_netlist_func(component, **kwargs):
+        calls.append(component.name)
+        return get_netlist(component, **kwargs)
+
+    c = gf.Component("top")
+    c << hcomponent_top()
+    c << hcomponent_top()
+    c << hcomponent_l2()
+    netlists = get_netlist_recursive(c, get_netlist_func=get_netlist_func)
+    assert sorted(calls) == sorted(netlists)
+    assert sorted(calls) == ["hcomponent_l2", "hcomponent_top", "top"]
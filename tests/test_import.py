@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import gdsfactory as gf
+
+lazy_modules = (
+    "gdsfactory.components",
+    "gdsfactory.containers",
+    "gdsfactory.export",
+    "gdsfactory.grid",
+    "gdsfactory.labels",
+    "gdsfactory.read",
+    "gdsfactory.routing",
+)
+startup_budget_seconds = 1.5
+
+
+def get_import_times(code: str) -> dict[str, int]:
+    """Returns {module: cumulative import time in us} from python -X importtime."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_is_lazy() -> None:
+    times = get_import_times("import gdsfactory")
+    imported = [module for module in lazy_modules if module in times]
+    assert not imported, f"{imported} imported by `import gdsfactory`"
+
+
+def test_import_startup_budget() -> None:
+    times = get_import_times("import gdsfactory")
+    # kfactory (and klayout) are imported by gdsfactory, only budget our own modules
+    seconds = (times["gdsfactory"] - times["kfactory"]) * 1e-6
+    assert seconds < startup_budget_seconds, f"import gdsfactory took {seconds:.2f}s"
+
+
+def test_grid_submodule_import() -> None:
+    # importing the gdsfactory.grid module first does not shadow gf.grid
+    code = (
+        "from gdsfactory.grid import grid_with_text\n"
+        "import gdsfactory as gf\n"
+        "assert gf.grid([gf.components.straight()])\n"
+        "assert gf.grid_with_text is grid_with_text\n"
+        "assert gf.components.pack_doe_grid(\n"
+        "    gf.components.straight, settings=dict(length=[1, 2])\n"
+        ")\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_attributes() -> None:
+    assert gf.c is gf.components
+    assert gf.routing.route_bundle
+    assert gf.import_gds is gf.read.import_gds
+    # the gdsfactory.grid module does not shadow the function
+    assert gf.grid.__name__ == "grid"
+    assert "components" in dir(gf)
@@ -1,3 +1,5 @@
+import time
+
 import gdsfactory as gf
 from gdsfactory.generic_tech import LAYER
 
@@ -16,3 +18,21 @@ def test_get_layer():
     assert gf.get_layer(1) == LAYER.WG
     assert gf.get_layer((1, 0)) == LAYER.WG
     assert gf.get_layer("WG") == LAYER.WG
+
+
+def test_get_component_lookup_does_not_scale_with_cells() -> None:
+    c = gf.Component()
+
+    def lookup_time(n: int) -> float:
+        cells = {f"cell{i}": lambda: c for i in range(n)}
+        pdk = gf.Pdk(name=f"pdk{n}", cells=cells)
+        t0 = time.perf_counter()
+        for _ in range(1000):
+            pdk.get_component("cell0")
+            pdk.get_component({"component": "cell0"})
+            pdk.get_cell("cell0")
+        return time.perf_counter() - t0
+
+    small = min(lookup_time(10) for _ in range(3))
+    large = min(lookup_time(10_000) for _ in range(3))
+    assert large < 5 * small + 0.01, (small, large)
@@ -62,3 +62,41 @@ def test_get_ports_sort_counter_clockwise() -> None:
 def test_rename_ports(port_type, data_regression: DataRegressionFixture):
     c = gf.components.nxn(port_type=port_type)
     data_regression.check(c.to_dict())
+
+
+def test_port_array() -> None:
+    # dup, as renaming a port would change the cached component of later tests
+    c = gf.components.nxn(west=2, north=2, east=2, south=2).dup()
+    ports = gf.port.PortArray(c.ports)
+    assert len(ports) == 8
+    assert [p.name for p in ports.sort_clockwise()] == [
+        p.name for p in gf.port.sort_ports_clockwise(list(c.ports))
+    ]
+
+    north = ports.select(orientation=90)
+    assert list(north.names) == ["o3", "o4"]
+    assert ports.select(direction="N").names.tolist() == ["o3", "o4"]
+    assert len(ports.select(port_type="electrical")) == 0
+    assert ports.select(names=["o1", "o8"]).names.tolist() == ["o1", "o8"]
+
+    trans = gf.kdb.DCplxTrans(1, 90, False, 10, 0)
+    rotated = north.transformed(trans)
+    assert rotated.orientations.tolist() == [180, 180]
+    for port, center in zip(rotated, rotated.centers):
+        assert port.dcenter == pytest.approx(tuple(center))
+        assert port.orientation == 180
+
+    ports.select(prefix="o1").rename(["in"])
+    assert "in" in c.ports
+    assert len(ports.to_ports()) == 8
+
+
+def test_sort_ports_enforce_port_ordering() -> None:
+    c = gf.components.nxn(west=3, east=3)
+    west = list(c.ports.filter(orientation=180))
+    east = list(c.ports.filter(orientation=0))
+    ports1, ports2 = gf.routing.sort_ports.sort_ports(
+        west[::-1], east, enforce_port_ordering=True
+    )
+    assert [p.name for p in ports1] == [p.name for p in west]
+    assert [p.name for p in ports2] == [p.name for p in east[::-1]]